@@ -5,45 +5,597 @@ Processes daily shop schedules, parts, and mechanic metrics
 import os
 import csv
 import io
-from flask import Flask, render_template, jsonify
+import time
+import mimetypes
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import (
+    Flask, Response, abort, g, get_template_attribute, has_request_context, render_template, jsonify, request,
+    send_from_directory
+)
 from datetime import datetime, timedelta
 import pandas as pd
 import warnings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+import dashboard_delta
+import excel_engines
+import locations
+import parse_sandbox
+import parse_store
+import part_search
+import part_status
+import parts_query
+import pipeline_ledger
+import report_registry
+import request_profiler
+import static_assets
+from records import (
+    Backorder, FitIn, Goal, Issue, MechanicMetric, NoBinPart, PartReceived, PurchaseOrder, Rock, ScheduledJob,
+    to_json
+)
 warnings.filterwarnings('ignore')
 
 app = Flask(__name__)
 
+# Metrics (exposed at /metrics; aggregated across gunicorn workers when
+# PROMETHEUS_MULTIPROC_DIR is set - see gunicorn.conf.py)
+PARSE_DURATION = Histogram(
+    'shopmgr_parse_duration_seconds', 'Time spent in each report parser', ['location', 'parser'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+REQUEST_LATENCY = Histogram(
+    'shopmgr_request_duration_seconds', 'Request latency per route', ['route', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+PARSE_CACHE_REQUESTS = Counter(
+    'shopmgr_parse_cache_requests', 'Parse cache lookups by result (hit/stored/miss)', ['location', 'parser', 'result']
+)
+EXCEL_READ_DURATION = Histogram(
+    'shopmgr_excel_read_duration_seconds', 'Excel reads by report type, engine and result', ['report', 'engine', 'result'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+PARSE_ERRORS = Counter(
+    'shopmgr_parse_errors', 'Parser failures that fell back to empty results', ['parser']
+)
+INPUT_FILE_BYTES = Gauge(
+    'shopmgr_input_file_bytes', 'Size of the report file each parser last read', ['location', 'parser'],
+    multiprocess_mode='livemostrecent'
+)
+WORKER_RSS = Gauge(
+    'shopmgr_worker_rss_bytes', 'Resident set size of each worker process',
+    multiprocess_mode='liveall'
+)
+
 # Configuration
-DATASHEETS_DIR = os.path.join(os.path.dirname(__file__), 'datasheets')
+DATASHEETS_DIR = locations.DEFAULT_DATASHEETS_DIR
 ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'archive')
+WEATHER_URL = os.environ.get('SHOPMGR_WEATHER_URL', 'https://wttr.in/Plainwell,MI?format=j1')
 
-def get_latest_file(patterns):
-    """Get the most recent file matching one or more patterns"""
-    if isinstance(patterns, str):
-        patterns = [patterns]
-    patterns = [p.lower() for p in patterns]
-    files = [
-        f for f in os.listdir(DATASHEETS_DIR)
-        if any(p in f.lower() for p in patterns)
-    ]
-    if not files:
-        return None
-    latest = max(files, key=lambda f: os.path.getmtime(os.path.join(DATASHEETS_DIR, f)))
-    return os.path.join(DATASHEETS_DIR, latest)
+# Cache misses in /api/data and /api/summary are parsed in parallel in a pool of
+# this many processes per worker (1 = parse serially in the request, as before).
+# Every gunicorn worker has its own pool, so keep this small
+PARSE_WORKERS = int(os.environ.get('SHOPMGR_PARSE_WORKERS', min(2, os.cpu_count() or 1)))
+# Seconds a request waits for a parser before answering without that report
+PARSE_TIMEOUT = float(os.environ.get('SHOPMGR_PARSE_TIMEOUT', '10'))
+PARSE_TIMEOUTS = {
+    'parse_gross_profit_mechanic': PARSE_TIMEOUT * 2,  # month-end Sales and Gross is the largest export
+}
 
-def read_excel_safe(filepath, **kwargs):
-    """Read Excel files with engine fallbacks for corrupted styles"""
+# A synced report older than this is reported as stale by /health/ready (covers Saturday to Monday)
+STALE_REPORT_HOURS = float(os.environ.get('SHOPMGR_STALE_HOURS', '60'))
+# A parse still running after this many times its timeout makes /health/ready report the worker stuck
+STUCK_PARSE_FACTOR = 3
+
+# Render the dashboard's sections into the page on the server, so kiosks show data
+# on first paint instead of waiting for /api/data (per request: ?render=server|client)
+SERVER_RENDER = os.environ.get('SHOPMGR_SERVER_RENDER', '0') == '1'
+
+# Location name -> datasheets directory (see locations.py)
+LOCATIONS = locations.get_locations()
+
+STARTED = time.time()
+
+# Path -> ((mtime_ns, size), report type name or None), so each file version is classified once
+_file_types = {}
+
+def report_type_of(path, stat, manifest):
+    """Report type name of a datasheets file (see report_registry.py)"""
+    version = (stat.st_mtime_ns, stat.st_size)
+    known = _file_types.get(path)
+    if known and known[0] == version:
+        return known[1]
+    # The ingest side records what it classified; only files it missed are sniffed here
+    listed, name = report_registry.recorded_type(manifest, os.path.basename(path), stat)
+    if not listed:
+        report = report_registry.classify(path)
+        name = report.name if report else None
+    _file_types[path] = (version, name)
+    return name
+
+def resolve_location(location):
+    """Map a URL location to a known location name, or 404"""
+    global LOCATIONS
+    location = (location or locations.DEFAULT_LOCATION).lower()
+    if location not in LOCATIONS:
+        # A store may have been added since this worker started
+        LOCATIONS = locations.get_locations()
+        if location not in LOCATIONS:
+            abort(404)
+    return location
+
+# Location -> (datasheets dir mtime, {report name: latest file}) for each location
+_report_catalogs = {}
+
+def get_report_catalog(location):
+    """
+    Latest file for every report type at a location.
+    Rebuilt only when the directory listing changes (a file is added, renamed
+    or removed), so requests don't list the folder once per report. File types
+    come from the folder's manifest (see report_registry.MANIFEST); a file it
+    doesn't list is classified here, once per version.
+    """
+    directory = LOCATIONS[location]
+    try:
+        dir_mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return {name: None for name in report_registry.REPORTS}
+    cached = _report_catalogs.get(location)
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
+
+    # Latest file of each type; ties keep the first one listed
+    catalog = {name: None for name in report_registry.REPORTS}
+    newest = {}
+    manifest = report_registry.load_manifest(directory)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue  # temp files and the .parsecache store
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            name = report_type_of(entry.path, stat, manifest)
+            if name and (name not in newest or stat.st_mtime > newest[name]):
+                newest[name] = stat.st_mtime
+                catalog[name] = entry.path
+    _report_catalogs[location] = (dir_mtime, catalog)
+    return catalog
+
+# (path, mtime) pairs this worker has already reported to the pipeline ledger
+_served_reports = set()
+
+def note_report_served(filepath, location=locations.DEFAULT_LOCATION):
+    """Record in the pipeline ledger the first request served from a report file"""
+    if not filepath:
+        return
+    try:
+        mtime = os.path.getmtime(filepath)
+    except OSError:
+        return
+    key = (filepath, mtime)
+    if key in _served_reports:
+        return
+    _served_reports.add(key)
+    pipeline_ledger.record(os.path.basename(filepath), 'first_served', mtime=mtime, location=location)
+
+# (location, parser name) -> (file key, parsed result) for the file each parser last read
+_parse_cache = {}
+# (location, parser name) -> (file key, error) for a file version whose parse failed,
+# so it isn't parsed again on every request; a new upload has a new key
+_failed_parses = {}
+
+def run_parser(parser, filepath):
+    """Run a parser, in the parse sandbox (see parse_sandbox.py) when it is enabled"""
+    if parse_sandbox.ENABLED and not force_reparse_requested():
+        # Profiled requests parse in-process so the profile shows the parser work
+        return parse_sandbox.run(parser, filepath)
+    return parser(filepath)
+
+def note_parse_failure(location, name, key, error):
+    """Remember that this version of a report failed to parse"""
+    _failed_parses[(location, name)] = (key, error)
+    note_parse(location, name, error=error)
+
+def known_failure(location, name, key):
+    """The error from an earlier parse of this exact file version, or None"""
+    failed = _failed_parses.get((location, name))
+    if failed and failed[0] == key:
+        return failed[1]
+    return None
+
+def parse_report(parser, filepath, location=locations.DEFAULT_LOCATION):
+    """Run a parser through the per-worker cache; re-parses only when the file changes"""
+    name = parser.__name__
+    key, size = parse_cache_key(parser, filepath)
+
+    force = force_reparse_requested()
+    cached = _parse_cache.get((location, name))
+    if cached and cached[0] == key and not force:
+        PARSE_CACHE_REQUESTS.labels(location=location, parser=name, result='hit').inc()
+        return cached[1]
+    if not force:
+        result = load_stored_parse(parser, filepath, location, key)
+        if result is not parse_store.MISSING:
+            return result
+        error = known_failure(location, name, key)
+        if error:
+            raise parse_sandbox.ParseFailed(f"{error} (earlier attempt)")
+
+    PARSE_CACHE_REQUESTS.labels(location=location, parser=name, result='miss').inc()
+    INPUT_FILE_BYTES.labels(location=location, parser=name).set(size)
+    started = time.perf_counter()
     try:
-        if filepath.lower().endswith('.xlsx'):
-            return pd.read_excel(filepath, engine='openpyxl', **kwargs)
-        return pd.read_excel(filepath, engine='xlrd', **kwargs)
+        with PARSE_DURATION.labels(location=location, parser=name).time():
+            result = run_parser(parser, filepath)
     except Exception as e:
+        note_parse_failure(location, name, key, str(e) or type(e).__name__)
+        raise
+    _failed_parses.pop((location, name), None)
+    note_parse(location, name, time.perf_counter() - started)
+    parse_store.save(parser, filepath, key, result)
+    cache_parse_result(location, name, key, result)
+    return result
+
+# (location, parser name) -> last parse this worker ran: {'seconds', 'finished' (epoch), 'error'}
+_parse_status = {}
+
+def note_parse(location, name, seconds=None, error=None):
+    """Record how the last parse of a report went, for /health/ready"""
+    _parse_status[(location, name)] = {
+        'seconds': None if seconds is None else round(seconds, 3),
+        'finished': time.time(),
+        'error': error,
+    }
+
+def load_stored_parse(parser, filepath, location, key):
+    """Fill the parse cache from the on-disk parse store (see parse_store.py), or return MISSING"""
+    result = parse_store.load(parser, filepath, key)
+    if result is not parse_store.MISSING:
+        PARSE_CACHE_REQUESTS.labels(location=location, parser=parser.__name__, result='stored').inc()
+        cache_parse_result(location, parser.__name__, key, result)
+    return result
+
+# Parser name -> {index kind: builder(parser name, file key, result)} for indexes built with each parse
+REPORT_INDEXES = {}
+for _name in parts_query.LIST_FIELDS:
+    REPORT_INDEXES.setdefault(_name, {})['list'] = (
+        lambda name, key, result: parts_query.ListIndex(name, result, parts_query.snapshot_id(key))
+    )
+for _name in part_search.SOURCES:
+    REPORT_INDEXES.setdefault(_name, {})['search'] = lambda name, key, result: part_search.PrefixIndex(name, result)
+REPORT_INDEXES.setdefault('parse_po_over_30', {})['status'] = lambda name, key, result: part_status.po_table(result)
+REPORT_INDEXES.setdefault('parse_no_bins', {})['status'] = lambda name, key, result: part_status.no_bin_table(result)
+
+# (location, parser name) -> (file key, {index kind: index}) for the cached parse of each report
+_report_indexes = {}
+
+def cache_parse_result(location, name, key, result):
+    """Store a parse in the cache, building that report's query/search/join indexes at the same time"""
+    _parse_cache[(location, name)] = (key, result)
+    if name in REPORT_INDEXES:
+        build_report_indexes(location, name, key, result)
+
+def build_report_indexes(location, name, key, result):
+    indexed = (key, {kind: build(name, key, result) for kind, build in REPORT_INDEXES[name].items()})
+    _report_indexes[(location, name)] = indexed
+    return indexed
+
+def get_report_index(location, name, kind, keys, parsed):
+    """
+    An index ('list', 'search' or 'status') for the parse of a report a request got from parse_reports
+    (keys and parsed are its file keys and results), built now if it isn't indexed yet
+    """
+    indexed = _report_indexes.get((location, name))
+    if indexed is None or indexed[0] != keys[name]:
+        indexed = build_report_indexes(location, name, keys[name], parsed[name])
+    return indexed[1][kind]
+
+# Location -> (file keys of the three inputs, joined part status rows)
+_part_status_views = {}
+
+def get_part_status_view(location, parsed, keys):
+    """
+    Back orders joined with PO Over 30 and No Bins, re-joined only when an input changed.
+    parsed and keys are the results and file keys of the three reports from parse_reports.
+    """
+    inputs = ('parse_open_back_orders', 'parse_po_over_30', 'parse_no_bins')
+    input_keys = tuple(keys[name] if name in parsed else None for name in inputs)
+    cached = _part_status_views.get(location)
+    if cached and cached[0] == input_keys:
+        return cached[1]
+    pos = get_report_index(location, 'parse_po_over_30', 'status', keys, parsed) if 'parse_po_over_30' in parsed else {}
+    no_bins = get_report_index(location, 'parse_no_bins', 'status', keys, parsed) if 'parse_no_bins' in parsed else {}
+    view = part_status.build_view(parsed.get('parse_open_back_orders', []), pos, no_bins)
+    _part_status_views[location] = (input_keys, view)
+    return view
+
+def force_reparse_requested():
+    """Profiled requests always re-parse so the profile shows the parser work"""
+    return has_request_context() and g.get('force_reparse', False)
+
+def parse_cache_key(parser, filepath):
+    """Cache key for the file a parser reads, plus the file size"""
+    stat = os.stat(filepath)
+    key = (filepath, stat.st_mtime_ns, stat.st_size)
+    if report_registry.cache_policy(parser.__name__) == 'daily':
+        # e.g. the schedule's today/tomorrow buckets depend on the current date
+        key += (datetime.now().date(),)
+    return key, stat.st_size
+
+_parse_pool = None
+_parse_pool_pid = None
+# (location, parser name) -> (file key, future, start time) for parses running in the pool.
+# Request threads and the pool's done-callbacks both change it, so only under _inflight_lock
+_inflight_parses = {}
+_inflight_lock = threading.RLock()
+
+def _reset_inflight_lock():
+    # A fork (gunicorn after warm_cache) may happen while a done-callback holds the lock
+    global _inflight_lock
+    _inflight_lock = threading.RLock()
+
+os.register_at_fork(after_in_child=_reset_inflight_lock)
+
+def get_parse_pool():
+    """The parse pool for this process (gunicorn workers each create their own after the fork)"""
+    global _parse_pool, _parse_pool_pid
+    if _parse_pool is None or _parse_pool_pid != os.getpid():
+        _inflight_parses.clear()
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                          mp_context=multiprocessing.get_context('fork'))
+        _parse_pool_pid = os.getpid()
+    return _parse_pool
+
+def reset_parse_pool():
+    """Drop a broken pool (e.g. a parse process was OOM-killed); the next miss starts a new one"""
+    global _parse_pool
+    with _inflight_lock:
+        if _parse_pool is not None and _parse_pool_pid == os.getpid():
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+        _inflight_parses.clear()
+
+def timed_parse(parser, filepath, key):
+    """Runs in a pool process: parse, save to the parse store and report how long the parse took"""
+    started = time.perf_counter()
+    result = run_parser(parser, filepath)
+    seconds = time.perf_counter() - started
+    parse_store.save(parser, filepath, key, result)
+    return result, seconds
+
+def submit_parse(parser, filepath, location, key):
+    """
+    Start a parse in the pool, or join one already running for the same file.
+    When it finishes the result goes into the parse cache, even if the request
+    that started it has stopped waiting.
+    """
+    name = parser.__name__
+    with _inflight_lock:
+        running = _inflight_parses.get((location, name))
+        if running and running[0] == key:
+            return running[1]
+        future = get_parse_pool().submit(timed_parse, parser, filepath, key)
+        _inflight_parses[(location, name)] = (key, future, time.time())
+
+    def store_result(done):
+        with _inflight_lock:
+            current = _inflight_parses.get((location, name), (None, None))[1]
+            if current is done:
+                del _inflight_parses[(location, name)]
+            elif current is not None:
+                return  # superseded by a parse of a newer file
+        if done.cancelled():
+            return
+        error = done.exception()
+        if isinstance(error, BrokenProcessPool):
+            note_parse(location, name, error='parse process died')  # not this file's fault
+            return
+        if error is not None:
+            note_parse_failure(location, name, key, str(error) or type(error).__name__)
+            return
+        result, seconds = done.result()
+        _failed_parses.pop((location, name), None)
+        note_parse(location, name, seconds)
+        PARSE_DURATION.labels(location=location, parser=name).observe(seconds)
+        cache_parse_result(location, name, key, result)
+
+    future.add_done_callback(store_result)
+    return future
+
+def parse_reports(jobs, location=locations.DEFAULT_LOCATION, keys=None):
+    """
+    Parse several (parser, filepath) jobs for one location.
+    Cache hits are returned directly; misses run in parallel in the parse pool
+    so the request costs about as much as the slowest report. A parser that
+    fails, or is still running after its timeout, is listed in failed; its
+    result is the last good parse of that report, if this worker has one.
+    Returns (results, failed), both keyed by parser name. If a keys dict is
+    passed, it gets the file key of each result (for get_report_index).
+    """
+    results = {}
+    failed = {}
+    keys = {} if keys is None else keys
+
+    if PARSE_WORKERS <= 1 or force_reparse_requested():
+        for parser, filepath in jobs:
+            try:
+                key = parse_cache_key(parser, filepath)[0]
+                results[parser.__name__] = parse_report(parser, filepath, location)
+                keys[parser.__name__] = key
+            except Exception as e:
+                print(f"Error in {parser.__name__}: {e}")
+                failed[parser.__name__] = str(e)
+        return serve_last_good(results, failed, location, keys)
+
+    waiting = []
+    for parser, filepath in jobs:
+        name = parser.__name__
+        try:
+            key, size = parse_cache_key(parser, filepath)
+        except OSError as e:
+            failed[name] = str(e)
+            continue
+        cached = _parse_cache.get((location, name))
+        if cached and cached[0] == key:
+            PARSE_CACHE_REQUESTS.labels(location=location, parser=name, result='hit').inc()
+            results[name] = cached[1]
+            keys[name] = key
+            continue
+        stored = load_stored_parse(parser, filepath, location, key)
+        if stored is not parse_store.MISSING:
+            results[name] = stored
+            keys[name] = key
+            continue
+        error = known_failure(location, name, key)
+        if error:
+            failed[name] = error
+            continue
+        PARSE_CACHE_REQUESTS.labels(location=location, parser=name, result='miss').inc()
+        INPUT_FILE_BYTES.labels(location=location, parser=name).set(size)
+        waiting.append((name, key, submit_parse(parser, filepath, location, key)))
+
+    started = time.perf_counter()
+    for name, key, future in waiting:
+        remaining = PARSE_TIMEOUTS.get(name, PARSE_TIMEOUT) - (time.perf_counter() - started)
+        try:
+            # The pool's done-callback may not have filled the parse cache yet, so keep the key with the result
+            results[name] = future.result(timeout=max(0, remaining))[0]
+            keys[name] = key
+        except FutureTimeoutError:
+            print(f"{name} still parsing after {PARSE_TIMEOUTS.get(name, PARSE_TIMEOUT):g}s - answering without it")
+            failed[name] = 'timeout'
+        except BrokenProcessPool as e:
+            print(f"Parse pool failed during {name}: {e}")
+            failed[name] = 'parse process died'
+            reset_parse_pool()
+        except Exception as e:
+            print(f"Error in {name}: {e}")
+            failed[name] = str(e)
+    return serve_last_good(results, failed, location, keys)
+
+def serve_last_good(results, failed, location, keys):
+    """Fill in failed parsers from the parse cache; they stay in failed, so responses say they are stale"""
+    for name in failed:
+        cached = _parse_cache.get((location, name))
+        if cached:
+            keys[name], results[name] = cached
+    return results, failed
+
+def profiled(view):
+    """Run a route under request_profiler when profiling is switched on for the request"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not request_profiler.profiling_requested(request.args):
+            return view(*args, **kwargs)
+        g.force_reparse = True
+        with request_profiler.profile(request.endpoint) as result:
+            response = app.make_response(view(*args, **kwargs))
+        response.headers['X-Profile-File'] = os.path.basename(result['path'])
+        print(f"Profiled {request.path} in {result['seconds']:.3f}s -> {result['path']}")
+        return response
+    return wrapper
+
+def current_rss_bytes():
+    """Resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def read_excel_safe(filepath, **kwargs):
+    """
+    Read an Excel file, trying the engine that last worked for this report type
+    in this folder first, then the others (see excel_engines.py)
+    """
+    filename = os.path.basename(filepath)
+    report = report_registry.match_filename(filename, aliases=True)
+    report = report.name if report else 'unknown'
+    failures = {}
+    error = None
+    for engine in excel_engines.engine_order(filepath, report):
+        started = time.perf_counter()
         try:
-            return pd.read_excel(filepath, engine='calamine', **kwargs)
-        except Exception as e2:
-            print(f"Error reading Excel file {os.path.basename(filepath)}: {e}")
-            print(f"Fallback to calamine failed: {e2}")
-            raise
+            df = pd.read_excel(filepath, engine=engine, **kwargs)
+        except ImportError as e:
+            excel_engines.mark_unavailable(engine)
+            error = e
+            continue
+        except Exception as e:
+            EXCEL_READ_DURATION.labels(report=report, engine=engine, result='error').observe(time.perf_counter() - started)
+            print(f"Excel engine {engine} could not read {filename}: {e}")
+            failures[engine] = str(e)[:200]
+            error = e
+            continue
+        seconds = time.perf_counter() - started
+        EXCEL_READ_DURATION.labels(report=report, engine=engine, result='ok').observe(seconds)
+        excel_engines.remember(filepath, report, engine, seconds, failures)
+        return df
+    print(f"Error reading Excel file {filename}: no engine could read it")
+    raise error or ValueError(f"No Excel engine available for {filename}")
+
+def read_report_table(filepath, report):
+    """
+    Read only the columns a report declares for its CSV/Excel export (see
+    report_registry.Table), with their declared dtypes, under their declared names.
+    Columns are found by header label, else by position; missing ones are left out.
+    """
+    table = report_registry.REPORTS[report].table_for(filepath)
+    is_csv = filepath.lower().endswith('.csv')
+    read = pd.read_csv if is_csv else read_excel_safe
+
+    df = None
+    if is_csv:
+        labels = list(pd.read_csv(filepath, header=table.header, nrows=0).columns)
+    else:
+        labels = excel_engines.read_header_row(filepath, table.header)
+        if labels is not None:
+            # The header row only runs to its last filled cell, and may be a short title
+            # row (Sales and Gross - Graphic.xlsx), so it doesn't bound positional columns
+            declared = [column.position + 1 for column in table.columns if column.position is not None]
+            labels = labels + [''] * (max(declared, default=0) - len(labels))
+    if labels is None:
+        # Header not readable on its own: read everything and pick the columns afterwards
+        df = read(filepath, header=table.header, nrows=table.nrows)
+        labels = list(df.columns)
+
+    stripped = [str(label).strip() for label in labels]
+    positions = {}
+    for column in table.columns:
+        if column.header and column.header in stripped:
+            position = stripped.index(column.header)
+        elif column.position is not None and column.position < len(labels):
+            position = column.position
+        else:
+            continue
+        if position not in positions.values():
+            positions[column.name] = position
+    columns = sorted(positions, key=positions.get)
+    specs = {column.name: column for column in table.columns}
+
+    if df is not None:
+        df = df.iloc[:, [positions[name] for name in columns]]
+    else:
+        # read_csv takes dtypes by position; read_excel only by header label
+        dtype = {}
+        for name in columns:
+            label = positions[name] if is_csv else labels[positions[name]]
+            if specs[name].dtype is not None and (is_csv or (label and labels.count(label) == 1)):
+                dtype[label] = specs[name].dtype
+        df = read(filepath, header=table.header, nrows=table.nrows,
+                  usecols=[positions[name] for name in columns], dtype=dtype)
+    df.columns = columns
+    return df
 
 def parse_shop_schedule(filepath):
     """
@@ -142,13 +694,13 @@ def parse_shop_schedule(filepath):
                         if not invoice or not invoice.isdigit():
                             continue
                         
-                        job_data = {
-                            'customer': customer,
-                            'job': f"{model} - {description[:50]}..." if len(description) > 50 else f"{model} - {description}",
-                            'mechanic': current_mechanic or 'Unassigned',
-                            'time': start_time,
-                            'status': status
-                        }
+                        job_data = ScheduledJob(
+                            customer=customer,
+                            job=f"{model} - {description[:50]}..." if len(description) > 50 else f"{model} - {description}",
+                            mechanic=current_mechanic or 'Unassigned',
+                            time=start_time,
+                            status=status
+                        )
                         
                         # Only include if it's a fit-in or house account job
                         if in_fit_in_section and current_mechanic in ['Fit-In', 'House Account']:
@@ -166,12 +718,7 @@ def parse_shop_schedule(filepath):
         
         else:
             # Excel or CSV format
-            if filepath.endswith('.csv'):
-                df = pd.read_csv(filepath)
-            elif filepath.endswith('.xlsx'):
-                df = pd.read_excel(filepath, engine='openpyxl')
-            else:
-                df = pd.read_excel(filepath, engine='xlrd')
+            df = read_report_table(filepath, 'schedule')
             
             today = datetime.now().date()
             tomorrow = pd.Timestamp(today) + pd.Timedelta(days=1)
@@ -190,48 +737,51 @@ def parse_shop_schedule(filepath):
                 # Today's schedule
                 today_df = df[df['ScheduledStartTime'].dt.date == today]
                 for _, row in today_df.iterrows():
-                    schedule_data['today'].append({
-                        'customer': str(row.get('Customer', '')),
-                        'job': f"{row.get('Model', '')} - {row.get('description', '')}"[:80],
-                        'mechanic': str(row.get('Mechanic', '')),
-                        'time': row['ScheduledStartTime'].strftime('%I:%M %p') if pd.notna(row['ScheduledStartTime']) else ''
-                    })
+                    schedule_data['today'].append(ScheduledJob(
+                        customer=str(row.get('Customer', '')),
+                        job=f"{row.get('Model', '')} - {row.get('description', '')}"[:80],
+                        mechanic=str(row.get('Mechanic', '')),
+                        time=row['ScheduledStartTime'].strftime('%I:%M %p') if pd.notna(row['ScheduledStartTime']) else ''
+                    ))
                 
                 # Tomorrow's schedule
                 tomorrow_df = df[df['ScheduledStartTime'].dt.date == tomorrow.date()]
                 for _, row in tomorrow_df.iterrows():
-                    schedule_data['tomorrow'].append({
-                        'customer': str(row.get('Customer', '')),
-                        'job': f"{row.get('Model', '')} - {row.get('description', '')}"[:80],
-                        'mechanic': str(row.get('Mechanic', '')),
-                        'time': row['ScheduledStartTime'].strftime('%I:%M %p') if pd.notna(row['ScheduledStartTime']) else ''
-                    })
+                    schedule_data['tomorrow'].append(ScheduledJob(
+                        customer=str(row.get('Customer', '')),
+                        job=f"{row.get('Model', '')} - {row.get('description', '')}"[:80],
+                        mechanic=str(row.get('Mechanic', '')),
+                        time=row['ScheduledStartTime'].strftime('%I:%M %p') if pd.notna(row['ScheduledStartTime']) else ''
+                    ))
                 
                 # If no today/tomorrow data, show the most recent scheduled jobs
                 if len(schedule_data['today']) == 0 and len(schedule_data['tomorrow']) == 0:
                     recent_df = df[pd.notna(df['ScheduledStartTime'])].sort_values('ScheduledStartTime', ascending=False).head(15)
                     for _, row in recent_df.iterrows():
-                        schedule_data['today'].append({
-                            'customer': str(row.get('Customer', '')),
-                            'job': f"{row.get('Model', '')} - {row.get('description', '')}"[:80],
-                            'mechanic': str(row.get('Mechanic', '')),
-                            'time': row['ScheduledStartTime'].strftime('%m/%d %I:%M %p') if pd.notna(row['ScheduledStartTime']) else ''
-                        })
+                        schedule_data['today'].append(ScheduledJob(
+                            customer=str(row.get('Customer', '')),
+                            job=f"{row.get('Model', '')} - {row.get('description', '')}"[:80],
+                            mechanic=str(row.get('Mechanic', '')),
+                            time=row['ScheduledStartTime'].strftime('%m/%d %I:%M %p') if pd.notna(row['ScheduledStartTime']) else ''
+                        ))
             
             # Find Fit-Ins and House Account jobs (Mechanic column contains "Fit-In" or "House Account")
             if 'Mechanic' in df.columns:
                 fit_in_df = df[df['Mechanic'].astype(str).str.contains('Fit-In|House Account', case=False, na=False)]
                 for _, row in fit_in_df.iterrows():
-                    schedule_data['fit_ins'].append({
-                        'customer': str(row.get('Customer', '')),
-                        'job': f"{row.get('Model', '')} - {row.get('description', '')}"[:80],
-                        'notes': str(row.get('Status', ''))
-                    })
+                    schedule_data['fit_ins'].append(FitIn(
+                        customer=str(row.get('Customer', '')),
+                        job=f"{row.get('Model', '')} - {row.get('description', '')}"[:80],
+                        notes=str(row.get('Status', ''))
+                    ))
             
             return schedule_data
     
+    except MemoryError:
+        raise  # parse_sandbox.py's memory limit, not an empty report
     except Exception as e:
         print(f"Error parsing shop schedule: {e}")
+        PARSE_ERRORS.labels(parser='parse_shop_schedule').inc()
         import traceback
         traceback.print_exc()
         return {'today': [], 'tomorrow': [], 'fit_ins': [], 'error': str(e)}
@@ -261,59 +811,55 @@ def parse_open_back_orders(filepath):
                 if 'Back-Ordered' in line:
                     parts = line.split(',')
                     if len(parts) >= 3:
-                        # Format: Customer,Phone,Part Number,...,Status,...
+                        # Format: Customer,Phone,Part Number,...,Status,...,PO
                         customer = parts[0].strip() if parts[0] else ''
                         part_number = parts[2].strip() if len(parts) > 2 else ''
                         status = 'Back-Ordered'   # Only Back-Ordered items
+                        po_number = parts[11].strip() if len(parts) > 11 else ''
                         
                         if part_number and part_number != 'Part Number':  # Skip header
-                            parts_received.append({
-                                'part_number': part_number,
-                                'customer': customer if customer and customer != 'Customer' else 'N/A',
-                                'status': status
-                            })
+                            parts_received.append(PartReceived(
+                                part_number=part_number,
+                                customer=customer if customer and customer != 'Customer' else 'N/A',
+                                status=status,
+                                po_number=po_number
+                            ))
             
             return parts_received
         
-        elif filepath.endswith('.csv'):
-            df = pd.read_csv(filepath)
-        else:
-            df = pd.read_excel(filepath, engine='xlrd')
+        # Excel (header at row 4) or CSV; columns are declared in report_registry.py
+        df = read_report_table(filepath, 'backorders')
         
         parts_received = []
         
-        # The header is at row 4 (index 4) for Excel files
-        # Customer is column 1, Part Number is column 9, Status is column 17
-        # Re-read with proper header (skip for CSV as it has headers already)
-        if not filepath.endswith('.csv'):
-            df = pd.read_excel(filepath, engine='xlrd', header=4)
-        
-        # Clean up column names
-        df.columns = [str(col).strip() if pd.notna(col) else f'Col_{i}' for i, col in enumerate(df.columns)]
-        
-        # Find columns by name or position
-        customer_col = 'Customer' if 'Customer' in df.columns else df.columns[1]
-        part_col = df.columns[9]  # Part number is at column index 9
-        status_col = 'Status' if 'Status' in df.columns else df.columns[17]
+        customer_col = 'Customer'
+        part_col = 'Part Number'
+        status_col = 'Status'
+        po_col = 'PO' if 'PO' in df.columns else None
         
         # Filter for Back-Ordered only
         for _, row in df.iterrows():
             status = str(row[status_col]).strip() if pd.notna(row[status_col]) else ''
             part_number = str(row[part_col]).strip() if pd.notna(row[part_col]) else ''
             customer = str(row[customer_col]).strip() if pd.notna(row[customer_col]) else ''
+            po_number = str(row[po_col]).strip() if po_col and pd.notna(row[po_col]) else None
             
             # Check if status contains Back-Ordered or On Order
             if ('back-ordered' in status.lower()) and part_number and part_number != 'nan':
-                parts_received.append({
-                    'part_number': part_number,
-                    'customer': customer if customer and customer != 'nan' else 'N/A',
-                    'status': status
-                })
+                parts_received.append(PartReceived(
+                    part_number=part_number,
+                    customer=customer if customer and customer != 'nan' else 'N/A',
+                    status=status,
+                    po_number=po_number
+                ))
         
         return parts_received
     
+    except MemoryError:
+        raise  # parse_sandbox.py's memory limit, not an empty report
     except Exception as e:
         print(f"Error parsing open back orders: {e}")
+        PARSE_ERRORS.labels(parser='parse_open_back_orders').inc()
         import traceback
         traceback.print_exc()
         return []
@@ -363,25 +909,28 @@ def parse_backorders_over_5(filepath):
                     if age >= 5 and part_number:
                         # Use previous row's customer/phone if current row is blank
                         if not customer and backorders:
-                            customer = backorders[-1]['customer']
-                            phone = backorders[-1]['phone']
+                            customer = backorders[-1].customer
+                            phone = backorders[-1].phone
                         
-                        backorders.append({
-                            'customer': customer if customer else 'N/A',
-                            'phone': phone if phone else 'N/A',
-                            'part_number': part_number,
-                            'age': age,
-                            'status': status,
-                            'priority': 'critical' if age >= 30 else 'high' if age >= 15 else 'medium' if age >= 10 else 'normal'
-                        })
+                        backorders.append(Backorder(
+                            customer=customer if customer else 'N/A',
+                            phone=phone if phone else 'N/A',
+                            part_number=part_number,
+                            age=age,
+                            status=status,
+                            priority='critical' if age >= 30 else 'high' if age >= 15 else 'medium' if age >= 10 else 'normal'
+                        ))
         
         # Sort by age descending (oldest first)
-        backorders.sort(key=lambda x: x['age'], reverse=True)
+        backorders.sort(key=lambda x: x.age, reverse=True)
         
         return backorders
     
+    except MemoryError:
+        raise  # parse_sandbox.py's memory limit, not an empty report
     except Exception as e:
         print(f"Error parsing backorders over 5: {e}")
+        PARSE_ERRORS.labels(parser='parse_backorders_over_5').inc()
         import traceback
         traceback.print_exc()
         return []
@@ -446,16 +995,16 @@ def parse_po_over_30(filepath):
                 total = money_match.group(0) if money_match else ''
                 
                 if age >= 30 and po_number:
-                    po_data.append({
-                        'vendor': current_vendor,
-                        'po_number': po_number,
-                        'age': age,
-                        'status': status,
-                        'since': since,
-                        'items': items,
-                        'total': total,
-                        'priority': 'critical' if age >= 90 else 'high' if age >= 60 else 'medium'
-                    })
+                    po_data.append(PurchaseOrder(
+                        vendor=current_vendor,
+                        po_number=po_number,
+                        age=age,
+                        status=status,
+                        since=since,
+                        items=items,
+                        total=total,
+                        priority='critical' if age >= 90 else 'high' if age >= 60 else 'medium'
+                    ))
                 continue
             
             # Remaining non-header, non-PO lines are vendor headings.
@@ -463,12 +1012,15 @@ def parse_po_over_30(filepath):
                 current_vendor = line.split(',')[0].strip()
         
         # Sort by age descending (oldest first)
-        po_data.sort(key=lambda x: x['age'], reverse=True)
+        po_data.sort(key=lambda x: x.age, reverse=True)
         
         return po_data
     
+    except MemoryError:
+        raise  # parse_sandbox.py's memory limit, not an empty report
     except Exception as e:
         print(f"Error parsing PO over 30: {e}")
+        PARSE_ERRORS.labels(parser='parse_po_over_30').inc()
         import traceback
         traceback.print_exc()
         return []
@@ -509,17 +1061,20 @@ def parse_no_bins(filepath):
                 
                 # Skip if this is the header row
                 if part_number and part_number != 'Part Number':
-                    no_bins.append({
-                        'line_code': line_code,
-                        'part_number': part_number,
-                        'description': description,
-                        'available': available
-                    })
+                    no_bins.append(NoBinPart(
+                        line_code=line_code,
+                        part_number=part_number,
+                        description=description,
+                        available=available
+                    ))
         
         return no_bins
     
+    except MemoryError:
+        raise  # parse_sandbox.py's memory limit, not an empty report
     except Exception as e:
         print(f"Error parsing no bins file: {e}")
+        PARSE_ERRORS.labels(parser='parse_no_bins').inc()
         import traceback
         traceback.print_exc()
         return []
@@ -561,11 +1116,11 @@ def parse_gross_profit_mechanic(filepath):
                         except:
                             labor_sales = 0
                         
-                        mechanic_metrics.append({
-                            'name': 'Derek Snyder',
-                            'efficiency': 0,  # Will update from Hours Worked line
-                            'labor_sales': labor_sales
-                        })
+                        mechanic_metrics.append(MechanicMetric(
+                            name='Derek Snyder',
+                            efficiency=0,  # Will update from Hours Worked line
+                            labor_sales=labor_sales
+                        ))
                         awaiting_hours = True
                 
                 elif (line.startswith('bChris Deman,') or line.startswith('pChris Deman,') or 
@@ -578,11 +1133,11 @@ def parse_gross_profit_mechanic(filepath):
                         except:
                             labor_sales = 0
                         
-                        mechanic_metrics.append({
-                            'name': 'Chris Deman',
-                            'efficiency': 0,
-                            'labor_sales': labor_sales
-                        })
+                        mechanic_metrics.append(MechanicMetric(
+                            name='Chris Deman',
+                            efficiency=0,
+                            labor_sales=labor_sales
+                        ))
                         awaiting_hours = True
                 
                 elif (line.startswith('bBrandon Wallace,') or line.startswith('pBrandon Wallace,')) and len(line) > 50:
@@ -594,11 +1149,11 @@ def parse_gross_profit_mechanic(filepath):
                         except:
                             labor_sales = 0
                         
-                        mechanic_metrics.append({
-                            'name': 'Brandon Wallace',
-                            'efficiency': 0,
-                            'labor_sales': labor_sales
-                        })
+                        mechanic_metrics.append(MechanicMetric(
+                            name='Brandon Wallace',
+                            efficiency=0,
+                            labor_sales=labor_sales
+                        ))
                         awaiting_hours = True
                 
                 # Look for efficiency data - "Hours Worked:,109:40,92%,81%"
@@ -613,13 +1168,13 @@ def parse_gross_profit_mechanic(filepath):
                             
                             # Update the last added mechanic
                             if mechanic_metrics:
-                                mechanic_metrics[-1]['efficiency'] = efficiency
+                                mechanic_metrics[-1].efficiency = efficiency
                         except:
                             pass
                     awaiting_hours = False
             
             # Calculate overall efficiency
-            efficiencies = [m['efficiency'] for m in mechanic_metrics if m['efficiency'] > 0]
+            efficiencies = [m.efficiency for m in mechanic_metrics if m.efficiency > 0]
             overall_efficiency = sum(efficiencies) / len(efficiencies) if efficiencies else 0
             
             return {
@@ -630,7 +1185,7 @@ def parse_gross_profit_mechanic(filepath):
         # If not a text file, try Excel or CSV parsing
         else:
             if filepath.endswith('.csv'):
-                df = pd.read_csv(filepath)
+                df = read_report_table(filepath, 'grossprofit')
                 
                 # Parse CSV: aggregate by mechanic name
                 mechanic_metrics = []
@@ -673,14 +1228,20 @@ def parse_gross_profit_mechanic(filepath):
                         if time_actual_total > 0:
                             efficiency = (time_billed_total / time_actual_total) * 100
                         
-                        mechanic_metrics.append({
-                            'name': mechanic_name,
-                            'efficiency': round(efficiency, 1),
-                            'labor_sales': round(labor_sales, 2)
-                        })
+                        mechanic_metrics.append(MechanicMetric(
+                            name=mechanic_name,
+                            efficiency=round(efficiency, 1),
+                            labor_sales=round(labor_sales, 2)
+                        ))
                 
-            else:
-                df = pd.read_excel(filepath, engine='xlrd')
+                efficiencies = [m.efficiency for m in mechanic_metrics if m.efficiency > 0]
+                return {
+                    'mechanics': mechanic_metrics,
+                    'overall_efficiency': sum(efficiencies) / len(efficiencies) if efficiencies else 0
+                }
+            
+            # Graphic workbook: values at fixed cells (columns declared in report_registry.py)
+            df = read_report_table(filepath, 'grossprofit')
             
             mechanics = {
                 'Derek Snyder': {'efficiency_cell': 'G120', 'labor_cell': 'O119'},
@@ -699,13 +1260,9 @@ def parse_gross_profit_mechanic(filepath):
                     labor_col = cells['labor_cell'][0]
                     labor_row = int(cells['labor_cell'][1:]) - 1
                     
-                    # Convert column letter to index (A=0, B=1, etc.)
-                    eff_col_idx = ord(eff_col) - ord('A')
-                    labor_col_idx = ord(labor_col) - ord('A')
-                    
-                    # Extract values
-                    efficiency = df.iloc[eff_row, eff_col_idx] if eff_row < len(df) else None
-                    labor_sales = df.iloc[labor_row, labor_col_idx] if labor_row < len(df) else None
+                    # Extract values (the table's columns are named by their letter)
+                    efficiency = df[eff_col].iloc[eff_row] if eff_row < len(df) else None
+                    labor_sales = df[labor_col].iloc[labor_row] if labor_row < len(df) else None
                     
                     # Clean up the values
                     if pd.notna(efficiency):
@@ -724,22 +1281,24 @@ def parse_gross_profit_mechanic(filepath):
                         except:
                             pass
                     
-                    mechanic_metrics.append({
-                        'name': mechanic_name,
-                        'efficiency': efficiency if pd.notna(efficiency) else 0,
-                        'labor_sales': labor_sales if pd.notna(labor_sales) else 0
-                    })
+                    mechanic_metrics.append(MechanicMetric(
+                        name=mechanic_name,
+                        efficiency=efficiency if pd.notna(efficiency) else 0,
+                        labor_sales=labor_sales if pd.notna(labor_sales) else 0
+                    ))
                 
+                except MemoryError:
+                    raise
                 except Exception as e:
                     print(f"Error parsing metrics for {mechanic_name}: {e}")
-                    mechanic_metrics.append({
-                        'name': mechanic_name,
-                        'efficiency': 0,
-                        'labor_sales': 0
-                    })
+                    mechanic_metrics.append(MechanicMetric(
+                        name=mechanic_name,
+                        efficiency=0,
+                        labor_sales=0
+                    ))
             
             # Calculate overall efficiency
-            efficiencies = [m['efficiency'] for m in mechanic_metrics if isinstance(m['efficiency'], (int, float))]
+            efficiencies = [m.efficiency for m in mechanic_metrics if isinstance(m.efficiency, (int, float))]
             overall_efficiency = sum(efficiencies) / len(efficiencies) if efficiencies else 0
             
             return {
@@ -747,40 +1306,16 @@ def parse_gross_profit_mechanic(filepath):
                 'overall_efficiency': overall_efficiency
             }
     
+    except MemoryError:
+        raise  # parse_sandbox.py's memory limit, not an empty report
     except Exception as e:
         print(f"Error parsing gross profit mechanic: {e}")
+        PARSE_ERRORS.labels(parser='parse_gross_profit_mechanic').inc()
         import traceback
         traceback.print_exc()
         return {'mechanics': [], 'overall_efficiency': 0}
 
 
-def find_quarterly_sales_file():
-    """Find the most recent Site lead Statement text file"""
-    txt_files = [
-        os.path.join(DATASHEETS_DIR, f)
-        for f in os.listdir(DATASHEETS_DIR)
-        if f.lower().endswith('.txt')
-    ]
-    
-    if not txt_files:
-        return None
-    
-    # Check most recently modified files first (faster)
-    txt_files_sorted = sorted(txt_files, key=os.path.getmtime, reverse=True)
-    
-    # Check all files
-    for path in txt_files_sorted[:5]:
-        try:
-            with open(path, 'r') as f:
-                head = ''.join([next(f) for _ in range(3)])
-            if 'Site lead Statement' in head:
-                return path
-        except Exception:
-            continue
-    
-    return None
-
-
 def parse_quarterly_sales(filepath):
     """
     Parse Site lead Statement file for quarterly sales metrics
@@ -858,8 +1393,11 @@ def parse_quarterly_sales(filepath):
                 'labor': labor_target
             }
         }
+    except MemoryError:
+        raise  # parse_sandbox.py's memory limit, not an empty report
     except Exception as e:
         print(f"Error parsing quarterly sales: {e}")
+        PARSE_ERRORS.labels(parser='parse_quarterly_sales').inc()
         return {
             'new_equipment': {'month': 0.0, 'ytd': 0.0},
             'parts': {'month': 0.0, 'ytd': 0.0},
@@ -911,11 +1449,11 @@ def parse_strategic_plan(filepath):
                         if line and '|' in line:
                             parts = line.split('|')
                             if len(parts) >= 3:
-                                rocks.append({
-                                    'description': parts[0].strip(),
-                                    'owner': parts[1].strip(),
-                                    'status': parts[2].strip()
-                                })
+                                rocks.append(Rock(
+                                    description=parts[0].strip(),
+                                    owner=parts[1].strip(),
+                                    status=parts[2].strip()
+                                ))
             
             # Annual Goals Section
             elif 'ANNUAL GOALS' in section:
@@ -932,12 +1470,12 @@ def parse_strategic_plan(filepath):
                                     target = float(parts[1].strip())
                                     current = float(parts[2].strip())
                                     percent = (current / target * 100) if target > 0 else 0
-                                    goals.append({
-                                        'name': parts[0].strip(),
-                                        'target': target,
-                                        'current': current,
-                                        'percent': round(percent, 1)
-                                    })
+                                    goals.append(Goal(
+                                        name=parts[0].strip(),
+                                        target=target,
+                                        current=current,
+                                        percent=round(percent, 1)
+                                    ))
                                 except:
                                     pass
             
@@ -952,10 +1490,10 @@ def parse_strategic_plan(filepath):
                         if line and '|' in line:
                             parts = line.split('|')
                             if len(parts) >= 2:
-                                issues.append({
-                                    'description': parts[0].strip(),
-                                    'priority': parts[1].strip()
-                                })
+                                issues.append(Issue(
+                                    description=parts[0].strip(),
+                                    priority=parts[1].strip()
+                                ))
         
         return {
             'quarter_info': quarter_info,
@@ -964,8 +1502,11 @@ def parse_strategic_plan(filepath):
             'issues': issues
         }
     
+    except MemoryError:
+        raise  # parse_sandbox.py's memory limit, not an empty report
     except Exception as e:
         print(f"Error parsing strategic plan: {e}")
+        PARSE_ERRORS.labels(parser='parse_strategic_plan').inc()
         return {
             'quarter_info': '',
             'rocks': [],
@@ -974,48 +1515,224 @@ def parse_strategic_plan(filepath):
         }
 
 
+# Report name and the parsers that read it, in report_registry order
+REPORT_PARSERS = [
+    (report.name, [globals()[parser] for parser in report.parsers])
+    for report in report_registry.REPORT_TYPES
+]
+
+def warm_cache():
+    """
+    Parse every current report, at every location, into the parse cache.
+    gunicorn.conf.py calls this in the master before forking, so all workers
+    start with the same warm, copy-on-write parse results.
+    """
+    parsed = 0
+    for location in LOCATIONS:
+        catalog = get_report_catalog(location)
+        for report, parsers in REPORT_PARSERS:
+            filepath = catalog[report]
+            if not filepath:
+                continue
+            for parser in parsers:
+                try:
+                    parse_report(parser, filepath, location)
+                    parsed += 1
+                except Exception as e:
+                    print(f"Warm-up skipped {parser.__name__} at {location}: {e}")
+    return parsed
+
+def parse_latest(location, report_name):
+    """
+    Parse the current file of one report into the parse store, so workers load
+    it instead of parsing it (ingest_service.py calls this after each upload).
+    Returns the file parsed, or None if the location has no such report.
+    """
+    global LOCATIONS
+    if location not in LOCATIONS:
+        LOCATIONS = locations.get_locations()
+    filepath = get_report_catalog(location).get(report_name)
+    if not filepath:
+        return None
+    for parser in dict(REPORT_PARSERS)[report_name]:
+        try:
+            parse_report(parser, filepath, location)
+        except Exception as e:
+            print(f"Error in {parser.__name__}: {e}")
+    return filepath
+
+# Reports searched by /api/part-search and joined by /api/part-status: (report name, parser)
+PART_SEARCH_REPORTS = [
+    ('backorders', parse_open_back_orders),
+    ('no_bins', parse_no_bins),
+    ('po_over_30', parse_po_over_30),
+]
+
+# Parts lists served by /api/parts/<list>: list name -> (report name, parser)
+PARTS_LISTS = {
+    'po_over_30': ('po_over_30', parse_po_over_30),
+    'backorders_over_5': ('backorders', parse_backorders_over_5),
+    'no_bins': ('no_bins', parse_no_bins),
+}
+
+def report_jobs(catalog):
+    """(parser, filepath) for every parser whose report is in the catalog"""
+    return [
+        (parser, catalog[report])
+        for report, parsers in REPORT_PARSERS if catalog[report]
+        for parser in parsers
+    ]
+
+def page_context(location):
+    """Template variables that point a page at its location's API and pages"""
+    if location == locations.DEFAULT_LOCATION:
+        return {'api_prefix': '/api', 'page_prefix': ''}
+    return {'api_prefix': f"/api/{location}", 'page_prefix': f"/store/{location}"}
+
+
+def server_render_requested():
+    render = request.args.get('render')
+    return render == 'server' if render in ('server', 'client') else SERVER_RENDER
+
+# dashboard.html elements filled in by the macros of the same name in dashboard_sections.html
+DASHBOARD_SECTIONS = (
+    'scheduleError', 'todaySchedule', 'fitInSchedule', 'tomorrowSchedule', 'partsReceived', 'quarterlySales',
+    'mechanicMetrics', 'overallEfficiency', 'noBinsTitle', 'noBinsTable', 'backordersTitle', 'backordersTable',
+    'poOver30Title', 'poOver30Table', 'grossProfitChart', 'eosStrategicPlan',
+)
+
+# Location -> server-rendered dashboard snapshot of the last complete generation
+_dashboard_snapshots = {}
+
+def render_dashboard_snapshot(location):
+    """
+    The dashboard's sections rendered to HTML for the current snapshot
+    generation: {'generation', 'complete', 'sections': {element id: html}}.
+    Rendered once per generation and shared by every page load until a report
+    changes; a snapshot missing a report (timeout or failure) isn't kept.
+    """
+    jobs = dashboard_jobs(location)
+    generation = snapshot_generation(location, jobs)
+    cached = _dashboard_snapshots.get(location)
+    if cached and cached['generation'] == generation:
+        return cached
+
+    data = to_json(build_dashboard_data(location, jobs))
+    del data['timestamp']
+    if not data['incomplete']:
+        remember_generation(location, generation, data)
+    today = datetime.now().date()
+    snapshot = {
+        'generation': generation,
+        'complete': not data['incomplete'],
+        'sections': {
+            name: get_template_attribute('dashboard_sections.html', name)(data, today)
+            for name in DASHBOARD_SECTIONS
+        },
+    }
+    if snapshot['complete']:
+        _dashboard_snapshots[location] = snapshot
+    return snapshot
+
+@app.template_filter('money')
+def format_money(value, places=2):
+    """$1,234.50 - currency the way the dashboard script formats it (en-US toLocaleString)"""
+    value = float(value or 0)
+    return f"{'-' if value < 0 else ''}${abs(value):,.{places}f}"
+
+@app.template_filter('grouped')
+def format_grouped(value):
+    """1,234.5 - a number as en-US toLocaleString() shows it (up to 3 decimals)"""
+    return f"{value:,.3f}".rstrip('0').rstrip('.')
+
+@app.template_filter('plain_number')
+def format_plain_number(value):
+    """85.0 -> 85, as JavaScript prints whole numbers"""
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+# Bundle name -> content-hashed file in assets/dist/ (see static_assets.py)
+ASSET_MANIFEST = static_assets.load_manifest()
+
+@app.template_global()
+def asset_url(bundle):
+    """URL of the current build of a static bundle ('dashboard.css', 'dashboard.js')"""
+    return f"/assets/{ASSET_MANIFEST[bundle]}"
+
+@app.route('/assets/<filename>')
+def asset(filename):
+    """A content-hashed bundle: immutable for a year, sent gzipped when the browser accepts it"""
+    if filename == static_assets.MANIFEST or filename.endswith('.gz'):
+        abort(404)
+    gzipped = bool(request.accept_encodings['gzip']) and os.path.exists(
+        os.path.join(static_assets.DIST_DIR, f"{filename}.gz")
+    )
+    response = send_from_directory(static_assets.DIST_DIR, f"{filename}.gz" if gzipped else filename,
+                                   mimetype=mimetypes.guess_type(filename)[0],
+                                   max_age=static_assets.CACHE_SECONDS)
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
 @app.route('/')
-def index():
+@app.route('/store/<location>/')
+def index(location=None):
     """Main shop operations dashboard"""
-    return render_template('dashboard.html')
+    location = resolve_location(location)
+    snapshot = render_dashboard_snapshot(location) if server_render_requested() else None
+    return render_template('dashboard.html', snapshot=snapshot, **page_context(location))
 
 @app.route('/landing')
-def landing():
+@app.route('/store/<location>/landing')
+def landing(location=None):
     """Landing page with 4 summary cards (future use)"""
-    return render_template('landing.html')
+    return render_template('landing.html', **page_context(resolve_location(location)))
 
 @app.route('/shop')
-def shop():
+@app.route('/store/<location>/shop')
+def shop(location=None):
     """Detailed shop operations dashboard (future use)"""
-    return render_template('shop.html')
+    return render_template('shop.html', **page_context(resolve_location(location)))
+
+@app.route('/default1')
+@app.route('/store/<location>/default1')
+def default1(location=None):
+    """Previous dashboard layout, kept as a backup"""
+    return render_template('default1.html', **page_context(resolve_location(location)))
 
 @app.route('/sales')
-def sales():
+@app.route('/store/<location>/sales')
+def sales(location=None):
     """Detailed sales performance dashboard"""
-    return render_template('sales.html')
+    return render_template('sales.html', **page_context(resolve_location(location)))
 
 @app.route('/parts')
-def parts():
+@app.route('/store/<location>/parts')
+def parts(location=None):
     """Detailed parts management dashboard"""
-    return render_template('parts.html')
+    return render_template('parts.html', **page_context(resolve_location(location)))
 
 @app.route('/eos')
-def eos():
+@app.route('/store/<location>/eos')
+def eos(location=None):
     """Detailed EOS strategic planning dashboard"""
-    return render_template('eos.html')
+    return render_template('eos.html', **page_context(resolve_location(location)))
 
 @app.route('/api/summary')
-def get_summary():
+@app.route('/api/<location>/summary')
+@profiled
+def get_summary(location=None):
     """API endpoint for landing page summary cards"""
+    location = resolve_location(location)
     
     # Get latest files
-    schedule_file = get_latest_file('Scheduled Shop Jobs')
-    backorders_file = get_latest_file('Open Back Orders')
-    grossprofit_file = get_latest_file('Sales and Gross')
-    quarterly_sales_file = get_latest_file('Site Lead')
-    no_bins_file = get_latest_file(['No Bins', 'No Bin'])
-    po_over_30_file = get_latest_file('PO Over 30')
-    strategic_plan_file = get_latest_file('Strategic Plan')
+    catalog = get_report_catalog(location)
+    for report_file in catalog.values():
+        note_report_served(report_file, location)
+    parsed, failed = parse_reports(report_jobs(catalog), location)
     
     summary = {
         'timestamp': datetime.now().isoformat(),
@@ -1049,26 +1766,26 @@ def get_summary():
     
     # Calculate Shop metrics
     try:
-        if schedule_file:
-            schedule = parse_shop_schedule(schedule_file)
+        if 'parse_shop_schedule' in parsed:
+            schedule = parsed['parse_shop_schedule']
             summary['shop']['today_jobs'] = len(schedule.get('today', []))
             summary['shop']['tomorrow_jobs'] = len(schedule.get('tomorrow', []))
         
-        if backorders_file:
-            parts_received = parse_open_back_orders(backorders_file)
-            summary['shop']['parts_requests'] = len(parts_received)
-            summary['parts']['bo_over_5'] = len(parse_backorders_over_5(backorders_file))
+        if 'parse_open_back_orders' in parsed:
+            summary['shop']['parts_requests'] = len(parsed['parse_open_back_orders'])
+        if 'parse_backorders_over_5' in parsed:
+            summary['parts']['bo_over_5'] = len(parsed['parse_backorders_over_5'])
         
-        if grossprofit_file:
-            mechanic_data = parse_gross_profit_mechanic(grossprofit_file)
+        if 'parse_gross_profit_mechanic' in parsed:
+            mechanic_data = parsed['parse_gross_profit_mechanic']
             summary['shop']['efficiency'] = int(mechanic_data.get('overall_efficiency', 0))
     except Exception as e:
         print(f"Error calculating shop metrics: {e}")
     
     # Calculate Sales metrics
     try:
-        if quarterly_sales_file:
-            sales_data = parse_quarterly_sales(quarterly_sales_file)
+        if 'parse_quarterly_sales' in parsed:
+            sales_data = parsed['parse_quarterly_sales']
             new_eq_month = sales_data['new_equipment']['month']
             parts_month = sales_data['parts']['month']
             labor_month = sales_data['labor']['month']
@@ -1097,12 +1814,12 @@ def get_summary():
     
     # Calculate Parts metrics
     try:
-        if no_bins_file:
-            no_bins_data = parse_no_bins(no_bins_file)
+        if 'parse_no_bins' in parsed:
+            no_bins_data = parsed['parse_no_bins']
             summary['parts']['no_bins'] = len(no_bins_data)
         
-        if po_over_30_file:
-            po_data = parse_po_over_30(po_over_30_file)
+        if 'parse_po_over_30' in parsed:
+            po_data = parsed['parse_po_over_30']
             summary['parts']['po_over_30'] = len(po_data)
         
         # OSS items - would need a separate parser if available
@@ -1112,8 +1829,8 @@ def get_summary():
     
     # Calculate EOS metrics
     try:
-        if strategic_plan_file:
-            eos_data = parse_strategic_plan(strategic_plan_file)
+        if 'parse_strategic_plan' in parsed:
+            eos_data = parsed['parse_strategic_plan']
             rocks = eos_data.get('rocks', [])
             goals = eos_data.get('goals', [])
             issues = eos_data.get('issues', [])
@@ -1143,20 +1860,84 @@ def get_summary():
     except Exception as e:
         print(f"Error calculating EOS metrics: {e}")
     
+    # Parsers that timed out or failed; their cards show the last good parse, or zeros
+    summary['incomplete'] = sorted(failed)
+    
     return jsonify(summary)
 
 @app.route('/api/data')
-def get_data():
-    """API endpoint to fetch all dashboard data"""
-    
-    # Get latest files
-    schedule_file = get_latest_file('Scheduled Shop Jobs')
-    backorders_file = get_latest_file('Open Back Orders')
-    grossprofit_file = get_latest_file('Sales and Gross')
-    quarterly_sales_file = get_latest_file('Site Lead')
-    no_bins_file = get_latest_file(['No Bins', 'No Bin'])
-    po_over_30_file = get_latest_file('PO Over 30')
-    strategic_plan_file = get_latest_file('Strategic Plan')
+@app.route('/api/<location>/data')
+@profiled
+def get_data(location=None):
+    """
+    API endpoint to fetch all dashboard data.
+    ?since=<generation> (the generation of the data the client has) returns
+    {'generation', 'since', 'patch'} instead: the operations that bring the
+    client's data up to date (see dashboard_delta.py), an empty patch when
+    nothing changed. The full payload is returned when this worker no longer
+    has that generation or the patch wouldn't be smaller.
+    """
+    location = resolve_location(location)
+    jobs = dashboard_jobs(location)
+    generation = snapshot_generation(location, jobs)
+    since = request.args.get('since')
+    if since and since == generation:
+        return jsonify({'generation': generation, 'since': since, 'patch': []})
+
+    data = to_json(build_dashboard_data(location, jobs))
+    timestamp = data.pop('timestamp')
+    # A snapshot missing a report gets no generation, so the client's next poll asks for everything again
+    complete = not data['incomplete']
+    if complete:
+        remember_generation(location, generation, data)
+    previous = _data_generations.get(location, {}).get(since) if since else None
+    if complete and previous is not None:
+        patch = dashboard_delta.diff(previous, data)
+        if dashboard_delta.smaller_than(patch, data):
+            return jsonify({'generation': generation, 'since': since, 'patch': patch})
+    return jsonify(dict(data, timestamp=timestamp, generation=generation if complete else None))
+
+# Location -> {generation: dashboard data} for the last dashboard_delta.HISTORY complete generations, oldest first
+_data_generations = {}
+
+def remember_generation(location, generation, data):
+    history = _data_generations.setdefault(location, {})
+    history.pop(generation, None)
+    history[generation] = data
+    while len(history) > dashboard_delta.HISTORY:
+        del history[next(iter(history))]
+
+def dashboard_jobs(location):
+    """Parse jobs for the latest report files at a location (recorded in the pipeline ledger as served)"""
+    catalog = get_report_catalog(location)
+    for report_file in catalog.values():
+        note_report_served(report_file, location)
+    return report_jobs(catalog)
+
+# Location -> (generation, epoch) of the last dashboard snapshot this worker built
+_snapshot_generations = {}
+
+def snapshot_generation(location, jobs):
+    """
+    Short id of the report files (path, mtime, size), parser code and date a
+    dashboard snapshot is built from; it changes whenever one of them does.
+    Taken before parsing, so a file replaced mid-parse starts a new generation.
+    """
+    keys = [datetime.now().date()]
+    for parser, filepath in jobs:
+        try:
+            key = parse_cache_key(parser, filepath)[0]
+        except OSError:
+            key = None
+        # The parser's code version too, so data a client got before a deploy isn't reused after it
+        keys.append((parser.__name__, parse_store.code_version(parser), key))
+    generation = parts_query.snapshot_id(keys)
+    _snapshot_generations[location] = (generation, time.time())
+    return generation
+
+def build_dashboard_data(location, jobs):
+    """Everything the dashboard shows, from the parse of each report (defaults for reports that are missing or failed)"""
+    parsed, failed = parse_reports(jobs, location)
     
     data = {
         'timestamp': datetime.now().isoformat(),
@@ -1180,39 +1961,168 @@ def get_data():
         }
     }
     
-    # Parse Shop Schedule
-    if schedule_file:
-        try:
-            data['schedule'] = parse_shop_schedule(schedule_file)
-        except Exception as e:
-            data['schedule']['error'] = f"Could not read Shop Schedule file. Please resave it. Error: {str(e)}"
+    # Shop Schedule
+    if 'parse_shop_schedule' in parsed:
+        data['schedule'] = parsed['parse_shop_schedule']
+    elif 'parse_shop_schedule' in failed:
+        data['schedule']['error'] = f"Could not read Shop Schedule file. Please resave it. Error: {failed['parse_shop_schedule']}"
+    
+    # Open Back Orders
+    data['parts_received'] = parsed.get('parse_open_back_orders', data['parts_received'])
+    data['backorders_over_5'] = parsed.get('parse_backorders_over_5', data['backorders_over_5'])
     
-    # Parse Open Back Orders
-    if backorders_file:
-        data['parts_received'] = parse_open_back_orders(backorders_file)
-        data['backorders_over_5'] = parse_backorders_over_5(backorders_file)
+    # Gross Profit Mechanic
+    data['mechanic_metrics'] = parsed.get('parse_gross_profit_mechanic', data['mechanic_metrics'])
     
-    # Parse Gross Profit Mechanic
-    if grossprofit_file:
-        data['mechanic_metrics'] = parse_gross_profit_mechanic(grossprofit_file)
+    # Quarterly Sales
+    data['quarterly_sales'] = parsed.get('parse_quarterly_sales', data['quarterly_sales'])
     
-    # Parse Quarterly Sales
-    if quarterly_sales_file:
-        data['quarterly_sales'] = parse_quarterly_sales(quarterly_sales_file)
+    # No Bins
+    data['no_bins'] = parsed.get('parse_no_bins', data['no_bins'])
     
-    # Parse No Bins
-    if no_bins_file:
-        data['no_bins'] = parse_no_bins(no_bins_file)
+    # PO Over 30
+    data['po_over_30'] = parsed.get('parse_po_over_30', data['po_over_30'])
     
-    # Parse PO Over 30
-    if po_over_30_file:
-        data['po_over_30'] = parse_po_over_30(po_over_30_file)
+    # Strategic Plan
+    data['strategic_plan'] = parsed.get('parse_strategic_plan', data['strategic_plan'])
     
-    # Parse Strategic Plan
-    if strategic_plan_file:
-        data['strategic_plan'] = parse_strategic_plan(strategic_plan_file)
+    # Parsers that timed out or failed; their sections show the last good parse, or the defaults above
+    data['incomplete'] = sorted(failed)
     
-    return jsonify(data)
+    return data
+
+@app.route('/api/parts/<list_name>')
+@app.route('/api/<location>/parts/<list_name>')
+def query_parts_list(list_name, location=None):
+    """
+    Filtered, sorted, paginated PO Over 30 / Backorders Over 5 / No Bins list
+    Query parameters: any filter field from parts_query.LIST_FIELDS (e.g. vendor,
+    priority, customer, line_code), age_min/age_max, sort (field or -field),
+    limit, and the cursor returned as next_cursor by the previous page.
+    """
+    location = resolve_location(location)
+    if list_name not in PARTS_LISTS:
+        abort(404)
+    report, parser = PARTS_LISTS[list_name]
+    spec = parts_query.LIST_FIELDS[parser.__name__]
+
+    try:
+        filters = {field: request.args[field] for field in spec['filters'] if request.args.get(field)}
+        age_min = request.args.get('age_min', type=int)
+        age_max = request.args.get('age_max', type=int)
+        sort = request.args.get('sort') or spec['default_sort']
+        limit = min(max(request.args.get('limit', parts_query.DEFAULT_LIMIT, type=int), 1), parts_query.MAX_LIMIT)
+        query = parts_query.query_id({'filters': filters, 'age_min': age_min, 'age_max': age_max, 'sort': sort})
+        position = 0
+        if request.args.get('cursor'):
+            snapshot, cursor_query, position = parts_query.decode_cursor(request.args['cursor'])
+            if cursor_query != query:
+                raise ValueError('Cursor belongs to a different query')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    result = {'list': list_name, 'location': location, 'total': 0, 'items': [], 'next_cursor': None}
+    filepath = get_report_catalog(location)[report]
+    if not filepath:
+        return jsonify(result)
+
+    keys = {}
+    parsed, failed = parse_reports([(parser, filepath)], location, keys)
+    if parser.__name__ in failed:
+        return jsonify({'error': f"{list_name} is not available: {failed[parser.__name__]}"}), 503
+    index = get_report_index(location, parser.__name__, 'list', keys, parsed)
+    if request.args.get('cursor') and snapshot != index.snapshot:
+        return jsonify({'error': 'The report has been updated since this cursor was issued; start from the first page'}), 409
+
+    try:
+        total, rows, next_position = index.query(filters, age_min, age_max, sort, limit, position)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    result['total'] = total
+    result['items'] = to_json(rows)
+    if next_position is not None:
+        result['next_cursor'] = parts_query.encode_cursor(index.snapshot, query, next_position)
+    if request.args.get('facets'):
+        result['facets'] = index.facets()
+    return jsonify(result)
+
+@app.route('/api/part-search')
+@app.route('/api/<location>/part-search')
+def search_part_number(location=None):
+    """
+    Every place a part number (or prefix) appears: Open Back Orders with customer,
+    No Bins with line code and availability, and the PO Over 30 lines of the POs on those
+    back orders with vendor and age
+    Query parameters: q (part number or prefix), limit (per report, default 25)
+    """
+    location = resolve_location(location)
+    prefix = part_search.normalize(request.args.get('q', ''))
+    if len(prefix) < part_search.MIN_QUERY_LENGTH:
+        return jsonify({'error': f"q must have at least {part_search.MIN_QUERY_LENGTH} letters or digits"}), 400
+    limit = min(max(request.args.get('limit', part_search.DEFAULT_LIMIT, type=int), 1), 500)
+
+    catalog = get_report_catalog(location)
+    jobs = [(parser, catalog[report]) for report, parser in PART_SEARCH_REPORTS if catalog[report]]
+    keys = {}
+    parsed, failed = parse_reports(jobs, location, keys)
+
+    results = {}
+    total = 0
+    back_orders = []
+    for name, (section, _, _) in part_search.SOURCES.items():
+        if name not in parsed:
+            results[section] = {'total': 0, 'items': []}
+            continue
+        index = get_report_index(location, name, 'search', keys, parsed)
+        count, items = index.search(prefix, limit)
+        results[section] = {'total': count, 'items': items}
+        total += count
+        if name == 'parse_open_back_orders':
+            back_orders = [index.rows[row_id] for row_id in index.matches(prefix)]
+
+    # PO Over 30 has no part numbers; a part's POs are the ones on its back orders
+    count, items = 0, []
+    if 'parse_po_over_30' in parsed:
+        pos = get_report_index(location, 'parse_po_over_30', 'status', keys, parsed)
+        count, items = part_search.linked_pos(back_orders, pos, limit)
+    results[part_search.PO_SECTION] = {'total': count, 'items': items}
+    total += count
+
+    return jsonify({
+        'query': request.args.get('q', ''),
+        'location': location,
+        'total': total,
+        'results': results,
+        'incomplete': sorted(failed)
+    })
+
+@app.route('/api/part-status')
+@app.route('/api/<location>/part-status')
+def get_part_status(location=None):
+    """
+    Back-ordered parts joined with their PO (PO Over 30) and No Bins, with action flags
+    Query parameters: flag (only parts with this flag, see part_status.FLAGS)
+    """
+    location = resolve_location(location)
+    flag = request.args.get('flag')
+    if flag and flag not in part_status.FLAGS:
+        return jsonify({'error': f"Unknown flag '{flag}' (choose from {', '.join(part_status.FLAGS)})"}), 400
+
+    catalog = get_report_catalog(location)
+    jobs = [(parser, catalog[report]) for report, parser in PART_SEARCH_REPORTS if catalog[report]]
+    keys = {}
+    parsed, failed = parse_reports(jobs, location, keys)
+    parts = get_part_status_view(location, parsed, keys)
+
+    return jsonify({
+        'timestamp': datetime.now().isoformat(),
+        'location': location,
+        'flags': part_status.FLAGS,
+        'summary': part_status.summarize(parts),
+        'parts': [p for p in parts if flag in p['flags']] if flag else parts,
+        'incomplete': sorted(failed)
+    })
 
 @app.route('/api/weather')
 def get_weather():
@@ -1220,7 +2130,7 @@ def get_weather():
     try:
         import requests
         # Using wttr.in for simple weather data (no API key needed)
-        response = requests.get('https://wttr.in/Plainwell,MI?format=j1', timeout=5)
+        response = requests.get(WEATHER_URL, timeout=5)
         if response.status_code == 200:
             weather_data = response.json()
             current = weather_data['current_condition'][0]
@@ -1234,6 +2144,69 @@ def get_weather():
     
     return jsonify({'temp': '--', 'condition': 'Unknown', 'icon': '113'})
 
+@app.route('/api/pipeline')
+def get_pipeline_latency():
+    """Per-stage latency histograms for reports moving from Google Drive to the dashboard"""
+    generations = pipeline_ledger.load_generations()
+    recent = [
+        {
+            'report': gen['report'],
+            'location': gen['location'],
+            'stages': gen['stages'],
+            'latencies': pipeline_ledger.stage_latencies(gen)
+        }
+        for gen in generations[-20:]
+    ]
+    return jsonify({
+        'timestamp': datetime.now().isoformat(),
+        'stages': pipeline_ledger.STAGES,
+        'histograms': pipeline_ledger.latency_histograms(generations),
+        'recent': recent
+    })
+
+@app.route('/api/locations')
+def get_locations():
+    """Stores this instance serves and the reports currently available at each"""
+    global LOCATIONS
+    LOCATIONS = locations.get_locations()
+    return jsonify({
+        'default': locations.DEFAULT_LOCATION,
+        'locations': [
+            {
+                'location': location,
+                'name': locations.display_name(location),
+                'reports': {name: os.path.basename(f) if f else None
+                            for name, f in get_report_catalog(location).items()}
+            }
+            for location in LOCATIONS
+        ]
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics for parsers, routes, the parse cache and worker memory"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), headers={'Content-Type': CONTENT_TYPE_LATEST})
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_start', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.labels(route=route, status=response.status_code).observe(
+            time.perf_counter() - started
+        )
+    WORKER_RSS.set(current_rss_bytes())
+    return response
+
 @app.route('/health')
 def health_check():
     """Health check endpoint for monitoring"""
@@ -1243,7 +2216,8 @@ def health_check():
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
-            'datasheets_accessible': files_exist
+            'datasheets_accessible': files_exist,
+            'locations': {location: os.path.exists(path) for location, path in LOCATIONS.items()}
         }), 200
     except Exception as e:
         return jsonify({
@@ -1251,6 +2225,77 @@ def health_check():
             'error': str(e)
         }), 503
 
+@app.route('/health/live')
+def liveness():
+    """Liveness: this worker can answer a request (no disk access)"""
+    return jsonify({'status': 'alive', 'pid': os.getpid(), 'uptime_seconds': round(time.time() - STARTED)}), 200
+
+def report_ages(location, now):
+    """Age of each report in a location's last catalog, from the file versions already in memory"""
+    cached = _report_catalogs.get(location)
+    if cached is None:
+        return {}
+    reports = {}
+    for name, path in cached[1].items():
+        if not path or path not in _file_types:
+            continue
+        age_hours = (now - _file_types[path][0][0] / 1e9) / 3600
+        reports[name] = {
+            'file': os.path.basename(path),
+            'age_hours': round(age_hours, 1),
+            'stale': report_registry.REPORTS[name].synced and age_hours > STALE_REPORT_HOURS,
+        }
+    return reports
+
+@app.route('/health/ready')
+def readiness():
+    """
+    Readiness from this worker's in-memory pipeline state, without scanning any
+    files: per location the last snapshot generation, each report's age and each
+    parser's last parse, plus the parses running now. status is
+    - 'stuck' (503): a parse has run STUCK_PARSE_FACTOR times past its timeout
+    - 'busy': parses are running (e.g. a large upload is being ingested)
+    - 'stale': a synced report is older than SHOPMGR_STALE_HOURS
+    - 'ready': none of the above
+    """
+    now = time.time()
+    parsing = []
+    stuck = False
+    with _inflight_lock:
+        inflight = list(_inflight_parses.items())
+    for (location, name), (_, future, started) in inflight:
+        if future.done():
+            continue
+        seconds = now - started
+        stuck = stuck or seconds > PARSE_TIMEOUTS.get(name, PARSE_TIMEOUT) * STUCK_PARSE_FACTOR
+        parsing.append({'location': location, 'parser': name, 'seconds': round(seconds, 1)})
+
+    stale = False
+    states = {}
+    for location in LOCATIONS:
+        generation, built = _snapshot_generations.get(location, (None, None))
+        reports = report_ages(location, now)
+        stale = stale or any(report['stale'] for report in reports.values())
+        states[location] = {
+            'generation': generation,
+            'generation_age_seconds': None if built is None else round(now - built),
+            'reports': reports,
+            'parsers': {
+                name: dict(status, finished=datetime.fromtimestamp(status['finished']).isoformat(timespec='seconds'),
+                           finished_seconds_ago=round(now - status['finished']))
+                for (parsed_location, name), status in _parse_status.items() if parsed_location == location
+            },
+        }
+
+    status = 'stuck' if stuck else 'busy' if parsing else 'stale' if stale else 'ready'
+    return jsonify({
+        'status': status,
+        'pid': os.getpid(),
+        'uptime_seconds': round(now - STARTED),
+        'parsing': parsing,
+        'locations': states,
+    }), 503 if stuck else 200
+
 if __name__ == '__main__':
     # Create archive directory if it doesn't exist
     os.makedirs(ARCHIVE_DIR, exist_ok=True)
@@ -0,0 +1,729 @@
+// Dashboard script shared by dashboard.html, shop.html and default1.html.
+// Built into a content-hashed bundle by static_assets.py; each page defines
+// SHOPMGR_PAGE = {apiPrefix, generation, serverRendered} before loading it.
+
+// Update date and time
+function updateDateTime() {
+    const now = new Date();
+
+    const dateOptions = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' };
+    document.getElementById('currentDate').textContent = now.toLocaleDateString('en-US', dateOptions);
+
+    const timeString = now.toLocaleTimeString('en-US', { hour: '2-digit', minute: '2-digit' });
+    document.getElementById('currentTime').textContent = timeString;
+    document.getElementById('footerTime').textContent = timeString;
+}
+
+// Data the page shows and its generation; refreshes ask only for what changed since then
+let dashboardData = null;
+let dashboardGeneration = SHOPMGR_PAGE.generation;
+
+// Top-level /api/data field -> functions that display it
+const SECTION_RENDERERS = {
+    schedule: [displaySchedule],
+    parts_received: [displayParts],
+    mechanic_metrics: [displayMetrics],
+    quarterly_sales: [displayQuarterlySales, displayGrossProfitYTD],
+    no_bins: [displayNoBins],
+    backorders_over_5: [displayBackordersOver5],
+    po_over_30: [displayPOOver30],
+    strategic_plan: [displayStrategicPlan]
+};
+
+function renderSections(data, sections) {
+    sections.forEach(section => (SECTION_RENDERERS[section] || []).forEach(render => render(data[section])));
+}
+
+// Apply a patch from /api/data?since= (JSON Patch add/remove/replace, see dashboard_delta.py)
+function applyPatch(doc, patch) {
+    patch.forEach(op => {
+        const keys = op.path.split('/').slice(1).map(key => key.replace(/~1/g, '/').replace(/~0/g, '~'));
+        const last = keys.pop();
+        const parent = keys.reduce((node, key) => node[key], doc);
+        if (Array.isArray(parent)) {
+            const index = Number(last);
+            if (op.op === 'add') parent.splice(index, 0, op.value);
+            else if (op.op === 'remove') parent.splice(index, 1);
+            else parent[index] = op.value;
+        } else if (op.op === 'remove') {
+            delete parent[last];
+        } else {
+            parent[last] = op.value;
+        }
+    });
+}
+
+// Fetch and display dashboard data
+async function loadDashboardData() {
+    try {
+        const since = dashboardGeneration ? `?since=${encodeURIComponent(dashboardGeneration)}` : '';
+        let response = await fetch(SHOPMGR_PAGE.apiPrefix + '/data' + since);
+        let data = await response.json();
+        if (data.patch && data.patch.length && !dashboardData) {
+            // Server-rendered page: nothing to patch yet, so take the whole payload
+            response = await fetch(SHOPMGR_PAGE.apiPrefix + '/data');
+            data = await response.json();
+        }
+
+        // Hide loading, show content
+        document.getElementById('loadingState').style.display = 'none';
+        document.getElementById('dashboardContent').style.display = 'block';
+
+        if (data.patch) {
+            // Only the sections the patch touches are rebuilt
+            applyPatch(dashboardData || {}, data.patch);
+            renderSections(dashboardData || {}, [...new Set(data.patch.map(op => op.path.split('/')[1]))]);
+        } else {
+            dashboardData = data;
+            renderSections(data, Object.keys(SECTION_RENDERERS));
+        }
+        dashboardGeneration = data.generation;
+
+    } catch (error) {
+        console.error('Error loading dashboard data:', error);
+        document.getElementById('loadingState').innerHTML = 
+            '<div class="error-message">Failed to load dashboard data. Please refresh the page.</div>';
+    }
+}
+
+function displaySchedule(schedule) {
+    const todayContainer = document.getElementById('todaySchedule');
+    const tomorrowContainer = document.getElementById('tomorrowSchedule');
+    const fitInContainer = document.getElementById('fitInSchedule');
+    const errorContainer = document.getElementById('scheduleError');
+
+    if (schedule.error) {
+        errorContainer.textContent = schedule.error;
+        errorContainer.style.display = 'block';
+    }
+
+    // Today's Schedule
+    if (schedule.today && schedule.today.length > 0) {
+        todayContainer.innerHTML = schedule.today.map(item => `
+            <div class="schedule-item">
+                <div class="customer">${item.customer || 'N/A'}</div>
+                <div class="details">${item.job || 'N/A'} - ${item.mechanic || 'N/A'}</div>
+            </div>
+        `).join('');
+    } else {
+        todayContainer.innerHTML = '<div class="empty-state">No scheduled jobs today</div>';
+    }
+
+    // Fit-Ins
+    if (schedule.fit_ins && schedule.fit_ins.length > 0) {
+        fitInContainer.innerHTML = schedule.fit_ins.map(item => `
+            <div class="schedule-item fit-in-item">
+                <div class="customer">${item.customer || 'Fit-In'}</div>
+                <div class="details">${item.job || item.notes || 'N/A'}</div>
+            </div>
+        `).join('');
+    } else {
+        fitInContainer.innerHTML = '<div class="empty-state">No fit-ins</div>';
+    }
+
+    // Tomorrow's Schedule
+    if (schedule.tomorrow && schedule.tomorrow.length > 0) {
+        tomorrowContainer.innerHTML = schedule.tomorrow.map(item => `
+            <div class="schedule-item">
+                <div class="customer">${item.customer || 'N/A'}</div>
+                <div class="details">${item.job || 'N/A'} - ${item.mechanic || 'N/A'}</div>
+            </div>
+        `).join('');
+    } else {
+        tomorrowContainer.innerHTML = '<div class="empty-state">No scheduled jobs tomorrow</div>';
+    }
+}
+
+function displayQuarterlySales(qs) {
+    const container = document.getElementById('quarterlySales');
+    if (!qs) {
+        container.innerHTML = '<div class="empty-state">No quarterly sales data available.</div>';
+        return;
+    }
+
+    const formatMoney = (value) => {
+        const num = Number(value || 0);
+        return num.toLocaleString('en-US', { style: 'currency', currency: 'USD', maximumFractionDigits: 2 });
+    };
+
+    const makeCard = (title, data, target) => {
+        const ytd = Number(data?.ytd || 0);
+        const month = Number(data?.month || 0);
+        const py_month = Number(data?.py_month || 0);
+        const py_ytd = Number(data?.py_ytd || 0);
+        const pct = target > 0 ? Math.min(100, (ytd / target) * 100) : 0;
+
+        // Calculate comparisons
+        const vs_py_month = month - py_month;
+        const vs_py_ytd = ytd - py_ytd;
+        const vs_py_month_pct = py_month > 0 ? ((month - py_month) / py_month * 100) : 0;
+        const vs_py_ytd_pct = py_ytd > 0 ? ((ytd - py_ytd) / py_ytd * 100) : 0;
+
+        return `
+            <div class="quarterly-card">
+                <h4>${title}</h4>
+                <div class="quarterly-values">
+                    <div class="quarterly-value">
+                        <div class="quarterly-label">MTD 2026</div>
+                        <div class="quarterly-amount">${formatMoney(month)}</div>
+                    </div>
+                    <div class="quarterly-value">
+                        <div class="quarterly-label">YTD 2026</div>
+                        <div class="quarterly-amount">${formatMoney(ytd)}</div>
+                    </div>
+                    <div class="quarterly-value">
+                        <div class="quarterly-label">MTD 2025</div>
+                        <div class="quarterly-amount" style="color: #94a3b8;">${formatMoney(py_month)}</div>
+                    </div>
+                    <div class="quarterly-value">
+                        <div class="quarterly-label">YTD 2025</div>
+                        <div class="quarterly-amount" style="color: #94a3b8;">${formatMoney(py_ytd)}</div>
+                    </div>
+                </div>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 8px; margin: 10px 0; font-size: 12px;">
+                    <div style="background: #111827; padding: 8px; border-radius: 4px; border: 1px solid #1e293b;">
+                        <div style="color: #94a3b8; margin-bottom: 2px;">vs PY MTD</div>
+                        <div style="color: ${vs_py_month >= 0 ? '#22c55e' : '#ef4444'}; font-weight: 600;">
+                            ${vs_py_month >= 0 ? '▲' : '▼'} ${formatMoney(Math.abs(vs_py_month))} (${vs_py_month_pct.toFixed(1)}%)
+                        </div>
+                    </div>
+                    <div style="background: #111827; padding: 8px; border-radius: 4px; border: 1px solid #1e293b;">
+                        <div style="color: #94a3b8; margin-bottom: 2px;">vs PY YTD</div>
+                        <div style="color: ${vs_py_ytd >= 0 ? '#22c55e' : '#ef4444'}; font-weight: 600;">
+                            ${vs_py_ytd >= 0 ? '▲' : '▼'} ${formatMoney(Math.abs(vs_py_ytd))} (${vs_py_ytd_pct.toFixed(1)}%)
+                        </div>
+                    </div>
+                </div>
+                <div class="quarterly-target">Q1 Bonus Target: ${formatMoney(target)}</div>
+                <div class="progress-bar">
+                    <div class="progress-fill" style="width: ${pct.toFixed(1)}%"></div>
+                </div>
+                <div class="progress-text">${pct.toFixed(1)}% of target</div>
+            </div>
+        `;
+    };
+
+    const newTarget = qs.targets?.new_equipment || 1570000;
+    const partsTarget = qs.targets?.parts || 550000;
+    const laborTarget = qs.targets?.labor || 250000;
+
+    container.innerHTML = [
+        makeCard('New Equipment Sales', qs.new_equipment, newTarget),
+        makeCard('Parts Sales', qs.parts, partsTarget),
+        makeCard('Labor Sales', qs.labor, laborTarget)
+    ].join('');
+}
+
+function displayParts(parts) {
+    const container = document.getElementById('partsReceived');
+
+    if (parts && parts.length > 0) {
+        container.innerHTML = parts.map(part => `
+            <div class="part-card">
+                <div class="part-number">${part.part_number || 'N/A'}</div>
+                <div class="part-customer">${part.customer || 'N/A'}</div>
+                <div class="part-status">${part.status || 'Received'}</div>
+            </div>
+        `).join('');
+    } else {
+        container.innerHTML = '<div class="empty-state">No parts received</div>';
+    }
+}
+
+function displayMetrics(metrics) {
+    const container = document.getElementById('mechanicMetrics');
+    const overallContainer = document.getElementById('overallEfficiency');
+
+    if (metrics.mechanics && metrics.mechanics.length > 0) {
+        container.innerHTML = metrics.mechanics.map(mechanic => `
+            <div class="mechanic-card">
+                <div class="mechanic-info">
+                    <h4>${mechanic.name}</h4>
+                    <div class="mechanic-stats">
+                        <div class="stat">
+                            <div class="stat-label">Efficiency</div>
+                            <div class="stat-value">${typeof mechanic.efficiency === 'number' ? mechanic.efficiency.toFixed(1) : mechanic.efficiency}%</div>
+                        </div>
+                        <div class="stat">
+                            <div class="stat-label">Labor Sales</div>
+                            <div class="stat-value">$${typeof mechanic.labor_sales === 'number' ? mechanic.labor_sales.toLocaleString() : mechanic.labor_sales}</div>
+                        </div>
+                    </div>
+                </div>
+                <div class="efficiency-badge">${typeof mechanic.efficiency === 'number' ? mechanic.efficiency.toFixed(0) : mechanic.efficiency}%</div>
+            </div>
+        `).join('');
+    } else {
+        container.innerHTML = '<div class="empty-state">No mechanic metrics available</div>';
+    }
+
+    // Overall Efficiency
+    if (typeof metrics.overall_efficiency === 'number') {
+        overallContainer.textContent = metrics.overall_efficiency.toFixed(1) + '%';
+    } else {
+        overallContainer.textContent = '--';
+    }
+}
+
+// Fetch weather data
+async function loadWeather() {
+    try {
+        const response = await fetch('/api/weather');
+        const weather = await response.json();
+
+        document.getElementById('weatherTemp').textContent = weather.temp + '°F';
+        document.getElementById('weatherCondition').textContent = weather.condition;
+    } catch (error) {
+        console.error('Error loading weather:', error);
+    }
+}
+
+// Toggle expandable sections
+function toggleSection(contentId) {
+    const content = document.getElementById(contentId);
+    const toggle = document.getElementById(contentId.replace('Content', 'Toggle'));
+
+    if (content.style.display === 'none') {
+        content.style.display = 'block';
+        toggle.classList.add('expanded');
+    } else {
+        content.style.display = 'none';
+        toggle.classList.remove('expanded');
+    }
+}
+
+// Display No Bins
+function displayNoBins(noBins) {
+    const titleElement = document.getElementById('noBinsTitle');
+    const tableElement = document.getElementById('noBinsTable');
+
+    const count = noBins ? noBins.length : 0;
+    titleElement.textContent = `📦 No Bins (${count} item${count !== 1 ? 's' : ''})`;
+
+    if (!noBins || noBins.length === 0) {
+        tableElement.innerHTML = '<div class="empty-state" style="color: #94a3b8;">All parts are binned! ✓</div>';
+        return;
+    }
+
+    const tableHTML = `
+        <table class="parts-table">
+            <thead>
+                <tr>
+                    <th>Line Code</th>
+                    <th>Part Number</th>
+                    <th>Description</th>
+                    <th style="text-align: center;">Qty</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${noBins.map(item => `
+                    <tr>
+                        <td>${item.line_code || ''}</td>
+                        <td><strong>${item.part_number}</strong></td>
+                        <td>${item.description || ''}</td>
+                        <td style="text-align: center;">${item.available || '0'}</td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+
+    tableElement.innerHTML = tableHTML;
+}
+
+// Display Back Orders Over 5 Days
+function displayBackordersOver5(backorders) {
+    const titleElement = document.getElementById('backordersTitle');
+    const tableElement = document.getElementById('backordersTable');
+
+    const count = backorders ? backorders.length : 0;
+    titleElement.textContent = `⚠️ Back Orders 5+ Days (${count} item${count !== 1 ? 's' : ''})`;
+
+    if (!backorders || backorders.length === 0) {
+        tableElement.innerHTML = '<div class="empty-state" style="color: #94a3b8;">No back orders over 5 days! ✓</div>';
+        return;
+    }
+
+    const getPriorityBadge = (priority) => {
+        const labels = {
+            'critical': '🔴 30+ Days',
+            'high': '🟠 15+ Days',
+            'medium': '🟡 10+ Days',
+            'normal': '🟢 5-9 Days'
+        };
+        return `<span class="priority-badge priority-${priority}">${labels[priority] || priority}</span>`;
+    };
+
+    const tableHTML = `
+        <table class="parts-table">
+            <thead>
+                <tr>
+                    <th style="width: 50px;">Age</th>
+                    <th>Part Number</th>
+                    <th>Customer</th>
+                    <th>Phone</th>
+                    <th>Status</th>
+                    <th>Priority</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${backorders.map(item => `
+                    <tr>
+                        <td style="font-weight: 700; font-size: 16px;">${item.age}</td>
+                        <td><strong>${item.part_number}</strong></td>
+                        <td>${item.customer}</td>
+                        <td><a href="tel:${item.phone}" class="phone-link">${item.phone}</a></td>
+                        <td>${item.status}</td>
+                        <td>${getPriorityBadge(item.priority)}</td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+
+    tableElement.innerHTML = tableHTML;
+}
+
+// Display PO Over 30 Days
+function displayPOOver30(poData) {
+    const titleElement = document.getElementById('poOver30Title');
+    const tableElement = document.getElementById('poOver30Table');
+
+    const count = poData ? poData.length : 0;
+    titleElement.textContent = `📋 PO Over 30 Days (${count} item${count !== 1 ? 's' : ''})`;
+
+    if (!poData || poData.length === 0) {
+        tableElement.innerHTML = '<div class="empty-state" style="color: #94a3b8;">No POs over 30 days! ✓</div>';
+        return;
+    }
+
+    const getPriorityBadge = (priority) => {
+        const labels = {
+            'critical': '🔴 90+ Days',
+            'high': '🟠 60+ Days',
+            'medium': '🟡 30+ Days'
+        };
+        return `<span class="priority-badge priority-${priority}">${labels[priority] || priority}</span>`;
+    };
+
+    const tableHTML = `
+        <table class="parts-table">
+            <thead>
+                <tr>
+                    <th style="width: 50px;">Age</th>
+                    <th>Vendor</th>
+                    <th>PO Number</th>
+                    <th>Status</th>
+                    <th>Since</th>
+                    <th>Items</th>
+                    <th style="text-align: right;">Total</th>
+                    <th>Priority</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${poData.map(item => `
+                    <tr>
+                        <td style="font-weight: 700; font-size: 16px;">${item.age}</td>
+                        <td><strong>${item.vendor}</strong></td>
+                        <td>${item.po_number}</td>
+                        <td>${item.status}</td>
+                        <td>${item.since}</td>
+                        <td style="text-align: center;">${item.items}</td>
+                        <td style="text-align: right;">${item.total}</td>
+                        <td>${getPriorityBadge(item.priority)}</td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+
+    tableElement.innerHTML = tableHTML;
+}
+
+// Display Gross Profit YTD
+function displayGrossProfitYTD(qs) {
+    const chartElement = document.getElementById('grossProfitChart');
+
+    if (!qs) {
+        chartElement.innerHTML = '<div class="empty-state" style="color: #94a3b8;">No gross profit data available</div>';
+        return;
+    }
+
+    const newEquipYTD = Number(qs.new_equipment?.ytd || 0);
+    const partsYTD = Number(qs.parts?.ytd || 0);
+    const laborYTD = Number(qs.labor?.ytd || 0);
+    const totalYTD = newEquipYTD + partsYTD + laborYTD;
+    const targetAnnual = 6600000; // $6.6M annual goal
+
+    const percentComplete = (totalYTD / targetAnnual) * 100;
+    const currentMonth = new Date().getMonth() + 1; // 1-12
+    const expectedPercent = (currentMonth / 12) * 100;
+    const onTrack = percentComplete >= (expectedPercent - 5); // Within 5% tolerance
+
+    const formatMoney = (value) => {
+        return value.toLocaleString('en-US', { style: 'currency', currency: 'USD', maximumFractionDigits: 0 });
+    };
+
+    const chartHTML = `
+        <div style="padding: 10px;">
+            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-bottom: 20px;">
+                <div>
+                    <div style="font-size: 12px; color: #94a3b8; margin-bottom: 5px;">TOTAL YTD GROSS PROFIT</div>
+                    <div style="font-size: 28px; font-weight: 700; color: #cbd5f5;">${formatMoney(totalYTD)}</div>
+                    <div style="font-size: 12px; color: #94a3b8; margin-top: 5px;">
+                        ${percentComplete.toFixed(1)}% of ${formatMoney(targetAnnual)} annual goal
+                    </div>
+                </div>
+                <div>
+                    <div style="font-size: 12px; color: #94a3b8; margin-bottom: 5px;">STATUS</div>
+                    <div style="font-size: 20px; font-weight: 600; color: ${onTrack ? '#22c55e' : '#f97316'}; margin-top: 10px;">
+                        ${onTrack ? '✓ On Track' : '⚠ Behind Pace'}
+                    </div>
+                    <div style="font-size: 12px; color: #94a3b8; margin-top: 5px;">
+                        Expected: ${expectedPercent.toFixed(1)}% by month ${currentMonth}
+                    </div>
+                </div>
+            </div>
+
+            <div style="background: #111827; border-radius: 8px; padding: 15px; margin-bottom: 15px;">
+                <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
+                    <span style="font-size: 12px; color: #94a3b8;">Progress to Goal</span>
+                    <span style="font-size: 12px; font-weight: 600; color: #cbd5f5;">${formatMoney(totalYTD)} / ${formatMoney(targetAnnual)}</span>
+                </div>
+                <div style="background: #1e293b; height: 24px; border-radius: 12px; overflow: hidden;">
+                    <div style="background: linear-gradient(90deg, #22c55e, #16a34a); height: 100%; width: ${Math.min(percentComplete, 100)}%; transition: width 1s;"></div>
+                </div>
+            </div>
+
+            <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 10px;">
+                <div style="background: #111827; padding: 12px; border-radius: 8px; border: 1px solid #1e293b;">
+                    <div style="font-size: 11px; color: #94a3b8; margin-bottom: 4px;">NEW EQUIPMENT</div>
+                    <div style="font-size: 18px; font-weight: 600; color: #cbd5f5;">${formatMoney(newEquipYTD)}</div>
+                </div>
+                <div style="background: #111827; padding: 12px; border-radius: 8px; border: 1px solid #1e293b;">
+                    <div style="font-size: 11px; color: #94a3b8; margin-bottom: 4px;">PARTS</div>
+                    <div style="font-size: 18px; font-weight: 600; color: #cbd5f5;">${formatMoney(partsYTD)}</div>
+                </div>
+                <div style="background: #111827; padding: 12px; border-radius: 8px; border: 1px solid #1e293b;">
+                    <div style="font-size: 11px; color: #94a3b8; margin-bottom: 4px;">LABOR</div>
+                    <div style="font-size: 18px; font-weight: 600; color: #cbd5f5;">${formatMoney(laborYTD)}</div>
+                </div>
+            </div>
+        </div>
+    `;
+
+    chartElement.innerHTML = chartHTML;
+}
+
+function displayStrategicPlan(strategicPlan) {
+    const container = document.getElementById('eosStrategicPlan');
+    if (!container) {
+        // shop.html and default1.html lay the plan out in #strategicSection instead
+        displayStrategicSection(strategicPlan);
+        return;
+    }
+
+    if (!strategicPlan || (!strategicPlan.rocks.length && !strategicPlan.goals.length && !strategicPlan.issues.length)) {
+        container.innerHTML = '<div style="padding: 20px; text-align: center; opacity: 0.7;">No strategic plan data available</div>';
+        return;
+    }
+
+    let html = '';
+
+    // Quarter Info Header
+    if (strategicPlan.quarter_info) {
+        html += `
+            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; text-align: center;">
+                <h3 style="margin: 0; font-size: 1.3rem;">🎯 ${strategicPlan.quarter_info}</h3>
+            </div>
+        `;
+    }
+
+    // Display Quarterly Rocks
+    if (strategicPlan.rocks.length > 0) {
+        html += '<div style="margin-bottom: 30px;">';
+        html += '<h4 style="color: #1e293b; margin-bottom: 15px; font-size: 1.1rem;">📍 Quarterly Rocks</h4>';
+        strategicPlan.rocks.forEach(rock => {
+            const statusClass = rock.status ? rock.status.toLowerCase().replace(' ', '-') : 'pending';
+            const statusColor = rock.status && rock.status.toLowerCase() === 'complete' ? '#22c55e' : 
+                              rock.status && rock.status.toLowerCase() === 'on track' ? '#3b82f6' : '#f59e0b';
+            html += `
+                <div class="rock-item" style="background: #f8fafc; border-left: 4px solid ${statusColor}; padding: 15px; margin-bottom: 12px; border-radius: 6px;">
+                    <div style="font-weight: 600; color: #1e293b; margin-bottom: 8px;">${rock.description}</div>
+                    <div style="display: flex; gap: 12px; font-size: 0.9rem; color: #64748b;">
+                        <span>👤 ${rock.owner}</span>
+                        <span style="color: ${statusColor}; font-weight: 600;">● ${rock.status}</span>
+                    </div>
+                </div>
+            `;
+        });
+        html += '</div>';
+    }
+
+    // Display Annual Goals
+    if (strategicPlan.goals.length > 0) {
+        html += '<div style="margin-bottom: 30px;">';
+        html += '<h4 style="color: #1e293b; margin-bottom: 15px; font-size: 1.1rem;">🎯 Annual Goals</h4>';
+        strategicPlan.goals.forEach(goal => {
+            const current = parseFloat(goal.current) || 0;
+            const target = parseFloat(goal.target) || 100;
+            const percent = Math.min(100, Math.round((current / target) * 100));
+            const percentColor = percent >= 100 ? '#22c55e' : 
+                               percent >= 80 ? '#3b82f6' :
+                               percent >= 50 ? '#f59e0b' : '#ef4444';
+
+            html += `
+                <div class="goal-item" style="background: #f8fafc; padding: 15px; margin-bottom: 12px; border-radius: 6px;">
+                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
+                        <span style="font-weight: 600; color: #1e293b;">${goal.metric}</span>
+                        <span style="font-weight: 700; color: ${percentColor};">${percent}%</span>
+                    </div>
+                    <div style="display: flex; gap: 15px; font-size: 0.9rem; color: #64748b; margin-bottom: 8px;">
+                        <span>Current: ${goal.current}</span>
+                        <span>Target: ${goal.target}</span>
+                    </div>
+                    <div style="width: 100%; height: 8px; background: #e2e8f0; border-radius: 4px; overflow: hidden;">
+                        <div style="width: ${percent}%; height: 100%; background: ${percentColor}; transition: width 0.3s ease;"></div>
+                    </div>
+                </div>
+            `;
+        });
+        html += '</div>';
+    }
+
+    // Display Issues List
+    if (strategicPlan.issues.length > 0) {
+        html += '<div>';
+        html += '<h4 style="color: #1e293b; margin-bottom: 15px; font-size: 1.1rem;">⚠️ Issues List</h4>';
+        strategicPlan.issues.forEach(issue => {
+            const statusColor = issue.status && issue.status.toLowerCase() === 'resolved' ? '#22c55e' : '#ef4444';
+            html += `
+                <div class="issue-item" style="background: #fef2f2; border-left: 4px solid #ef4444; padding: 15px; margin-bottom: 12px; border-radius: 6px;">
+                    <div style="font-weight: 600; color: #1e293b; margin-bottom: 8px;">${issue.description}</div>
+                    <div style="display: flex; gap: 12px; font-size: 0.9rem; color: #64748b;">
+                        <span>👤 ${issue.owner}</span>
+                        <span style="color: ${statusColor}; font-weight: 600;">● ${issue.status}</span>
+                    </div>
+                </div>
+            `;
+        });
+        html += '</div>';
+    }
+
+    container.innerHTML = html;
+}
+
+// Rocks, goals and issues in the #strategicSection layout of shop.html and default1.html
+function displayStrategicSection(strategicPlan) {
+    const section = document.getElementById('strategicSection');
+    if (!section) {
+        return;
+    }
+    if (!strategicPlan || (!strategicPlan.rocks.length && !strategicPlan.goals.length && !strategicPlan.issues.length)) {
+        section.style.display = 'none';
+        return;
+    }
+
+    section.style.display = 'block';
+
+    // Display Quarterly Rocks
+    const rocksContainer = document.getElementById('rocksContainer');
+    const quarterInfo = document.getElementById('quarterInfo');
+
+    if (strategicPlan.quarter_info) {
+        quarterInfo.innerHTML = `🎯 ${strategicPlan.quarter_info}`;
+    }
+
+    if (strategicPlan.rocks.length > 0) {
+        let rocksHTML = '';
+        strategicPlan.rocks.forEach(rock => {
+            const statusClass = rock.status.replace(' ', '-').toLowerCase();
+            const statusIcon = rock.status === 'COMPLETE' ? '✓' :
+                             rock.status === 'IN PROGRESS' ? '🔄' : '⏳';
+            rocksHTML += `
+                <div class="rock-item ${statusClass}">
+                    <div class="rock-description">${rock.description}</div>
+                    <div class="rock-meta">
+                        <span class="rock-owner">👤 ${rock.owner}</span>
+                        <span class="rock-status">${statusIcon} ${rock.status}</span>
+                    </div>
+                </div>
+            `;
+        });
+        rocksContainer.innerHTML = rocksHTML;
+    } else {
+        rocksContainer.innerHTML = '<div style="padding: 20px; text-align: center; opacity: 0.7;">No rocks defined</div>';
+    }
+
+    // Display Annual Goals
+    const goalsContainer = document.getElementById('goalsContainer');
+
+    if (strategicPlan.goals.length > 0) {
+        let goalsHTML = '';
+        strategicPlan.goals.forEach(goal => {
+            const percentColor = goal.percent >= 100 ? '#22c55e' :
+                                goal.percent >= 80 ? '#3b82f6' :
+                                goal.percent >= 50 ? '#f59e0b' : '#ef4444';
+
+            const formatValue = (val) => {
+                if (val >= 1000000) return `$${(val/1000000).toFixed(1)}M`;
+                if (val >= 1000) return `${(val/1000).toFixed(0)}K`;
+                return val.toFixed(0);
+            };
+
+            const displayTarget = goal.name === 'Revenue' || goal.name.includes('$') ?
+                                formatValue(goal.target) : goal.target.toFixed(0);
+            const displayCurrent = goal.name === 'Revenue' || goal.name.includes('$') ?
+                                 formatValue(goal.current) : goal.current.toFixed(0);
+
+            goalsHTML += `
+                <div class="goal-item">
+                    <div class="goal-name">
+                        <span>${goal.name}</span>
+                        <span class="goal-percent" style="color: ${percentColor}">${goal.percent}%</span>
+                    </div>
+                    <div class="goal-values">
+                        <span>Current: ${displayCurrent}</span>
+                        <span>Target: ${displayTarget}</span>
+                    </div>
+                    <div class="goal-progress-bar">
+                        <div class="goal-progress-fill" style="width: ${Math.min(goal.percent, 100)}%; background: ${percentColor};"></div>
+                    </div>
+                </div>
+            `;
+        });
+        goalsContainer.innerHTML = goalsHTML;
+    } else {
+        goalsContainer.innerHTML = '<div style="padding: 20px; text-align: center; opacity: 0.7;">No goals defined</div>';
+    }
+
+    // Display Issues List
+    const issuesContainer = document.getElementById('issuesContainer');
+
+    if (strategicPlan.issues.length > 0) {
+        let issuesHTML = '';
+        strategicPlan.issues.forEach(issue => {
+            issuesHTML += `
+                <div class="issue-item">
+                    <div class="issue-description">${issue.description}</div>
+                    <span class="issue-priority ${issue.priority}">${issue.priority}</span>
+                </div>
+            `;
+        });
+        issuesContainer.innerHTML = issuesHTML;
+    } else {
+        issuesContainer.innerHTML = '<div style="padding: 20px; text-align: center; opacity: 0.7;">No issues listed</div>';
+    }
+}
+
+// Initialize
+updateDateTime();
+setInterval(updateDateTime, 1000);
+// A server-rendered page already shows the current snapshot; fetch only if it was missing a report
+if (!SHOPMGR_PAGE.serverRendered) {
+    loadDashboardData();
+}
+loadWeather();
+
+// Refresh data every 5 minutes
+setInterval(loadDashboardData, 5 * 60 * 1000);
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Excel Engine Benchmark for Steensma Shop Manager
+Times every pandas Excel engine (calamine, openpyxl, xlrd) on the Excel exports
+we actually receive, so the default order in excel_engines.py is backed by
+numbers. Engines that can't read a file (broken styles, wrong format) are
+listed as failures.
+
+Usage:
+    python bench/bench_excel_engines.py                    # datasheets/, archive/ and every store's folders
+    python bench/bench_excel_engines.py path/to/exports    # files, folders or glob patterns
+    python bench/bench_excel_engines.py --synthetic 20000  # also a generated month-end sized workbook
+
+Exports are archived by file_watcher.py, so archive/ is the best source of real
+files. Read times are wall time, median of --repeat runs.
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from statistics import median
+
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import excel_engines  # noqa: E402
+
+ALL_ENGINES = ('calamine', 'openpyxl', 'xlrd')
+EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+
+def default_paths():
+    paths = [os.path.join(REPO_DIR, 'datasheets'), os.path.join(REPO_DIR, 'archive')]
+    paths += glob.glob(os.path.join(REPO_DIR, 'locations', '*', 'datasheets'))
+    paths += glob.glob(os.path.join(REPO_DIR, 'locations', '*', 'archive'))
+    return paths
+
+
+def find_workbooks(paths):
+    """Excel files in the given files, folders (recursively) and glob patterns"""
+    found = []
+    for path in paths:
+        candidates = [path] if os.path.isfile(path) else glob.glob(path) if not os.path.isdir(path) else [
+            os.path.join(root, f) for root, _, files in os.walk(path) for f in files
+        ]
+        found += [f for f in candidates if f.lower().endswith(EXTENSIONS)]
+    return sorted(set(found))
+
+
+def write_synthetic(rows, directory):
+    """A wide month-end sized schedule workbook (openpyxl can only write .xlsx)"""
+    start = datetime(2026, 2, 1, 8, 0)
+    columns = {
+        'ScheduledStartTime': [start + timedelta(minutes=30 * (i % 400)) for i in range(rows)],
+        'Customer': [f"Customer {i % 900}" for i in range(rows)],
+        'Model': [f"Z{i % 60:03d}R" for i in range(rows)],
+        'description': [f"Service visit {i}" for i in range(rows)],
+        'Mechanic': [f"Mechanic {i % 12}" for i in range(rows)],
+        'Status': ['Open' if i % 3 else 'Closed' for i in range(rows)],
+    }
+    # Month-end workbooks carry many more columns than the parsers use
+    for extra in range(24):
+        columns[f"Extra {extra}"] = [i * 1.5 for i in range(rows)]
+    path = os.path.join(directory, f"Scheduled Shop Jobs - synthetic {rows}.xlsx")
+    pd.DataFrame(columns).to_excel(path, index=False, engine='openpyxl')
+    return path
+
+
+def time_engine(path, engine, repeat):
+    """(median seconds, rows) or (None, error) if the engine can't read the file"""
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        try:
+            df = pd.read_excel(path, engine=engine)
+        except ImportError:
+            return None, 'not installed'
+        except Exception as e:
+            return None, str(e).splitlines()[0][:40] if str(e) else type(e).__name__
+        timings.append(time.perf_counter() - started)
+        rows = len(df)
+    return median(timings), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pandas Excel engines on report exports')
+    parser.add_argument('paths', nargs='*', help='files, folders or glob patterns (default: all datasheets/archive folders)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed reads per engine and file (default: 3)')
+    parser.add_argument('--synthetic', type=int, default=0, metavar='ROWS',
+                        help='also benchmark a generated .xlsx with this many rows')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='shopmgr-excel-bench-') as workdir:
+        workbooks = find_workbooks(args.paths or default_paths())
+        if args.synthetic:
+            workbooks.append(write_synthetic(args.synthetic, workdir))
+        if not workbooks:
+            print("No Excel files found - pass a folder of exports (e.g. archive/) or use --synthetic ROWS")
+            return 1
+
+        print(f"{'file':<44} {'size':>8} " + ' '.join(f"{engine:>14}" for engine in ALL_ENGINES))
+        print('-' * 100)
+        totals = {}  # extension -> engine -> [seconds...], None when it failed on any file
+        for path in workbooks:
+            ext = os.path.splitext(path)[1].lower()
+            cells = []
+            for engine in ALL_ENGINES:
+                seconds, detail = time_engine(path, engine, args.repeat)
+                engine_totals = totals.setdefault(ext, {})
+                if seconds is None:
+                    engine_totals[engine] = None
+                    cells.append(f"{detail[:14]:>14}")
+                else:
+                    if engine_totals.get(engine, []) is not None:
+                        engine_totals.setdefault(engine, []).append(seconds)
+                    cells.append(f"{seconds * 1000:>12.1f}ms")
+            name = os.path.basename(path)
+            name = name if len(name) <= 44 else name[:41] + '...'
+            print(f"{name:<44} {os.path.getsize(path) / 1024:>6.0f}KB " + ' '.join(cells))
+
+    print('-' * 100)
+    for ext, engine_totals in sorted(totals.items()):
+        usable = {engine: sum(t) for engine, t in engine_totals.items() if t}
+        if not usable:
+            print(f"{ext}: no engine read every file")
+            continue
+        ranked = sorted(usable, key=usable.get)
+        current = [e for e in excel_engines.ENGINES.get(ext, ()) if e in usable]
+        print(f"{ext}: fastest engines that read every file: {', '.join(ranked)} "
+              f"(excel_engines.py tries {', '.join(excel_engines.ENGINES.get(ext, ()))})")
+        if current and current[0] != ranked[0]:
+            print(f"  ℹ {ranked[0]} was faster than {current[0]} here - consider reordering ENGINES['{ext}']")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
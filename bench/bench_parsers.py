@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Parser Benchmark Suite for Steensma Shop Manager
+Runs every app.py parser against the real datasheets/ exports and against
+10x/100x/1000x scaled copies, recording time and peak memory, and compares
+the results with a stored baseline.
+
+Usage:
+    python bench/bench_parsers.py                      # run and compare with baseline
+    python bench/bench_parsers.py --scales 1,10        # only some scale factors
+    python bench/bench_parsers.py --only parse_no_bins # only some parsers
+    python bench/bench_parsers.py --update-baseline    # store this run as the new baseline
+    python bench/bench_parsers.py --fixtures /tmp/synthetic --scales 1   # exports from generate_reports.py
+
+Exits with status 1 when any parser regresses past the thresholds.
+Timings are machine-specific: record the baseline on the machine you compare on.
+The baseline records which export each parser was timed on (path and sha256);
+runs use that same file, and a parser whose export is missing or has changed
+is reported as "input differs" instead of compared.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from statistics import median
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import app  # noqa: E402
+
+DATASHEETS_DIR = os.path.join(REPO_DIR, 'datasheets')
+SAVEDATA_DIR = os.path.join(DATASHEETS_DIR, 'savedata')
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Parser -> report filename pattern it reads (same patterns app.py uses)
+PARSERS = [
+    ('parse_shop_schedule', 'Scheduled Shop Jobs'),
+    ('parse_open_back_orders', 'Open Back Orders'),
+    ('parse_backorders_over_5', 'Open Back Orders'),
+    ('parse_po_over_30', 'PO Over 30'),
+    ('parse_no_bins', 'No Bins'),
+    ('parse_gross_profit_mechanic', 'Sales and Gross'),
+    ('parse_quarterly_sales', 'Site Lead'),
+    ('parse_strategic_plan', 'Strategic Plan'),
+]
+
+DEFAULT_SCALES = [1, 10, 100, 1000]
+
+# Ignore timing differences smaller than this; they are scheduler noise
+MIN_TIME_DELTA = 0.005
+
+
+def find_fixture(pattern, directories=(DATASHEETS_DIR, SAVEDATA_DIR)):
+    """Newest .txt export matching pattern, preferring datasheets/ over savedata/"""
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        matches = [
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if pattern.lower() in f.lower() and f.lower().endswith('.txt')
+        ]
+        if matches:
+            return max(matches, key=os.path.getmtime)
+    return None
+
+
+def baseline_fixture(baseline, name):
+    """(path relative to the repo, sha256) of the export a parser's baseline was timed on, or None"""
+    for key, entry in baseline.items():
+        if key.startswith(f"{name}@") and entry.get('fixture'):
+            return entry['fixture'], entry.get('fixture_sha256')
+    return None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scaled_fixture(source, scale, workdir):
+    """Write a copy of source with its content repeated scale times"""
+    if scale == 1:
+        return source
+    base, ext = os.path.splitext(os.path.basename(source))
+    path = os.path.join(workdir, f"{base} x{scale}{ext}")
+    if not os.path.exists(path):
+        with open(source, 'r') as f:
+            content = f.read()
+        if not content.endswith('\n'):
+            content += '\n'
+        with open(path, 'w') as f:
+            for _ in range(scale):
+                f.write(content)
+    return path
+
+
+def measure(parser, path, repeat):
+    """Median wall time over repeat runs, then one traced run for peak memory"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parser(path)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    parser(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return median(timings), peak
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE, 'r') as f:
+        return json.load(f).get('results', {})
+
+
+def save_baseline(results):
+    with open(BASELINE_FILE, 'w') as f:
+        json.dump({
+            'recorded': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'machine': f"{platform.node()} / Python {platform.python_version()}",
+            'results': results
+        }, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def format_bytes(n):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{n:.0f}{unit}" if unit == 'B' else f"{n:.1f}{unit}"
+        n /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the app.py report parsers')
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help='comma-separated scale factors (default: 1,10,100,1000)')
+    parser.add_argument('--only', default='', help='comma-separated parser names to run')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case below 100x (default: 5)')
+    parser.add_argument('--time-threshold', type=float, default=1.5,
+                        help='fail when time exceeds baseline by this factor (default: 1.5)')
+    parser.add_argument('--mem-threshold', type=float, default=1.25,
+                        help='fail when peak memory exceeds baseline by this factor (default: 1.25)')
+    parser.add_argument('--update-baseline', action='store_true', help='save this run as the baseline')
+    parser.add_argument('--fixtures', help='read exports from this directory instead of datasheets/ '
+                                           '(e.g. output of bench/generate_reports.py)')
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+    only = {name.strip() for name in args.only.split(',') if name.strip()}
+    # Baselines only make sense for the checked-in exports
+    baseline = {} if args.fixtures else load_baseline()
+    results = {}
+    regressions = []
+    mismatched = []
+
+    print(f"{'parser':<28} {'scale':>6} {'input':>9} {'time':>10} {'peak mem':>10} {'vs baseline':>22}")
+    print('-' * 90)
+
+    with tempfile.TemporaryDirectory(prefix='shopmgr-bench-') as workdir:
+        for name, pattern in PARSERS:
+            if only and name not in only:
+                continue
+            # The export the baseline was timed on, not whichever copy has the newest mtime
+            pinned = baseline_fixture(baseline, name)
+            if pinned and os.path.exists(os.path.join(REPO_DIR, pinned[0])):
+                fixture = os.path.join(REPO_DIR, pinned[0])
+            elif args.fixtures:
+                fixture = find_fixture(pattern, (args.fixtures,))
+            else:
+                fixture = find_fixture(pattern)
+            if fixture is None:
+                print(f"{name:<28} {'':>6} no '{pattern}' export found - skipped")
+                continue
+            fixture_name = os.path.relpath(fixture, REPO_DIR)
+            fixture_sha256 = file_sha256(fixture)
+            parse = getattr(app, name)
+
+            for scale in scales:
+                path = scaled_fixture(fixture, scale, workdir)
+                repeat = args.repeat if scale < 100 else 1
+                seconds, peak = measure(parse, path, repeat)
+                key = f"{name}@{scale}x"
+                results[key] = {'seconds': round(seconds, 6), 'peak_bytes': peak,
+                                'input_bytes': os.path.getsize(path),
+                                'fixture': fixture_name, 'fixture_sha256': fixture_sha256}
+
+                comparison = ''
+                base = baseline.get(key)
+                if base and (base.get('fixture_sha256') != fixture_sha256
+                             or base.get('input_bytes') != results[key]['input_bytes']):
+                    comparison = 'input differs'
+                    mismatched.append(key)
+                elif base:
+                    time_ratio = seconds / base['seconds'] if base['seconds'] else 1.0
+                    mem_ratio = peak / base['peak_bytes'] if base['peak_bytes'] else 1.0
+                    comparison = f"time x{time_ratio:.2f} mem x{mem_ratio:.2f}"
+                    slow = time_ratio > args.time_threshold and seconds - base['seconds'] > MIN_TIME_DELTA
+                    fat = mem_ratio > args.mem_threshold
+                    if slow or fat:
+                        comparison += ' REGRESSED'
+                        regressions.append(key)
+
+                print(f"{name:<28} {scale:>5}x {format_bytes(os.path.getsize(path)):>9} "
+                      f"{seconds * 1000:>8.2f}ms {format_bytes(peak):>10} {comparison:>22}")
+
+    print('-' * 90)
+    if args.fixtures:
+        print("ℹ Custom fixtures are not compared with (or saved to) the baseline")
+        return 0
+
+    if args.update_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        save_baseline(merged)
+        print(f"✓ Baseline updated: {BASELINE_FILE}")
+        return 0
+
+    if not baseline:
+        print("ℹ No baseline yet - run with --update-baseline to record one")
+        return 0
+
+    if mismatched:
+        print(f"ℹ {len(mismatched)} case(s) not compared: the baseline was timed on a different export "
+              f"(run with --update-baseline to re-record)")
+
+    if regressions:
+        print(f"✗ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+
+    print("✓ No regressions against baseline" + (" in the cases compared" if mismatched else ""))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
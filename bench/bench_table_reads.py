@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Column-Pruned Read Benchmark for Steensma Shop Manager
+Compares reading a whole CSV/Excel export (default type inference, every
+column - how the parsers used to read them) with app.read_report_table, which
+reads only the columns declared in report_registry.py with their dtypes.
+
+Usage:
+    python bench/bench_table_reads.py                         # generated month-end workbooks
+    python bench/bench_table_reads.py --rows 50000 --extra-columns 40
+    python bench/bench_table_reads.py "archive/2026-02-28/Open Back Orders - 2-28-26.xls"
+
+Real exports are classified by name with report_registry. Times are the median
+of --repeat reads; memory is the resulting DataFrame (deep) and the traced peak
+during one read (Python allocations only, so calamine's own buffers don't count).
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from statistics import median
+
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import app  # noqa: E402
+import report_registry  # noqa: E402
+
+
+def write_month_end(directory, rows, extra_columns):
+    """Wide schedule and back order exports, as .xlsx and .csv"""
+    start = datetime(2026, 2, 1, 8, 0)
+    schedule = pd.DataFrame({
+        'ScheduledStartTime': [start + timedelta(minutes=30 * (i % 1300)) for i in range(rows)],
+        'Customer': [f"Customer {i % 900}" for i in range(rows)],
+        'Model': [f"Z{i % 60:03d}R" for i in range(rows)],
+        'description': [f"Service visit {i}" for i in range(rows)],
+        'Mechanic': [('Fit-In' if i % 7 == 0 else f"Mechanic {i % 12}") for i in range(rows)],
+        'Status': ['Open' if i % 3 else 'Waiting on Parts' for i in range(rows)],
+        **{f"Extra {n}": [i * 1.5 for i in range(rows)] for n in range(extra_columns)},
+    })
+
+    width = max(18, extra_columns)
+    backorders = pd.DataFrame({f"Col {n}": [f"v{i % 500}-{n}" for i in range(rows)] for n in range(width)})
+    backorders = backorders.rename(columns={'Col 1': 'Customer', 'Col 17': 'Status', 'Col 11': 'PO'})
+    backorders['Col 9'] = [f"JOHP - RE{i}" for i in range(rows)]
+    backorders['Status'] = ['Back-Ordered' if i % 4 else 'Received' for i in range(rows)]
+    backorders['PO'] = [str(7000 + i % 400) for i in range(rows)]
+
+    paths = []
+    for name, report, df, startrow in (('Scheduled Shop Jobs', 'schedule', schedule, 0),
+                                       ('Open Back Orders', 'backorders', backorders, 4)):
+        xlsx = os.path.join(directory, f"{name} - month-end.xlsx")
+        with pd.ExcelWriter(xlsx, engine='openpyxl') as writer:
+            df.to_excel(writer, index=False, startrow=startrow)
+        csv = os.path.join(directory, f"{name} - month-end.csv")
+        df.to_csv(csv, index=False)
+        paths += [(report, xlsx), (report, csv)]
+    return paths
+
+
+def read_everything(filepath, report):
+    """The old read: every column, types inferred"""
+    header = report_registry.REPORTS[report].table_for(filepath).header
+    if filepath.lower().endswith('.csv'):
+        return pd.read_csv(filepath)
+    return app.read_excel_safe(filepath, header=header)
+
+
+def measure(read, filepath, report, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        df = read(filepath, report)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    read(filepath, report)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return median(timings), int(df.memory_usage(deep=True).sum()), peak, df.shape
+
+
+def mb(n):
+    return f"{n / 1024 / 1024:.1f}MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare whole-sheet reads with declared-column reads')
+    parser.add_argument('paths', nargs='*', help='real CSV/Excel exports (default: generated month-end workbooks)')
+    parser.add_argument('--rows', type=int, default=20000, help='rows in generated exports (default: 20000)')
+    parser.add_argument('--extra-columns', type=int, default=30, help='unused columns in generated exports (default: 30)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed reads per case (default: 3)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='shopmgr-table-bench-') as workdir:
+        if args.paths:
+            cases = []
+            for path in args.paths:
+                report = report_registry.match_filename(os.path.basename(path), aliases=True)
+                if report is None or report.table_for(path) is None:
+                    print(f"{path}: not a report with declared CSV/Excel columns - skipped")
+                    continue
+                cases.append((report.name, path))
+        else:
+            print(f"Generating {args.rows}-row exports with {args.extra_columns} unused columns...")
+            cases = write_month_end(workdir, args.rows, args.extra_columns)
+
+        print(f"{'file':<38} {'read':<9} {'shape':>12} {'time':>10} {'frame':>9} {'peak':>9}")
+        print('-' * 92)
+        for report, path in cases:
+            name = os.path.basename(path)
+            name = name if len(name) <= 38 else name[:35] + '...'
+            full = measure(read_everything, path, report, args.repeat)
+            pruned = measure(app.read_report_table, path, report, args.repeat)
+            for label, (seconds, frame, peak, shape) in (('all cols', full), ('declared', pruned)):
+                print(f"{name:<38} {label:<9} {f'{shape[0]}x{shape[1]}':>12} {seconds * 1000:>8.1f}ms "
+                      f"{mb(frame):>9} {mb(peak):>9}")
+                name = ''
+            print(f"{'':<38} {'saved':<9} {'':>12} {(full[0] - pruned[0]) * 1000:>8.1f}ms "
+                  f"{mb(full[1] - pruned[1]):>9} {mb(full[2] - pruned[2]):>9}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dealer Report Generator for Steensma Shop Manager
+Writes text exports in the exact layout the DMS produces, so parsers and the
+dashboard can be load- and scale-tested offline with month-end-sized,
+multi-location data.
+
+Reports written per location (as "<Report> - M-D-YY.txt"):
+    Sales and Gross, PO Over 30, Open Back Orders, No Bins, Site Lead, Scheduled Shop Jobs
+
+Usage:
+    python bench/generate_reports.py --out /tmp/synthetic
+    python bench/generate_reports.py --out /tmp/synthetic --preset month-end --locations Plainwell,Kalamazoo
+    python bench/generate_reports.py --out /tmp/synthetic --mechanics 12 --vendors 40 --po-lines 3000 --age-mean 45
+
+Every size/count option overrides the chosen preset. The same --seed always
+produces the same files.
+"""
+import os
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta
+
+# Sizes roughly matching a normal daily export vs. a month-end, multi-tech store
+PRESETS = {
+    'daily': {
+        'mechanics': 4, 'ros_per_mechanic': 30, 'vendors': 15, 'po_lines': 120,
+        'customers': 30, 'backorders': 60, 'no_bins': 30, 'jobs': 12,
+    },
+    'month-end': {
+        'mechanics': 12, 'ros_per_mechanic': 250, 'vendors': 60, 'po_lines': 2500,
+        'customers': 400, 'backorders': 1500, 'no_bins': 800, 'jobs': 120,
+    },
+}
+
+# The dashboard tracks these technicians by name, so they always come first
+TRACKED_MECHANICS = ['Derek Snyder', 'CHRIS DEMANN', 'Brandon Wallace']
+
+FIRST_NAMES = ['Mike', 'Sarah', 'Tom', 'Jessica', 'Dave', 'Karen', 'Steve', 'Amy', 'Jim', 'Laura',
+               'Bob', 'Nancy', 'Ryan', 'Julie', 'Matt', 'Heather', 'Dan', 'Lisa', 'Kevin', 'Megan']
+LAST_NAMES = ['VanderMolen', 'DeVries', 'Smith', 'Johnson', 'Bultema', 'Kuipers', 'Miller', 'Brink',
+              'Hoekstra', 'Anderson', 'Post', 'Wilson', 'Visser', 'Taylor', 'Zwiers', 'Martin']
+BUSINESS_WORDS = ['LAWN', 'LANDSCAPING', 'ASPHALT MAINT', 'CONSTRUCTION', 'COMM. SCHOOLS', 'LAWNCARE',
+                  'PROPERTY MGMT', 'GOLF CLUB', 'TOWNSHIP', 'FARMS']
+
+# Line code, vendor name and PO number prefix for each parts supplier
+SUPPLIERS = [
+    ('JOHP', 'JOHN DEERE PARTS', '128'), ('TORP', 'TORO', '200'), ('CUBP', 'MEDART INC.', '44'),
+    ('KAWP', 'KAWASAKI', '137'), ('GECP', 'GENERAC', '108'), ('MISP', 'CURTIS INDUSTRIES LLC', '47'),
+    ('BRPP', 'BRYAN EQUIPMENT - PW', '27'), ('EXMP', 'POWER DISTRIBUTORS', '193'),
+    ('HONP', 'AMERICAN HONDA', '14'), ('GARP', 'GARDNER INC', '106'), ('WSPP', 'WESTERN PRODUCTS', '250'),
+    ('JRCP', 'JRCO', '131'), ('WODP', 'WOODS EQUIPMENT', '260'), ('PEDP', 'PED', '270'),
+    ('PASP', 'PLAINWELL AUTO SUPPLY CO.', '280'), ('PACP', 'PACE INC', '290'),
+]
+
+PART_WORDS = ['ASSY', 'BEARING', 'BELT', 'BLADE', 'BOLT', 'CARBURETOR', 'FILTER', 'GASKET', 'HOSE',
+              'KIT', 'LEVER', 'MOTOR', 'PULLEY', 'RECOIL', 'SENSOR', 'SPACER', 'SPRING', 'WHEEL']
+JOB_DESCRIPTIONS = [
+    'Lawn and Garden Tractor Tune-Up, 44" TO 72" Mower Deck with a hydro service',
+    'CUSTOMER DROP OFF, THE DRIVE FUNCTION IS NOT WORKING ON THE REAR WHEELS.PLEASE EVALUATE AND ADVISE.',
+    'Walk Behind Equipment Tune up Edger/Tiller/Blower/Pressure Washer',
+    'MISSING HANDLE BOLT. RUNS  ROUGH UNLESS THE CHOKE IS ON HALF WAY.',
+    'See previous RO. Unit is still leaking oil. ',
+    'Zero turn annual service - sharpen blades, change oil, check belts',
+]
+
+
+def money(value):
+    """Format like the DMS: $1,234.56 or ($1,234.56)"""
+    text = f"${abs(value):,.2f}"
+    return f"({text})" if value < 0 else text
+
+
+def plain_money(value):
+    """Format like the Site Lead statement: 1,234.56 or (1,234.56)"""
+    text = f"{abs(value):,.2f}"
+    return f"({text})" if value < 0 else text
+
+
+def hhmm(minutes):
+    return f"{int(minutes) // 60:02d}:{int(minutes) % 60:02d}"
+
+
+def us_date(day):
+    return f"{day.month}/{day.day}/{day.year}"
+
+
+def file_date(day):
+    return f"{day.month}-{day.day}-{day.strftime('%y')}"
+
+
+def stamp(day):
+    return f"{us_date(day)} 7:48 PM"
+
+
+def store_line(location):
+    return f"Steensma Lawn {location}361 12th st.{location}, MI  49080,"
+
+
+def person_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def customer_name(rng):
+    if rng.random() < 0.3:
+        return f"{rng.choice(LAST_NAMES).upper()} {rng.choice(BUSINESS_WORDS)}"
+    name = person_name(rng)
+    return name.upper() if rng.random() < 0.4 else name
+
+
+def phone(rng):
+    return f"({rng.choice(['269', '616', '248'])}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}"
+
+
+def draw_age(rng, mean, maximum):
+    """Exponentially distributed age in days, capped at maximum"""
+    return min(maximum, int(rng.expovariate(1.0 / mean)))
+
+
+class Paginator:
+    """Collects report lines and inserts the DMS page footer/header every page_lines rows"""
+
+    def __init__(self, page_lines, footer, header_lines):
+        self.page_lines = page_lines
+        self.footer = footer
+        self.header_lines = header_lines
+        self.pages = [[]]
+
+    def add(self, line):
+        if len(self.pages[-1]) >= self.page_lines:
+            self.pages.append([])
+        self.pages[-1].append(line)
+
+    def render(self, preamble):
+        total = len(self.pages)
+        out = list(preamble)
+        for number, rows in enumerate(self.pages, start=1):
+            if number > 1:
+                out.extend(self.header_lines)
+            out.extend(rows)
+            out.append(f"{total}")
+            out.append(" of")
+            out.append(f"{self.footer}, Page,{number},{total}")
+        return '\n'.join(out) + '\n'
+
+
+def build_world(rng, location, opts):
+    """Shared vendors, POs and parts so the reports cross-reference each other"""
+    suppliers = SUPPLIERS[:]
+    while len(suppliers) < opts['vendors']:
+        n = len(suppliers)
+        suppliers.append((f"V{n:02d}P", f"{rng.choice(LAST_NAMES).upper()} SUPPLY {n}", str(300 + n)))
+    suppliers = suppliers[:opts['vendors']]
+
+    pos = []
+    counters = {}
+    for _ in range(opts['po_lines']):
+        line_code, vendor, prefix = rng.choice(suppliers)
+        counters[prefix] = counters.get(prefix, rng.randint(1000, 90000)) + rng.randint(1, 5)
+        pos.append({
+            'line_code': line_code,
+            'vendor': vendor,
+            'po_number': f"{prefix}-{counters[prefix]}",
+            'age': draw_age(rng, opts['age_mean'], opts['max_age']),
+            'status': rng.choice(['Received', 'Back-Ordered', 'On Order', 'On Order']),
+        })
+
+    customers = [(customer_name(rng), phone(rng)) for _ in range(opts['customers'])]
+    mechanics = TRACKED_MECHANICS[:opts['mechanics']]
+    while len(mechanics) < opts['mechanics']:
+        name = person_name(rng)
+        if name not in mechanics:
+            mechanics.append(name)
+    return {'location': location, 'pos': pos, 'customers': customers, 'mechanics': mechanics}
+
+
+def part_number(rng, line_code):
+    style = rng.random()
+    if style < 0.4:
+        number = f"{rng.randint(10, 999)}-{rng.randint(10, 9999)}"
+    elif style < 0.7:
+        number = f"{rng.choice('AMLRT')}{rng.randint(100000, 999999)}"
+    else:
+        number = f"{rng.randint(10000, 99999999)}"
+    return line_code, number
+
+
+def sales_and_gross(rng, world, day, opts):
+    title = 'Sales and Gross Profit By Mechanic'
+    headers = [
+        'Mechanic,Time,Part Sales,Labor Sales,Other Sales,Total Sales',
+        'Reference,Billed,Actual,Sales,COGS,Profit,Sales,COGS,Profit,Sales,COGS,Profit,Sales,COGS,Profit',
+    ]
+    pages = Paginator(opts['page_lines'], f"{title} - {stamp(day)}", headers)
+    month_start = day.replace(day=1)
+    grand = [0, 0, 0.0, 0.0, 0.0, 0.0]
+    invoice = rng.randint(1750000, 1800000)
+
+    for mechanic in world['mechanics']:
+        prefix = rng.choice(['p', 'b'])
+        pages.add(f"{prefix}{mechanic}")
+        billed_total = actual_total = 0
+        parts_total = cogs_total = labor_total = other_total = 0.0
+
+        for _ in range(opts['ros_per_mechanic']):
+            invoice += rng.randint(1, 400)
+            billed = rng.randint(15, 480)
+            actual = max(10, int(billed * rng.uniform(0.5, 1.3)))
+            parts = round(rng.uniform(0, 400), 2) if rng.random() < 0.8 else 0.0
+            cogs = round(parts * rng.uniform(0.4, 0.7), 2)
+            labor = round(billed / 60 * 95, 2)
+            other = round(rng.choice([0, 4.5, 10, 95, 110]), 2)
+            total = parts + labor + other
+            part_pct = f"{(parts - cogs) / parts * 100:.1f}%" if parts else ''
+            total_pct = f"{(total - cogs) / total * 100:.1f}%" if total else ''
+            pages.add(
+                f"{invoice}.{invoice - 280000 + rng.randint(0, 99)},{hhmm(billed)},{hhmm(actual)},"
+                f"{money(parts) if parts else ''},{money(cogs) if parts else ''},{part_pct},"
+                f"{money(labor)},,100.0%,{money(other) if other else ''},,{'100.0%' if other else ''},"
+                f"{money(total)},{money(cogs) if parts else ''},{total_pct}"
+            )
+            billed_total += billed
+            actual_total += actual
+            parts_total += parts
+            cogs_total += cogs
+            labor_total += labor
+            other_total += other
+
+        total = parts_total + labor_total + other_total
+        pages.add(
+            f"{prefix}{mechanic},{hhmm(billed_total)},{hhmm(actual_total)},{money(parts_total)},"
+            f"{money(cogs_total)},{(parts_total - cogs_total) / max(parts_total, 0.01) * 100:.1f}%,"
+            f"{money(labor_total)},$0.00,100.0%,{money(other_total)},$0.00,100.0%,"
+            f"{money(total)},{money(cogs_total)},{(total - cogs_total) / max(total, 0.01) * 100:.1f}%"
+        )
+        worked = int(actual_total * rng.uniform(1.0, 1.4))
+        pages.add(f"Hours Worked:,{hhmm(worked)},{billed_total * 100 // max(worked, 1)}%,"
+                  f"{actual_total * 100 // max(worked, 1)}%")
+        for i, value in enumerate((billed_total, actual_total, parts_total, cogs_total, labor_total, other_total)):
+            grand[i] += value
+
+    total = grand[2] + grand[4] + grand[5]
+    pages.add(
+        f"Grand Totals:,{hhmm(grand[0])},{hhmm(grand[1])},{money(grand[2])},{money(grand[3])},"
+        f"{(grand[2] - grand[3]) / max(grand[2], 0.01) * 100:.1f}%,{money(grand[4])},$0.00,100.0%,"
+        f"{money(grand[5])},$0.00,100.0%,{money(total)},{money(grand[3])},"
+        f"{(total - grand[3]) / max(total, 0.01) * 100:.1f}%"
+    )
+    preamble = [
+        f"{store_line(world['location'])}{title}",
+        f"Dates Between '{month_start:%Y-%m-%d}' And '{day:%Y-%m-%d} 23:59:00'Supress Zeros: TrueNew Page by Mechanic",
+    ] + headers
+    return pages.render(preamble)
+
+
+def po_over_30(rng, world, day, opts):
+    title = 'Purchase Order Aging Analysis'
+    headers = [
+        'Vendor Name,Ordered,Received',
+        'PO Number,Age,Status,Since,Return,Items,Pieces,Total,Pieces,Total',
+    ]
+    pages = Paginator(opts['page_lines'], f"{title} - {stamp(day)}", headers)
+    by_vendor = {}
+    for po in world['pos']:
+        by_vendor.setdefault(po['vendor'], []).append(po)
+
+    for vendor in sorted(by_vendor):
+        pages.add(vendor)
+        for po in sorted(by_vendor[vendor], key=lambda p: p['po_number']):
+            since = day - timedelta(days=po['age'])
+            items = rng.randint(1, 8)
+            pieces = items * rng.randint(1, 4)
+            total = round(pieces * rng.uniform(3, 300), 2)
+            is_return = rng.random() < 0.03
+            if is_return:
+                pieces, total = -pieces, -total
+            received = po['status'] == 'Received'
+            pages.add(
+                f"{po['po_number']},{po['age']},{po['status']},{since:%m/%d/%y},"
+                f"{'True' if is_return else ''},{items},{pieces:,},{money(total)},"
+                f"{pieces if received else 0},{money(total) if received else '$0.00'}"
+            )
+    return pages.render([title, store_line(world['location'])] + headers)
+
+
+def open_back_orders(rng, world, day, opts):
+    headers = ['Invoice', 'Customer,Phone ,Part Number,Type,PP,Age,Ordered,Status,Available,Allocated,PO ']
+    pages = Paginator(opts['page_lines'], f"Open Back Orders - {stamp(day)}", headers)
+    open_pos = [po for po in world['pos'] if po['status'] != 'Received']
+    statuses = ['Back-Ordered', 'Released for Payment', 'On Order', 'Pending', 'Received']
+
+    remaining = opts['backorders']
+    for name, number in sorted(world['customers'], key=lambda c: c[0].lower()):
+        if remaining <= 0:
+            break
+        for i in range(min(remaining, rng.randint(1, 8))):
+            po = rng.choice(open_pos) if open_pos else None
+            line_code = po['line_code'] if po else rng.choice(SUPPLIERS)[0]
+            _, part = part_number(rng, line_code)
+            status = rng.choice(statuses)
+            age = min(po['age'], opts['max_age']) if po else draw_age(rng, opts['age_mean'] / 3, opts['max_age'])
+            ordered = rng.randint(1, 4)
+            allocated = ordered if status in ('Released for Payment', 'Received') else 0
+            po_number = po['po_number'] if po and status != 'Pending' else ''
+            customer_cols = f"{name},{number}" if i == 0 else ','
+            pages.add(f"{customer_cols},{line_code} - {part},0,RO,X,{age},{ordered},{status},0,{allocated},{po_number}")
+            remaining -= 1
+
+    preamble = [
+        f"{store_line(world['location'])}Open Back Orders",
+        "By CustomerInclude: R/O's",
+    ] + headers + ['Repair Orders']
+    return pages.render(preamble)
+
+
+def no_bins(rng, world, day, opts):
+    headers = ['Bin,Line Code,Part Number,O/C,Description,Class,Available']
+    pages = Paginator(opts['page_lines'], f"Bin Census Detailed - {stamp(day)}", headers)
+    rows = []
+    for _ in range(opts['no_bins']):
+        line_code, part = part_number(rng, rng.choice(SUPPLIERS)[0])
+        words = rng.sample(PART_WORDS, 2)
+        # The DMS does not quote descriptions, so some contain a bare comma
+        description = f"{words[0]}, {words[1]}" if rng.random() < 0.15 else f"{words[0]} {words[1]}"
+        rows.append((line_code, part, description[:21], rng.choice([1, 1, 1, 2, 5, -1])))
+    for line_code, part, description, available in sorted(rows):
+        pages.add(f",{line_code},{part},N,{description},,{available}")
+    preamble = ['Bin Census Detailed', store_line(world['location']), 'Zone'] + headers + ['']
+    return pages.render(preamble)
+
+
+def site_lead(rng, world, day, opts):
+    month = day.strftime('%b')
+    year = day.year
+    months = day.month
+
+    def row(low, high):
+        current = rng.uniform(low, high)
+        prior = rng.uniform(low, high)
+        return ','.join(plain_money(v) for v in (current, current * rng.uniform(1, months + 0.5),
+                                                 prior, prior * rng.uniform(1, months + 0.5)))
+
+    scale = opts['mechanics'] / 4.0
+    month_words = ['One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten', 'Eleven', 'Twelve']
+    lines = [
+        'Steensma Lawn & Power Equip.',
+        f"{world['location']} Site lead Statement",
+        f"For the Month and the {month_words[months - 1]} Months Ending {day:%B} {day.day}, {year} and {year - 1}",
+        f"{month} {year},{month} {year} (YTD),{month} {year - 1},{month} {year - 1} (YTD)",
+        'GROSS PROFIT', 'SALES',
+        'NEW EQUIPMENT SALES', row(100000 * scale, 300000 * scale),
+        'PARTS SALES', row(50000 * scale, 120000 * scale),
+        'SERVICE LABOR SALES', row(30000 * scale, 80000 * scale),
+        'OTHER REVENUE ', row(1000, 3000),
+        'CUSTOMER DISCOUNT SALES',
+        'CUSTOMER DISCOUNT PARTS', row(-3000, -1000),
+        'CUSTOMER DISCOUNT SERVICE', row(-4000, -1000),
+        'Total SALES',
+        'COST OF GOODS SOLD',
+        'EQUIPMENT COG', row(80000 * scale, 220000 * scale),
+        'PARTS COG', row(30000 * scale, 80000 * scale),
+        'PAYROLL SERVICE TECHS', row(15000 * scale, 30000 * scale),
+        'Total COST OF GOODS SOLD',
+        f"Total GROSS PROFIT,{row(10000, 60000)}",
+        'EXPENSES',
+        f"Total EXPENSES,{row(20000, 150000)}",
+        f"NET PROFIT<LOSS>,{row(-100000, 40000)}",
+        '1', ' of', f"{stamp(day)}, Page,1,1",
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def scheduled_shop_jobs(rng, world, day, opts):
+    headers = [
+        'Mechanics',
+        'Invoice,Customer,Model,Description,Estimated Time,Start Time,End Time,Priority,Status',
+    ]
+    pages = Paginator(opts['page_lines'], f"Scheduled Shop Jobs - {stamp(day)}", headers)
+    sections = ['FIT IN WORK', 'p.HOUSE ACCOUNT'] + [f"p{m}" for m in world['mechanics']]
+    invoice = rng.randint(1810000, 1820000)
+    per_section = max(1, opts['jobs'] // len(sections))
+    for section in sections:
+        pages.add(section)
+        for _ in range(per_section):
+            invoice += rng.randint(1, 300)
+            start = day + timedelta(days=rng.randint(0, 4))
+            model = rng.choice(['44585-1', '21472', 'X380W48A', 'LZX993EBV606X1', 'CUB CADET', '31AE6A4E129'])
+            customer = rng.choice(world['customers'])[0] if world['customers'] else customer_name(rng)
+            pages.add(
+                f"{invoice},{customer},{model},{rng.choice(JOB_DESCRIPTIONS)},"
+                f"{rng.randint(0, 4)}:{rng.randint(0, 59):02d},{us_date(start)},{us_date(start)},"
+                f"097 - Residential ,{rng.choice(['CUSTOMER DROP', 'Awaiting Start', 'In Progress'])}"
+            )
+    preamble = [store_line(world['location']), 'Scheduled Shop Jobs'] + headers
+    return pages.render(preamble)
+
+
+REPORTS = [
+    ('Sales and Gross', sales_and_gross),
+    ('PO Over 30', po_over_30),
+    ('Open Back Orders', open_back_orders),
+    ('No Bins', no_bins),
+    ('Site Lead', site_lead),
+    ('Scheduled Shop Jobs', scheduled_shop_jobs),
+]
+
+
+def generate(out_dir, locations, day, opts, seed=0):
+    """Write every report for every location; returns the list of files written"""
+    written = []
+    for index, location in enumerate(locations):
+        rng = random.Random(f"{seed}-{index}-{location}")
+        world = build_world(rng, location, opts)
+        location_dir = os.path.join(out_dir, location.lower().replace(' ', '_')) if len(locations) > 1 else out_dir
+        os.makedirs(location_dir, exist_ok=True)
+        for report, build in REPORTS:
+            path = os.path.join(location_dir, f"{report} - {file_date(day)}.txt")
+            with open(path, 'w') as f:
+                f.write(build(rng, world, day, opts))
+            written.append(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic dealer report exports')
+    parser.add_argument('--out', required=True, help='output directory')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='daily')
+    parser.add_argument('--locations', default='Plainwell',
+                        help='comma-separated store names; more than one writes a subfolder per store')
+    parser.add_argument('--date', help='report date as YYYY-MM-DD (default: today)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--page-lines', type=int, default=33, help='rows per printed page (default: 33)')
+    parser.add_argument('--age-mean', type=float, default=40.0, help='mean PO/back-order age in days (default: 40)')
+    parser.add_argument('--max-age', type=int, default=365, help='oldest age in days (default: 365)')
+    for option in PRESETS['daily']:
+        parser.add_argument(f"--{option.replace('_', '-')}", type=int, dest=option,
+                            help=f"override the preset's {option.replace('_', ' ')}")
+    args = parser.parse_args()
+
+    opts = dict(PRESETS[args.preset])
+    for option in PRESETS['daily']:
+        if getattr(args, option) is not None:
+            opts[option] = getattr(args, option)
+    opts.update(page_lines=args.page_lines, age_mean=args.age_mean, max_age=args.max_age)
+
+    day = datetime.strptime(args.date, '%Y-%m-%d') if args.date else datetime.now()
+    locations = [loc.strip() for loc in args.locations.split(',') if loc.strip()]
+    for path in generate(args.out, locations, day, opts, seed=args.seed):
+        print(f"  ✓ {path} ({os.path.getsize(path):,} bytes)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Kiosk Fleet Load Test for Steensma Shop Manager
+Starts the app under gunicorn on a local port and simulates N dashboard
+screens with the real polling mix, ramping concurrency and comparing worker
+counts.
+
+Each simulated screen behaves like the templates:
+    dashboard screens - GET /, /api/data and /api/weather, then /api/data every 5 minutes
+    landing screens   - GET /landing and /api/summary, then /api/summary every 5 minutes
+/api/weather is pointed at a local stub instead of wttr.in.
+
+The 5 minute poll interval is divided by --speedup so a short run produces the
+request rate of a much longer real one (default 60: one poll every 5 seconds).
+
+Usage:
+    python bench/load_test.py                                  # 4 workers, 10/50/100/200 screens
+    python bench/load_test.py --workers 1,2,4,8 --clients 25,100,400
+    python bench/load_test.py --datasheets /tmp/synthetic --json results.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import signal
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+POLL_INTERVAL = 5 * 60  # seconds between refreshes in the real templates
+
+WEATHER_STUB = json.dumps({
+    'current_condition': [{'temp_F': '41', 'weatherDesc': [{'value': 'Partly cloudy'}], 'weatherCode': '116'}]
+}).encode('utf-8')
+
+
+class WeatherStubHandler(BaseHTTPRequestHandler):
+    """Answers like wttr.in's j1 format after a configurable delay"""
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(WEATHER_STUB)))
+        self.end_headers()
+        self.wfile.write(WEATHER_STUB)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_weather_stub(delay):
+    WeatherStubHandler.delay = delay
+    server = ThreadingHTTPServer(('127.0.0.1', 0), WeatherStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_app(workers, port, env):
+    """Start gunicorn with the repo's config and wait until /health answers"""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '-w', str(workers), '-b', f"127.0.0.1:{port}", '--log-level', 'warning', 'app:app'],
+        cwd=REPO_DIR, env=env
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=2) as response:
+                if response.status == 200:
+                    return process
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    stop_app(process)
+    raise RuntimeError('gunicorn did not become healthy within 30 seconds')
+
+
+def stop_app(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+class Recorder:
+    """Thread-safe latency samples per route"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def add(self, route, seconds, ok):
+        with self.lock:
+            if ok:
+                self.samples.setdefault(route, []).append(seconds)
+            else:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+
+def fetch(base_url, route, recorder, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(base_url + route, timeout=timeout) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, ConnectionError, OSError):
+        ok = False
+    recorder.add(route, time.perf_counter() - started, ok)
+
+
+def screen(kind, base_url, recorder, stop, interval, timeout):
+    """One kiosk: initial page load, then poll at the template's interval"""
+    if kind == 'landing':
+        page_load, poll = ['/landing', '/api/summary'], ['/api/summary']
+    else:
+        page_load, poll = ['/', '/api/data', '/api/weather'], ['/api/data']
+
+    # Screens do not all boot at the same moment
+    if stop.wait(random.uniform(0, interval)):
+        return
+    for route in page_load:
+        fetch(base_url, route, recorder, timeout)
+    while not stop.wait(interval * random.uniform(0.95, 1.05)):
+        for route in poll:
+            fetch(base_url, route, recorder, timeout)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_stage(base_url, clients, duration, landing_ratio, interval, timeout):
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = []
+    for i in range(clients):
+        kind = 'landing' if i < int(round(clients * landing_ratio)) else 'dashboard'
+        thread = threading.Thread(target=screen, args=(kind, base_url, recorder, stop, interval, timeout),
+                                  daemon=True)
+        thread.start()
+        threads.append(thread)
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout + 1)
+
+    routes = {}
+    for route in sorted(set(recorder.samples) | set(recorder.errors)):
+        values = sorted(recorder.samples.get(route, []))
+        routes[route] = {
+            'requests': len(values),
+            'errors': recorder.errors.get(route, 0),
+            'throughput': round(len(values) / duration, 2),
+            'p50': round(percentile(values, 50), 4),
+            'p95': round(percentile(values, 95), 4),
+            'p99': round(percentile(values, 99), 4),
+        }
+    return routes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate a fleet of dashboard kiosks against gunicorn')
+    parser.add_argument('--workers', default='4', help='comma-separated gunicorn worker counts (default: 4)')
+    parser.add_argument('--clients', default='10,50,100,200', help='concurrency ramp (default: 10,50,100,200)')
+    parser.add_argument('--stage-seconds', type=float, default=30, help='duration of each ramp stage (default: 30)')
+    parser.add_argument('--speedup', type=float, default=60,
+                        help='divide the 5 minute poll interval by this (default: 60)')
+    parser.add_argument('--landing-ratio', type=float, default=0.25,
+                        help='fraction of screens showing landing.html (default: 0.25)')
+    parser.add_argument('--weather-delay', type=float, default=0.2, help='stub weather latency in seconds')
+    parser.add_argument('--timeout', type=float, default=30, help='client request timeout in seconds')
+    parser.add_argument('--slo', type=float, default=1.0,
+                        help='flag a stage when any route p95 exceeds this many seconds (default: 1.0)')
+    parser.add_argument('--datasheets', help='serve reports from this directory (e.g. generate_reports.py output)')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--json', help='also write results to this file')
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(',') if w.strip()]
+    ramp = [int(c) for c in args.clients.split(',') if c.strip()]
+    interval = POLL_INTERVAL / args.speedup
+
+    weather = start_weather_stub(args.weather_delay)
+    env = dict(os.environ)
+    env['SHOPMGR_WEATHER_URL'] = f"http://127.0.0.1:{weather.server_address[1]}/"
+    if args.datasheets:
+        env['SHOPMGR_DATASHEETS_DIR'] = os.path.abspath(args.datasheets)
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = []
+
+    print(f"Poll interval {interval:.1f}s (5 min / {args.speedup:g}), {args.stage_seconds:g}s per stage")
+    print(f"{'workers':>7} {'screens':>7} {'route':<14} {'req':>6} {'err':>5} {'req/s':>7} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    print('-' * 82)
+
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory(prefix='shopmgr-load-metrics-') as metrics_dir:
+            # Keep the test server's metric files away from a production instance
+            env['PROMETHEUS_MULTIPROC_DIR'] = metrics_dir
+            process = start_app(workers, args.port, env)
+            try:
+                for clients in ramp:
+                    routes = run_stage(base_url, clients, args.stage_seconds, args.landing_ratio,
+                                       interval, args.timeout)
+                    breached = any(r['p95'] > args.slo or r['errors'] for r in routes.values())
+                    results.append({'workers': workers, 'clients': clients, 'routes': routes,
+                                    'over_slo': breached})
+                    for route, r in routes.items():
+                        print(f"{workers:>7} {clients:>7} {route:<14} {r['requests']:>6} {r['errors']:>5} "
+                              f"{r['throughput']:>7.2f} {r['p50'] * 1000:>8.1f} {r['p95'] * 1000:>8.1f} "
+                              f"{r['p99'] * 1000:>8.1f}")
+                    if breached:
+                        print(f"{'':>16}⚠️  p95 over {args.slo:g}s or errors at {clients} screens")
+            finally:
+                stop_app(process)
+        print('-' * 82)
+
+    weather.shutdown()
+
+    # Largest screen count each worker setting handled within the SLO
+    for workers in worker_counts:
+        ok = [r['clients'] for r in results if r['workers'] == workers and not r['over_slo']]
+        print(f"  {workers} worker(s): {'held up to ' + str(max(ok)) + ' screens' if ok else 'over SLO at every stage'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+        print(f"✓ Results written to {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Dashboard Deltas for Steensma Shop Manager
+/api/data?since=<generation> answers with a patch from the snapshot the
+client already has to the current one, instead of the whole payload.
+
+A patch is a list of JSON Patch (RFC 6902) operations - only add, remove and
+replace are used:
+    [{"op": "replace", "path": "/backorders_over_5/3/age", "value": 21},
+     {"op": "add", "path": "/no_bins/2", "value": {...}}]
+Operations are applied in order; dashboard.html's applyPatch() applies them.
+Lists are diffed as one changed run between the rows they still share at the
+start and at the end, which is how a re-uploaded report usually changes.
+"""
+import os
+import json
+
+# Generations whose data each worker keeps per location to diff against
+HISTORY = int(os.environ.get('SHOPMGR_DELTA_HISTORY', '8'))
+
+
+def _pointer(path, key):
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def diff(old, new, path=''):
+    """Operations that turn old into new (JSON-ready data)"""
+    if type(old) is not type(new):
+        return [{'op': 'replace', 'path': path, 'value': new}]
+    if old == new:
+        return []
+    if isinstance(new, dict):
+        ops = [{'op': 'remove', 'path': _pointer(path, key)} for key in old if key not in new]
+        for key, value in new.items():
+            if key in old:
+                ops += diff(old[key], value, _pointer(path, key))
+            else:
+                ops.append({'op': 'add', 'path': _pointer(path, key), 'value': value})
+        return ops
+    if isinstance(new, list):
+        return _diff_list(old, new, path)
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def _diff_list(old, new, path):
+    shortest = min(len(old), len(new))
+    start = 0
+    while start < shortest and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    removed = len(old) - start - end
+    added = new[start:len(new) - end]
+
+    # Rows in the changed run that kept their position are diffed field by field
+    paired = min(removed, len(added))
+    ops = []
+    for offset in range(paired):
+        ops += diff(old[start + offset], added[offset], _pointer(path, start + offset))
+    ops += [{'op': 'remove', 'path': _pointer(path, start + paired)} for _ in range(removed - paired)]
+    ops += [{'op': 'add', 'path': _pointer(path, start + paired + offset), 'value': value}
+            for offset, value in enumerate(added[paired:])]
+    if len(ops) >= len(new) > 0:
+        return [{'op': 'replace', 'path': path, 'value': new}]  # most rows changed
+    return ops
+
+
+def smaller_than(patch, data):
+    """True if sending the patch costs fewer bytes than sending data"""
+    return len(json.dumps(patch, separators=(',', ':'))) < len(json.dumps(data, separators=(',', ':')))
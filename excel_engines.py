@@ -0,0 +1,179 @@
+"""
+Excel Engine Selection for Steensma Shop Manager
+app.read_excel_safe() reads every Excel export through here. Engines are tried
+fastest first (see bench/bench_excel_engines.py), and the engine that worked
+for a report type is remembered per datasheets folder in .excel_engines.json,
+so a store whose exports break one engine doesn't pay for a failed decode on
+every read.
+
+Each entry also keeps a read time of each engine and the last error of any
+engine that failed. The file is only rewritten when an entry's engine or
+failures change, not on every read, e.g.:
+    "backorders.xls": {"engine": "calamine", "seconds": {"calamine": 0.041}, "failed": {}}
+"""
+import os
+import re
+import json
+import fcntl
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+ENGINES_FILE = '.excel_engines.json'
+
+SHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+DOC_RELS_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+# Extension -> engines in the order tried when nothing is remembered yet.
+# calamine is the fastest on our exports and also reads the ones whose
+# styles openpyxl/xlrd reject.
+ENGINES = {
+    '.xlsx': ('calamine', 'openpyxl'),
+    '.xlsm': ('calamine', 'openpyxl'),
+    '.xls': ('calamine', 'xlrd'),
+}
+
+# Engines whose library isn't installed in this process
+_unavailable = set()
+
+
+def _engines_path(filepath):
+    return os.path.join(os.path.dirname(filepath), ENGINES_FILE)
+
+
+def entry_key(filepath, report):
+    return f"{report}{os.path.splitext(filepath)[1].lower()}"
+
+
+def load(filepath):
+    """Remembered engines for the folder a file is in"""
+    try:
+        with open(_engines_path(filepath), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def engine_order(filepath, report):
+    """Engines to try for a file: the one remembered for its report type first, then the default order"""
+    engines = [e for e in ENGINES.get(os.path.splitext(filepath)[1].lower(), ('calamine', 'openpyxl', 'xlrd'))
+               if e not in _unavailable]
+    remembered = load(filepath).get(entry_key(filepath, report), {}).get('engine')
+    if remembered in engines:
+        engines.remove(remembered)
+        engines.insert(0, remembered)
+    return engines
+
+
+def mark_unavailable(engine):
+    _unavailable.add(engine)
+
+
+def unchanged(entry, engine, failures):
+    """True if recording this read would only update the engine's read time"""
+    failed = entry.get('failed', {})
+    return (entry.get('engine') == engine and engine in entry.get('seconds', {}) and engine not in failed
+            and all(failed.get(name) == error for name, error in failures.items()))
+
+
+def remember(filepath, report, engine, seconds, failures):
+    """Record the engine that read a file, its time, and the engines that failed before it"""
+    key = entry_key(filepath, report)
+    if unchanged(load(filepath).get(key, {}), engine, failures):
+        return  # the usual case: the remembered engine read it again
+    path = _engines_path(filepath)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        # Workers read and write the same folder's file; the lock keeps one from dropping another's update
+        with open(path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state = load(filepath)
+            entry = state.setdefault(key, {'engine': None, 'seconds': {}, 'failed': {}})
+            entry['engine'] = engine
+            entry['seconds'][engine] = round(seconds, 4)
+            entry['failed'].pop(engine, None)
+            entry['failed'].update(failures)
+            with open(temp_path, 'w') as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Could not save Excel engine choice: {e}")
+
+
+def _column_index(cell_ref):
+    """'J5' -> 9"""
+    index = 0
+    for letter in re.match(r'[A-Z]+', cell_ref).group(0):
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def _first_sheet_path(z):
+    """Zip path of the first sheet in workbook order (pandas' sheet_name=0), which needn't be sheet1.xml"""
+    with z.open('xl/workbook.xml') as f:
+        rel_id = ET.parse(f).getroot().find(f'{SHEET_NS}sheets/{SHEET_NS}sheet').get(DOC_RELS_NS + 'id')
+    with z.open('xl/_rels/workbook.xml.rels') as f:
+        rels = ET.parse(f).getroot()
+    for rel in rels.iter(RELS_NS + 'Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            # Targets are relative to xl/ unless they start at the package root
+            return target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+    raise KeyError(f"no relationship {rel_id} for the first sheet")
+
+
+def _xlsx_row(filepath, row):
+    """Values of one row of the first sheet, streamed from the XML (stops at that row, ignores styles)"""
+    with zipfile.ZipFile(filepath) as z:
+        shared_strings = []
+        if 'xl/sharedStrings.xml' in z.namelist():
+            with z.open('xl/sharedStrings.xml') as f:
+                for _, si in ET.iterparse(f):
+                    if si.tag == SHEET_NS + 'si':
+                        shared_strings.append(''.join(t.text or '' for t in si.iter(SHEET_NS + 't')))
+                        si.clear()
+        with z.open(_first_sheet_path(z)) as f:
+            number = 0
+            for _, element in ET.iterparse(f):
+                if element.tag != SHEET_NS + 'row':
+                    continue
+                # r is optional; a row without it follows the previous one
+                number = int(element.get('r') or number + 1)
+                if number < row + 1:
+                    element.clear()
+                    continue
+                values = []
+                if number == row + 1:
+                    for cell in element.iter(SHEET_NS + 'c'):
+                        value = cell.find(SHEET_NS + 'v')
+                        if cell.get('t') == 's' and value is not None:
+                            text = shared_strings[int(value.text)]
+                        elif cell.get('t') == 'inlineStr':
+                            text = ''.join(t.text or '' for t in cell.iter(SHEET_NS + 't'))
+                        else:
+                            text = value.text if value is not None else ''
+                        position = _column_index(cell.get('r')) if cell.get('r') else len(values)
+                        values.extend([''] * (position + 1 - len(values)))
+                        values[position] = text or ''
+                return values
+    return []
+
+
+def read_header_row(filepath, row):
+    """
+    Header labels (row is 0-based, as in pandas' header=) of the first sheet of
+    an Excel file, without decoding the whole sheet. None if the file can't be
+    read this way; callers then read every column.
+    """
+    ext = os.path.splitext(filepath)[1].lower()
+    try:
+        if ext in ('.xlsx', '.xlsm'):
+            return _xlsx_row(filepath, row)
+        if ext == '.xls':
+            import xlrd
+            sheet = xlrd.open_workbook(filepath, on_demand=True).sheet_by_index(0)
+            return [str(value) for value in sheet.row_values(row)] if row < sheet.nrows else []
+    except Exception as e:
+        print(f"Could not read the header of {os.path.basename(filepath)}: {e}")
+    return None
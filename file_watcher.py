@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 File Watcher for Steensma Shop Manager
-Watches the datasheets directory for new Excel files and auto-converts them to CSV
+Watches each location's datasheets directory for new Excel files and auto-converts them to CSV
+(ingest_service.py does this as one of its stages)
 """
 import os
 import time
@@ -13,12 +14,25 @@ from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+import locations
+import pipeline_ledger
+import report_registry
+
 WATCH_DIR = '/home/ubuntu/shopmgr/datasheets'
 ARCHIVE_DIR = '/home/ubuntu/shopmgr/archive'
 HISTORY_FILE = '/home/ubuntu/shopmgr/daily_history.json'
 
+# How often to look for newly added locations/<store>/datasheets folders
+LOCATION_SCAN_INTERVAL = 60
+
 class DataFileHandler(FileSystemEventHandler):
-    """Handle file system events for Excel files"""
+    """Handle file system events for Excel files in one location's datasheets folder"""
+    
+    def __init__(self, location=locations.DEFAULT_LOCATION, watch_dir=WATCH_DIR, archive_dir=ARCHIVE_DIR):
+        super().__init__()
+        self.location = location
+        self.watch_dir = watch_dir
+        self.archive_dir = archive_dir
     
     def extract_xlsx_to_csv(self, xlsx_path, csv_path):
         """Extract data from xlsx by parsing the raw XML (bypasses corrupt styles)"""
@@ -83,41 +97,32 @@ class DataFileHandler(FileSystemEventHandler):
         if not filename.endswith(('.xlsx', '.xls')):
             return
         
-        # Check if it's one of our target files
-        target_patterns = {
-            'Shop Schedule': 'Scheduled Shop Jobs',
-            'Scheduled Shop Jobs': 'Scheduled Shop Jobs',
-            'Feb Shop Report': 'Scheduled Shop Jobs',
-            'Gross Profit': 'Sales and Gross',
-            'Sales and Gross': 'Sales and Gross',
-            'Feb Gross Profit': 'Sales and Gross',
-            'Open Back Orders': 'Open Back Orders',
-            'Open ROs': 'Open Back Orders'
-        }
-        
-        matched_pattern = None
-        for pattern, output_base in target_patterns.items():
-            if pattern in filename:
-                matched_pattern = output_base
-                break
-        
-        if matched_pattern:
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] New file detected: {filename}")
-            self.process_file(event.src_path, filename, matched_pattern)
+        # Check if it's one of the reports we convert
+        report = report_registry.match_filename(filename, aliases=True)
+        if report and report.convert_excel:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] New file detected ({self.location}): {filename}")
+            self.process_file(event.src_path, filename, report)
     
     def on_modified(self, event):
         # Skip modified events to avoid duplicate processing
         pass
     
-    def process_file(self, filepath, filename, output_base):
+    def process_file(self, filepath, filename, report):
         """Process newly detected file - convert to CSV"""
+        # Wait a moment for file to finish writing
+        time.sleep(2)
+        self.convert_file(filepath, filename, report)
+    
+    def csv_path_for(self, report):
+        """Where today's CSV of a report is written"""
+        return os.path.join(self.watch_dir, f"{report.label} - {datetime.now().strftime('%m-%d-%y')}.csv")
+    
+    def convert_file(self, filepath, filename, report):
+        """Archive an Excel upload and convert it to CSV; returns the CSV path, or None"""
         try:
-            # Wait a moment for file to finish writing
-            time.sleep(2)
-            
             # Create archive directory with date
             today = datetime.now().strftime('%Y-%m-%d')
-            archive_subdir = os.path.join(ARCHIVE_DIR, today)
+            archive_subdir = os.path.join(self.archive_dir, today)
             os.makedirs(archive_subdir, exist_ok=True)
             
             # Copy original to archive
@@ -127,17 +132,21 @@ class DataFileHandler(FileSystemEventHandler):
             
             # Convert to CSV
             if filename.endswith('.xlsx'):
-                csv_filename = f"{output_base} - {datetime.now().strftime('%m-%d-%y')}.csv"
-                csv_path = os.path.join(WATCH_DIR, csv_filename)
+                csv_path = self.csv_path_for(report)
+                csv_filename = os.path.basename(csv_path)
                 
                 print(f"  → Converting to CSV: {csv_filename}")
                 success, result = self.extract_xlsx_to_csv(filepath, csv_path)
                 
                 if success:
+                    report_registry.remember(csv_path, report)
+                    pipeline_ledger.record(csv_filename, 'converted', source=filename, location=self.location,
+                                           report_type=report.name)
                     print(f"  ✓ Converted successfully! ({result} rows)")
                     print(f"  ✓ Dashboard will use: {csv_filename}")
-                else:
-                    print(f"  ✗ Conversion failed: {result}")
+                    print()
+                    return csv_path
+                print(f"  ✗ Conversion failed: {result}")
             else:
                 print(f"  ℹ Skipping .xls file (only .xlsx auto-conversion supported)")
                 print(f"  ℹ Please save as .xlsx or manually convert to CSV")
@@ -147,6 +156,28 @@ class DataFileHandler(FileSystemEventHandler):
         except Exception as e:
             print(f"  ✗ Error processing file: {e}")
             print()
+        return None
+
+def location_dirs():
+    """Location -> (datasheets dir to watch, archive dir) for every store"""
+    dirs = {}
+    for location, datasheets_dir in locations.get_locations().items():
+        if location == locations.DEFAULT_LOCATION:
+            dirs[location] = (WATCH_DIR, ARCHIVE_DIR)
+        else:
+            dirs[location] = (datasheets_dir, locations.archive_dir(location))
+    return dirs
+
+def watch_locations(observer, watched):
+    """Schedule a handler for every location not yet being watched"""
+    for location, (watch_dir, archive_dir) in location_dirs().items():
+        if location in watched:
+            continue
+        os.makedirs(watch_dir, exist_ok=True)
+        os.makedirs(archive_dir, exist_ok=True)
+        observer.schedule(DataFileHandler(location, watch_dir, archive_dir), watch_dir, recursive=False)
+        watched.add(location)
+        print(f"  👀 {locations.display_name(location)}: {watch_dir}")
 
 def main():
     """Main file watcher loop"""
@@ -155,34 +186,36 @@ def main():
     print("=" * 70)
     print(f"Watching directory: {WATCH_DIR}")
     print(f"Archive directory: {ARCHIVE_DIR}")
+    print(f"Other stores: {locations.LOCATIONS_DIR}/<store>/datasheets")
     print()
     print("📥 Drop your Excel files (.xlsx) into the datasheets folder")
     print("⚙️  They will be automatically converted to CSV")
     print("🎯 Supported files:")
-    print("   • Shop Schedule / Feb Shop Report → Scheduled Shop Jobs CSV")
-    print("   • Gross Profit / Feb Gross Profit → Sales and Gross CSV")
-    print("   • Open Back Orders / Open ROs → Open Back Orders CSV")
+    for report in report_registry.REPORT_TYPES:
+        if report.convert_excel:
+            print(f"   • {' / '.join(report.patterns + report.aliases)} → {report.label} CSV")
     print()
     print("Press Ctrl+C to stop")
     print("=" * 70)
     print()
     
-    # Create directories if they don't exist
-    os.makedirs(WATCH_DIR, exist_ok=True)
-    os.makedirs(ARCHIVE_DIR, exist_ok=True)
-    
-    # Set up file system observer
-    event_handler = DataFileHandler()
+    # Set up one handler per location (directories are created if they don't exist)
     observer = Observer()
-    observer.schedule(event_handler, WATCH_DIR, recursive=False)
+    watched = set()
+    watch_locations(observer, watched)
     observer.start()
     
     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 👀 Watching for new files...")
     print()
     
     try:
+        last_scan = time.time()
         while True:
             time.sleep(1)
+            # Pick up stores added while the watcher is running
+            if time.time() - last_scan >= LOCATION_SCAN_INTERVAL:
+                watch_locations(observer, watched)
+                last_scan = time.time()
     except KeyboardInterrupt:
         print("\n\n🛑 Stopping file watcher...")
         observer.stop()
@@ -2,80 +2,239 @@
 """
 Excel File Repair Utility
 Fixes corrupted Excel files by extracting data and creating clean copies
+
+Usage:
+    python fix_excel.py <input_file> [output_file]
+    python fix_excel.py --batch <folder or glob> [...] [--workers N] [--out-dir DIR] [--verbose]
+
+An .xlsx is first repaired by replacing xl/styles.xml (where export corruption
+lives) and copying every other member still compressed, so all sheets are kept
+and nothing is decoded; pandas re-saves are the fallback.
+
+Batch mode repairs every .xlsx/.xls matched, several files at a time, and
+prints a summary table (e.g. a week of exports with corrupt styles:
+python fix_excel.py --batch "archive/2026-02-*").
 """
 import sys
 import os
-from zipfile import ZipFile
+import io
+import re
+import glob
+import time
+import copy
+import struct
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from zipfile import ZipFile, ZIP_DEFLATED
+import xml.etree.ElementTree as ET
 import pandas as pd
+from openpyxl import load_workbook
 import warnings
 warnings.filterwarnings('ignore')
 
+import excel_engines
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+def default_output(input_file, out_dir=None):
+    """<name>_fixed.xlsx next to the input (or in out_dir); .xls inputs are saved as .xlsx"""
+    base, ext = os.path.splitext(input_file)
+    if out_dir:
+        base = os.path.join(out_dir, os.path.basename(base))
+    return f"{base}_fixed{'.xlsx' if ext.lower() == '.xls' else ext}"
+
+STYLES_MEMBER = 'xl/styles.xml'
+SHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+# Used when the broken styles.xml doesn't say how many cell formats it had
+FALLBACK_XF_COUNT = 1024
+
+_ATTRIBUTE = re.compile(r'([\w:]+)\s*=\s*("[^"]*"|\'[^\']*\')')
+
+def _attributes(tag):
+    return {name: value[1:-1] for name, value in _ATTRIBUTE.findall(tag)}
+
+def salvage_styles(raw):
+    """
+    What can be recovered from a broken styles.xml, by pattern rather than XML parsing:
+    custom number formats, the number format of each cell format (cellXfs), and
+    how many differential formats (dxfs, used by conditional formatting) it had
+    """
+    text = raw.decode('utf-8', errors='replace')
+    number_formats = {}
+    for tag in re.findall(r'<(?:\w+:)?numFmt\b[^>]*>', text):
+        attributes = _attributes(tag)
+        if attributes.get('numFmtId', '').isdigit() and 'formatCode' in attributes:
+            number_formats[int(attributes['numFmtId'])] = attributes['formatCode']
+
+    xf_formats = []
+    cell_xfs = re.search(r'<(?:\w+:)?cellXfs\b([^>]*)>(.*?)(?:</(?:\w+:)?cellXfs>|$)', text, re.S)
+    if cell_xfs:
+        for tag in re.findall(r'<(?:\w+:)?xf\b[^>]*>', cell_xfs.group(2)):
+            number_format = _attributes(tag).get('numFmtId', '0')
+            number_format = int(number_format) if number_format.isdigit() else 0
+            # Built-in formats are < 164; a custom one must have survived to be kept
+            xf_formats.append(number_format if number_format < 164 or number_format in number_formats else 0)
+        count = _attributes(cell_xfs.group(1)).get('count', '')
+        if count.isdigit():
+            xf_formats += [0] * (int(count) - len(xf_formats))
+    if not xf_formats:
+        xf_formats = [0] * FALLBACK_XF_COUNT
+
+    dxf_count = len(re.findall(r'<(?:\w+:)?dxf\b', text))
+    return number_formats, xf_formats, dxf_count
+
+def build_styles(number_formats, xf_formats, dxf_count):
+    """A minimal, valid styles.xml: one font/fill/border, and every cell format kept with its number format"""
+    used = sorted({n for n in xf_formats if n in number_formats})
+    parts = [f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<styleSheet xmlns="{SHEET_NS}">']
+    if used:
+        parts.append(f'<numFmts count="{len(used)}">')
+        parts += [f'<numFmt numFmtId="{n}" formatCode="{number_formats[n]}"/>' for n in used]
+        parts.append('</numFmts>')
+    parts.append('<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>')
+    parts.append('<fills count="2"><fill><patternFill patternType="none"/></fill>'
+                 '<fill><patternFill patternType="gray125"/></fill></fills>')
+    parts.append('<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>')
+    parts.append('<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>')
+    parts.append(f'<cellXfs count="{len(xf_formats)}">')
+    for n in xf_formats:
+        apply = ' applyNumberFormat="1"' if n else ''
+        parts.append(f'<xf numFmtId="{n}" fontId="0" fillId="0" borderId="0" xfId="0"{apply}/>')
+    parts.append('</cellXfs>')
+    parts.append('<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>')
+    parts.append(f'<dxfs count="{dxf_count}">' + '<dxf/>' * dxf_count + '</dxfs>')
+    parts.append('</styleSheet>')
+    return ''.join(parts).encode('utf-8')
+
+def copy_member_raw(zin, info, out):
+    """Copy one member's local header, compressed data and data descriptor byte for byte"""
+    zin.fp.seek(info.header_offset)
+    header = zin.fp.read(30)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    record = header + zin.fp.read(name_length + extra_length + info.compress_size)
+    if info.flag_bits & 0x08:
+        # Sizes follow the data: CRC + sizes, with an optional signature, 8-byte sizes for zip64
+        descriptor = zin.fp.read(4)
+        size = 12 if descriptor != b'PK\x07\x08' else 16
+        if info.file_size >= 0xFFFFFFFF or info.compress_size >= 0xFFFFFFFF:
+            size += 8
+        record += descriptor + zin.fp.read(size - 4)
+    copied = copy.copy(info)
+    copied.header_offset = out.tell()
+    out.write(record)
+    return copied
+
+def restyle_xlsx(input_file, output_file):
+    """
+    Replace a broken xl/styles.xml with a minimal valid one (cell formats reset,
+    number formats kept so dates stay dates) and copy every other member -
+    all sheets included - still compressed, without decoding it
+    """
+    with ZipFile(input_file, 'r') as zin:
+        members = zin.infolist()
+        styles = zin.read(STYLES_MEMBER) if STYLES_MEMBER in zin.NameToInfo else b''
+        new_styles = build_styles(*salvage_styles(styles))
+
+        temp_file = f"{output_file}.tmp"
+        try:
+            with open(temp_file, 'wb') as out:
+                zout = ZipFile(out, 'w')
+                for info in members:
+                    if info.filename == STYLES_MEMBER:
+                        continue
+                    copied = copy_member_raw(zin, info, out)
+                    zout.filelist.append(copied)
+                    zout.NameToInfo[copied.filename] = copied
+                # Raw copies bypass ZipFile, so tell it where its own writes start
+                zout.start_dir = out.tell()
+                zout.writestr(STYLES_MEMBER, new_styles, compress_type=ZIP_DEFLATED)
+                zout.close()
+        except Exception:
+            os.remove(temp_file)
+            raise
+    os.replace(temp_file, output_file)
+    print(f"    ✓ Rewrote {STYLES_MEMBER} ({len(styles)} → {len(new_styles)} bytes), "
+          f"copied {len(members) - (1 if styles else 0)} other members as-is")
+
+def check_sheets_xml(xlsx_file):
+    """
+    Stream-parse every worksheet (and the shared strings) of an .xlsx, so a
+    restyled copy isn't reported as repaired while a sheet is still corrupt
+    """
+    with ZipFile(xlsx_file, 'r') as z:
+        for name in z.namelist():
+            if (name.startswith('xl/worksheets/') and name.endswith('.xml')) or name == 'xl/sharedStrings.xml':
+                with z.open(name) as f:
+                    for _, element in ET.iterparse(f):
+                        element.clear()
+
+def save_with_pandas(input_file, output_file, engine):
+    """Read with one pandas engine and write clean CSV and Excel copies"""
+    df = pd.read_excel(input_file, engine=engine)
+
+    # Save as CSV first (safer)
+    csv_file = os.path.splitext(output_file)[0] + '.csv'
+    df.to_csv(csv_file, index=False)
+    print(f"    ✓ Saved as CSV: {csv_file}")
+
+    # Then save as Excel
+    df.to_excel(output_file, index=False, engine='openpyxl')
+    print(f"    ✓ Saved as Excel: {output_file}")
+
 def fix_xlsx_file(input_file, output_file=None):
     """
     Attempt to fix a corrupted .xlsx file
+    Returns the name of the method that worked, or None
     """
     if output_file is None:
-        base, ext = os.path.splitext(input_file)
-        output_file = f"{base}_fixed{ext}"
-    
+        output_file = default_output(input_file)
+
     print(f"Attempting to repair: {input_file}")
-    
+    is_xls = input_file.lower().endswith('.xls')
+
     try:
         # Method 1: Try reading with xlrd (for older formats)
-        print("  Method 1: Trying xlrd...")
-        try:
-            df = pd.read_excel(input_file, engine='xlrd')
-            df.to_excel(output_file, index=False, engine='openpyxl')
-            print(f"  ✓ Success! Saved to: {output_file}")
-            return True
-        except:
-            print("    Failed with xlrd")
-        
-        # Method 2: Try extracting raw XML data
-        print("  Method 2: Trying raw XML extraction...")
-        try:
-            import zipfile
-            from lxml import etree
-            
-            # Extract workbook.xml
-            with zipfile.ZipFile(input_file, 'r') as zip_ref:
-                # Try to read the workbook
-                with zip_ref.open('xl/workbook.xml') as f:
-                    workbook_xml = f.read()
-                
-                # Try to read worksheets
-                with zip_ref.open('xl/worksheets/sheet1.xml') as f:
-                    sheet_xml = f.read()
-            
-            print("    Successfully extracted XML data")
-            print("    Manual inspection required - check xl/workbook.xml and xl/worksheets/*.xml")
-            
-        except Exception as e:
-            print(f"    Failed: {e}")
-        
-        # Method 3: Try pandas with different engines
+        if is_xls:
+            print("  Method 1: Trying xlrd...")
+            try:
+                save_with_pandas(input_file, output_file, 'xlrd')
+                print(f"  ✓ Success! Saved to: {output_file}")
+                return 'xlrd'
+            except Exception:
+                print("    Failed with xlrd")
+
+        # Method 2: Replace the styles without decoding the sheets (about the cost of a file copy)
+        if not is_xls:
+            print("  Method 2: Rewriting styles without decoding the sheets...")
+            try:
+                restyle_xlsx(input_file, output_file)
+                # Opening read-only loads the workbook and styles but not the sheet data,
+                # so the sheets' XML is checked separately
+                load_workbook(output_file, read_only=True).close()
+                check_sheets_xml(output_file)
+                print(f"  ✓ Success! Saved to: {output_file} (all sheets kept, cell formatting reset)")
+                return 'restyle'
+            except Exception as e:
+                print(f"    Failed: {str(e)[:100]}")
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+
+        # Method 3: Try pandas with different engines (fastest first, each tried once)
         print("  Method 3: Trying different pandas engines...")
-        for engine in ['openpyxl', 'xlrd', None]:
+        ext = os.path.splitext(input_file)[1].lower()
+        for engine in excel_engines.ENGINES.get(ext, ('calamine', 'openpyxl', 'xlrd')):
+            if engine == 'xlrd' and is_xls:
+                continue  # already tried as method 1
             try:
                 print(f"    Trying engine: {engine}")
-                if engine:
-                    df = pd.read_excel(input_file, engine=engine)
-                else:
-                    df = pd.read_excel(input_file)
-                
-                # Save as CSV first (safer)
-                csv_file = output_file.replace('.xlsx', '.csv').replace('.xls', '.csv')
-                df.to_csv(csv_file, index=False)
-                print(f"    ✓ Saved as CSV: {csv_file}")
-                
-                # Then save as Excel
-                df.to_excel(output_file, index=False, engine='openpyxl')
-                print(f"    ✓ Saved as Excel: {output_file}")
-                return True
-                
+                save_with_pandas(input_file, output_file, engine)
+                return engine
+
             except Exception as e:
                 print(f"      Failed with {engine}: {str(e)[:100]}")
-        
+
         print("\n  ✗ All automated repair methods failed.")
         print("\n  Manual steps required:")
         print("    1. Open the file in Microsoft Excel or LibreOffice")
@@ -84,29 +243,116 @@ def fix_xlsx_file(input_file, output_file=None):
         print("    4. Create new workbook")
         print("    5. Paste (Ctrl+V)")
         print(f"    6. Save as: {output_file}")
-        
-        return False
-        
+
+        return None
+
     except Exception as e:
         print(f"  ✗ Unexpected error: {e}")
         import traceback
         traceback.print_exc()
-        return False
+        return None
+
+def find_workbooks(patterns):
+    """Excel files in the given folders and glob patterns (earlier repair outputs are skipped)"""
+    files = []
+    for pattern in patterns:
+        matches = [pattern] if os.path.isfile(pattern) else glob.glob(pattern)
+        for match in matches:
+            if os.path.isdir(match):
+                files += [os.path.join(match, f) for f in os.listdir(match)]
+            else:
+                files.append(match)
+    return sorted({
+        f for f in files
+        if f.lower().endswith(EXCEL_EXTENSIONS) and not os.path.splitext(f)[0].endswith('_fixed')
+    })
+
+def repair_quietly(input_file, output_file):
+    """Runs in a pool process: repair one file, capturing its log for --verbose"""
+    log = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        method = fix_xlsx_file(input_file, output_file)
+    return method, time.perf_counter() - started, log.getvalue()
+
+def repair_batch(patterns, workers=DEFAULT_WORKERS, out_dir=None, verbose=False):
+    """Repair every matched workbook in a process pool and print a summary; returns the number that failed"""
+    files = find_workbooks(patterns)
+    if not files:
+        print(f"No .xlsx/.xls files found in: {', '.join(patterns)}")
+        return 1
+    # Same-named files from different folders (or x.xls next to x.xlsx) would overwrite each other's output
+    inputs_by_output = {}
+    for f in files:
+        inputs_by_output.setdefault(os.path.abspath(default_output(f, out_dir)), []).append(f)
+    collisions = {output: inputs for output, inputs in inputs_by_output.items() if len(inputs) > 1}
+    if collisions:
+        for output, inputs in sorted(collisions.items()):
+            print(f"✗ {', '.join(inputs)} would be written to the same file, {output}")
+        print("Nothing repaired - repair these separately or with different --out-dir folders")
+        return len(files)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    print(f"Repairing {len(files)} file(s) with {workers} worker(s)...")
+    started = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(repair_quietly, f, default_output(f, out_dir)): f for f in files}
+        for future in as_completed(futures):
+            input_file = futures[future]
+            try:
+                results[input_file] = future.result()
+            except Exception as e:
+                results[input_file] = (None, 0.0, f"  ✗ Repair process failed: {e}\n")
+            if verbose:
+                print(results[input_file][2])
+
+    width = max(len(os.path.basename(f)) for f in files)
+    print()
+    print(f"{'file':<{width}}  {'result':<12} {'time':>8}  output")
+    print('-' * (width + 40))
+    failed = 0
+    for input_file in files:
+        method, seconds, _ = results[input_file]
+        if method:
+            output = default_output(input_file, out_dir)
+            print(f"{os.path.basename(input_file):<{width}}  {method:<12} {seconds:>7.2f}s  {output}")
+        else:
+            failed += 1
+            print(f"{os.path.basename(input_file):<{width}}  {'FAILED':<12} {seconds:>7.2f}s  -")
+    print('-' * (width + 40))
+    print(f"{len(files) - failed} repaired, {failed} failed in {time.perf_counter() - started:.1f}s"
+          + ("" if verbose or not failed else " (--verbose shows why)"))
+    return failed
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        parser = argparse.ArgumentParser(prog='fix_excel.py --batch', description='Repair many Excel files at once')
+        parser.add_argument('paths', nargs='+', help='folders, files or glob patterns')
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                            help=f'files repaired at once (default: {DEFAULT_WORKERS})')
+        parser.add_argument('--out-dir', help='write repaired copies here instead of next to each file')
+        parser.add_argument('--verbose', action='store_true', help="print each file's repair log")
+        args = parser.parse_args(sys.argv[2:])
+        failed = repair_batch(args.paths, max(1, args.workers), args.out_dir, args.verbose)
+        sys.exit(0 if failed == 0 else 1)
+
     if len(sys.argv) < 2:
         print("Usage: python fix_excel.py <input_file> [output_file]")
+        print("       python fix_excel.py --batch <folder or glob> [...] [--workers N] [--out-dir DIR] [--verbose]")
         print("\nExample:")
         print("  python fix_excel.py 'Shop Schedule - 5 Day - 1-15-26.xlsx'")
+        print("  python fix_excel.py --batch 'archive/2026-02-*'")
         sys.exit(1)
-    
+
     input_file = sys.argv[1]
     output_file = sys.argv[2] if len(sys.argv) > 2 else None
-    
+
     if not os.path.exists(input_file):
         print(f"Error: File not found: {input_file}")
         sys.exit(1)
-    
+
     success = fix_xlsx_file(input_file, output_file)
     sys.exit(0 if success else 1)
 
@@ -3,6 +3,10 @@
 Google Drive Sync for Steensma Shop Manager
 Watches a Google Drive folder for files and syncs them to ~/shopmgr/datasheets/
 Works in conjunction with file_watcher.py for automatic processing
+(ingest_service.py does the work of both in one process)
+
+Each additional store (locations/<store>/datasheets, see locations.py) is fed
+from its own Drive subfolder, GDRIVE_FOLDER/<store>, with its own state file.
 
 Usage:
     ./gdrive_sync.py
@@ -17,6 +21,10 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+import locations
+import pipeline_ledger
+import report_registry
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -30,6 +38,15 @@ LOG_FILE = "/home/ubuntu/shopmgr/gdrive_sync.log"
 # ============================================================================
 # Logging
 # ============================================================================
+_log_handle = None
+
+def _get_log_handle():
+    """Open the log file once and keep it open (line-buffered) for the process lifetime"""
+    global _log_handle
+    if _log_handle is None:
+        _log_handle = open(LOG_FILE, 'a', buffering=1)
+    return _log_handle
+
 def log(message, also_print=True):
     """Log a message to file and optionally print it"""
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -39,28 +56,33 @@ def log(message, also_print=True):
         print(log_msg)
     
     try:
-        with open(LOG_FILE, 'a') as f:
-            f.write(log_msg + '\n')
+        _get_log_handle().write(log_msg + '\n')
     except:
         pass
 
 # ============================================================================
 # State Management
 # ============================================================================
-def load_state():
+def state_file_for(location):
+    """Each location remembers its own Drive listing"""
+    if location == locations.DEFAULT_LOCATION:
+        return STATE_FILE
+    return os.path.join(os.path.dirname(STATE_FILE), f".gdrive_sync_state.{location}.json")
+
+def load_state(state_file=STATE_FILE):
     """Load the last known state of files in Google Drive"""
-    if os.path.exists(STATE_FILE):
+    if os.path.exists(state_file):
         try:
-            with open(STATE_FILE, 'r') as f:
+            with open(state_file, 'r') as f:
                 return json.load(f)
         except:
             return {}
     return {}
 
-def save_state(state):
+def save_state(state, state_file=STATE_FILE):
     """Save the current state of files in Google Drive"""
     try:
-        with open(STATE_FILE, 'w') as f:
+        with open(state_file, 'w') as f:
             json.dump(state, f, indent=2)
     except Exception as e:
         log(f"Error saving state: {e}")
@@ -68,12 +90,12 @@ def save_state(state):
 # ============================================================================
 # Google Drive Functions
 # ============================================================================
-def list_gdrive_files():
+def list_gdrive_files(folder=GDRIVE_FOLDER):
     """List all files in the Google Drive folder"""
     try:
         cmd = [
             "rclone", "lsjson",
-            f"{GDRIVE_REMOTE}{GDRIVE_FOLDER}",
+            f"{GDRIVE_REMOTE}{folder}",
             "--files-only"
         ]
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
@@ -92,18 +114,18 @@ def list_gdrive_files():
         log(f"Exception listing GDrive files: {e}", also_print=False)
         return None
 
-def copy_file_from_gdrive(filename):
+def copy_file_from_gdrive(filename, folder=GDRIVE_FOLDER, local_dir=LOCAL_DIR):
     """Copy a file from Google Drive to local datasheets folder"""
     try:
-        remote_path = f"{GDRIVE_REMOTE}{GDRIVE_FOLDER}/{filename}"
-        local_path = os.path.join(LOCAL_DIR, filename)
+        remote_path = f"{GDRIVE_REMOTE}{folder}/{filename}"
+        local_path = os.path.join(local_dir, filename)
         
         log(f"📥 Downloading: {filename}")
         
         cmd = [
             "rclone", "copy",
             remote_path,
-            LOCAL_DIR,
+            local_dir,
             "-v"
         ]
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
@@ -121,10 +143,10 @@ def copy_file_from_gdrive(filename):
         log(f"✗ Error downloading {filename}: {e}")
         return False
 
-def delete_from_gdrive(filename):
+def delete_from_gdrive(filename, folder=GDRIVE_FOLDER):
     """Delete a file from Google Drive after successful processing"""
     try:
-        remote_path = f"{GDRIVE_REMOTE}{GDRIVE_FOLDER}/{filename}"
+        remote_path = f"{GDRIVE_REMOTE}{folder}/{filename}"
         
         cmd = ["rclone", "delete", remote_path]
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
@@ -144,33 +166,32 @@ def delete_from_gdrive(filename):
 # ============================================================================
 
 # ============================================================================
-# REPORT NAME FILTERS - Only download these 6 report types
+# REPORT FILTER - Only download the synced report types in report_registry.py
 # ============================================================================
-ALLOWED_REPORTS = [
-    "No Bins",
-    "Open Back Orders",
-    "PO Over 30",
-    "Sales and Gross",
-    "Scheduled Shop Jobs",
-    "Site Lead"
-]
+def synced_report(filename):
+    """Report type a Drive file belongs to, or None if it isn't a report we sync"""
+    report = report_registry.match_filename(filename, aliases=True)
+    return report if report and report.synced else None
 
-def is_allowed_report(filename):
-    """Check if filename matches one of the 6 allowed report types"""
-    # Check if any of the allowed report names are in the filename
-    for report_name in ALLOWED_REPORTS:
-        if report_name in filename:
-            return True
-    return False
+def sync_targets():
+    """(location, Drive folder, local datasheets dir) for every store"""
+    targets = []
+    for location, datasheets_dir in locations.get_locations().items():
+        if location == locations.DEFAULT_LOCATION:
+            targets.append((location, GDRIVE_FOLDER, LOCAL_DIR))
+        else:
+            targets.append((location, locations.gdrive_folder(location, GDRIVE_FOLDER), datasheets_dir))
+    return targets
 
-def check_for_new_files():
+def check_for_new_files(location=locations.DEFAULT_LOCATION, folder=GDRIVE_FOLDER, local_dir=LOCAL_DIR):
     """Check Google Drive for new or modified files"""
-    current_files = list_gdrive_files()
+    current_files = list_gdrive_files(folder)
     
     if current_files is None:
         return  # Error occurred, skip this check
     
-    previous_state = load_state()
+    state_file = state_file_for(location)
+    previous_state = load_state(state_file)
     new_or_modified = []
     
     # Find new or modified files
@@ -179,8 +200,8 @@ def check_for_new_files():
         if not filename.endswith(('.txt', '.xlsx', '.xls', '.csv')):
             continue
         
-        # Filter: Only download the 6 specific report types
-        if not is_allowed_report(filename):
+        # Filter: Only download the synced report types
+        if not synced_report(filename):
             continue
             
         if filename not in previous_state:
@@ -192,19 +213,28 @@ def check_for_new_files():
     
     # Process each new/modified file
     for filename in new_or_modified:
-        log(f"🔔 New file detected in Google Drive: {filename}")
+        log(f"🔔 New file detected in Google Drive ({location}): {filename}")
+        pipeline_ledger.record(
+            filename, 'sync_detected', location=location, report_type=synced_report(filename).name,
+            drive_modtime=pipeline_ledger.parse_drive_time(current_files[filename])
+        )
         
-        if copy_file_from_gdrive(filename):
+        if copy_file_from_gdrive(filename, folder, local_dir):
+            # Classify the downloaded copy by content too, in case the export was misnamed
+            report = report_registry.classify(os.path.join(local_dir, filename), aliases=True, record=True)
+            pipeline_ledger.record(filename, 'sync_downloaded', location=location,
+                                   report_type=report.name if report else None)
+            
             # Give the file watcher time to process
             time.sleep(5)
             
             # Optionally delete from GDrive after successful download
             # Uncomment the next line if you want to auto-delete after sync
-            # delete_from_gdrive(filename)
+            # delete_from_gdrive(filename, folder)
     
     # Update state
     if new_or_modified:
-        save_state(current_files)
+        save_state(current_files, state_file)
 
 def verify_setup():
     """Verify that rclone and Google Drive are properly configured"""
@@ -263,6 +293,8 @@ def main():
     print("=" * 70)
     print(f"Google Drive: {GDRIVE_REMOTE}{GDRIVE_FOLDER}")
     print(f"Local Directory: {LOCAL_DIR}")
+    for location, folder, local_dir in sync_targets()[1:]:
+        print(f"  {locations.display_name(location)}: {GDRIVE_REMOTE}{folder} → {local_dir}")
     print(f"Check Interval: {CHECK_INTERVAL} seconds")
     print()
     
@@ -286,7 +318,9 @@ def main():
     
     try:
         while True:
-            check_for_new_files()
+            # Stores are re-listed every pass so a new locations/<store> folder is picked up
+            for location, folder, local_dir in sync_targets():
+                check_for_new_files(location, folder, local_dir)
             time.sleep(CHECK_INTERVAL)
             
     except KeyboardInterrupt:
@@ -0,0 +1,52 @@
+"""
+Gunicorn configuration for Steensma Shop Manager
+Usage: gunicorn -c gunicorn.conf.py app:app
+"""
+import gc
+import os
+import time
+import shutil
+
+bind = '0.0.0.0:5001'
+workers = int(os.environ.get('SHOPMGR_WORKERS', 4))
+
+# Import the app and parse every current report once in the master, then fork.
+# Workers share the warm parse cache (and pandas) copy-on-write instead of each
+# paying the full cold parse on their first request. SHOPMGR_PRELOAD=0 disables it.
+preload_app = os.environ.get('SHOPMGR_PRELOAD', '1') != '0'
+
+# Each worker writes its metrics here so /metrics can aggregate across all of them.
+# Must be set before app.py (and prometheus_client) is imported in the workers.
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.prometheus_multiproc')
+)
+# With preload_app the master imports app.py (and creates metric files) before on_starting runs
+os.makedirs(metrics_dir, exist_ok=True)
+
+def on_starting(server):
+    """Clear metric files left behind by the previous run"""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+def when_ready(server):
+    """With preload on, fill the parse cache in the master before any worker forks"""
+    if not preload_app:
+        return
+    import app
+    started = time.perf_counter()
+    try:
+        parsed = app.warm_cache()
+    except Exception as e:
+        server.log.warning(f"Warm-up parse failed, workers will parse on demand: {e}")
+        return
+    # Keep the warm objects out of the collector so worker GC passes
+    # do not write to (and un-share) their pages
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Preloaded {parsed} report parses in {time.perf_counter() - started:.2f}s")
+
+def child_exit(server, worker):
+    """Drop live gauges (e.g. worker RSS) for workers that have exited"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Ingest Service for Steensma Shop Manager
+One asyncio process doing the work of gdrive_sync.py and file_watcher.py
+(both still run on their own, e.g. to roll back). A report moves through
+stages joined by bounded queues:
+
+    poll Drive -> download -> classify -> convert (Excel) -> parse
+                              ^ files dropped in by hand join here
+
+Each stage runs STAGE_TASKS tasks. When a queue is full the stage feeding it
+waits, so a slow parse holds back downloads instead of piling up work. No
+stage sleeps to give another process time: a download goes straight on to
+classify, and the parse stage fills the parse store (see parse_store.py), so
+app workers load the new report instead of parsing it.
+
+Parsing needs pandas and the parsers from app.py, so it runs in a separate
+process that is started on demand and exits after PARSE_IDLE_SECONDS idle.
+
+Usage:
+    ./ingest_service.py
+"""
+import os
+import json
+import time
+import signal
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+import file_watcher
+import gdrive_sync
+import locations
+import parse_store
+import pipeline_ledger
+import report_registry
+from gdrive_sync import log
+
+POLL_SECONDS = int(os.environ.get('SHOPMGR_INGEST_POLL_SECONDS', gdrive_sync.CHECK_INTERVAL))
+# Items each queue holds before the stage feeding it waits
+QUEUE_SIZE = int(os.environ.get('SHOPMGR_INGEST_QUEUE', '16'))
+# Tasks per stage: downloads wait on the network, classify and convert on disk,
+# and the parse process parses one report at a time
+STAGE_TASKS = {'download': 2, 'classify': 2, 'convert': 1, 'parse': 1}
+# A file dropped in by hand is taken once its size and mtime hold still this long
+SETTLE_SECONDS = 1
+PARSE_IDLE_SECONDS = 120
+
+REPORT_EXTENSIONS = ('.txt', '.xlsx', '.xls', '.csv')
+
+
+@dataclass
+class Arrival:
+    """A report file that landed in a location's datasheets folder"""
+    location: str
+    path: str
+    source: str           # 'drive' or 'local'
+    report: object = None  # report_registry.ReportType, set by classify
+
+
+def parse_latest(location, report_name):
+    """Runs in the parse process"""
+    import app  # pandas, Flask and the parsers only load in the parse process
+    return app.parse_latest(location, report_name)
+
+
+async def rclone(*args, timeout):
+    """Run rclone without blocking the loop; (returncode, stdout, stderr), or None on timeout"""
+    process = await asyncio.create_subprocess_exec(
+        'rclone', *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None
+    return process.returncode, stdout.decode('utf-8', 'replace'), stderr.decode('utf-8', 'replace')
+
+
+class DropHandler(FileSystemEventHandler):
+    """Hands files created in (or moved into) a datasheets folder to the event loop"""
+
+    def __init__(self, service, location):
+        super().__init__()
+        self.service = service
+        self.location = location
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.service.loop.call_soon_threadsafe(self.service.dropped, self.location, event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.service.loop.call_soon_threadsafe(self.service.dropped, self.location, event.dest_path)
+
+
+class IngestService:
+    def __init__(self, loop):
+        self.loop = loop
+        self.downloads = asyncio.Queue(QUEUE_SIZE)
+        self.arrivals = asyncio.Queue(QUEUE_SIZE)
+        self.conversions = asyncio.Queue(QUEUE_SIZE)
+        self.parses = asyncio.Queue(QUEUE_SIZE)
+        # (location, filename, Drive ModTime) queued or downloading
+        self.pending_downloads = set()
+        # Paths dropped in by hand and not yet classified
+        self.pending_drops = set()
+        # (location, report name) waiting to be parsed; one parse covers any number of uploads
+        self.pending_parses = set()
+        # Path -> (mtime_ns, size) of files this service wrote, or None while it is writing them,
+        # so their watchdog events aren't taken for hand drops
+        self.written = {}
+        self.parse_pool = None
+        self.tasks = set()
+
+    # ------------------------------------------------------------------
+    # Stage plumbing
+    # ------------------------------------------------------------------
+    def start(self, coroutine):
+        task = self.loop.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def run_stage(self, name, queue, handle, idle=None, on_idle=None):
+        """Take items off a queue and handle them one at a time; errors are logged, not fatal"""
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), idle)
+            except asyncio.TimeoutError:
+                on_idle()
+                continue
+            try:
+                await handle(item)
+            except Exception as e:
+                log(f"✗ {name} failed for {item}: {e}")
+            finally:
+                queue.task_done()
+
+    def writing(self, path):
+        self.written[path] = None
+
+    def wrote(self, path):
+        try:
+            stat = os.stat(path)
+            self.written[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            self.written.pop(path, None)
+
+    def wrote_it(self, path):
+        if path not in self.written:
+            return False
+        if self.written[path] is None:
+            return True
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True
+        return self.written[path] == (stat.st_mtime_ns, stat.st_size)
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+    async def poll_drive(self):
+        """List every store's Drive folder each POLL_SECONDS and queue new or modified reports"""
+        while True:
+            # Stores are re-listed every pass so a new locations/<store> folder is picked up
+            for location, folder, local_dir in gdrive_sync.sync_targets():
+                try:
+                    await self.check_drive(location, folder, local_dir)
+                except Exception as e:
+                    log(f"Exception listing GDrive files ({location}): {e}", also_print=False)
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def check_drive(self, location, folder, local_dir):
+        listed = await rclone('lsjson', f"{gdrive_sync.GDRIVE_REMOTE}{folder}", '--files-only', timeout=30)
+        if listed is None:
+            log("Timeout listing GDrive files", also_print=False)
+            return
+        returncode, stdout, stderr = listed
+        if returncode != 0:
+            log(f"Error listing GDrive files: {stderr}", also_print=False)
+            return
+
+        state = gdrive_sync.load_state(gdrive_sync.state_file_for(location))
+        for entry in json.loads(stdout):
+            filename, mod_time = entry['Name'], entry['ModTime']
+            if not filename.endswith(REPORT_EXTENSIONS):
+                continue
+            report = gdrive_sync.synced_report(filename)
+            pending = (location, filename, mod_time)
+            if not report or state.get(filename) == mod_time or pending in self.pending_downloads:
+                continue
+            log(f"🔔 New file detected in Google Drive ({location}): {filename}")
+            pipeline_ledger.record(
+                filename, 'sync_detected', location=location, report_type=report.name,
+                drive_modtime=pipeline_ledger.parse_drive_time(mod_time)
+            )
+            self.pending_downloads.add(pending)
+            await self.downloads.put((location, folder, local_dir, filename, mod_time))
+
+    async def download(self, item):
+        location, folder, local_dir, filename, mod_time = item
+        local_path = os.path.join(local_dir, filename)
+        try:
+            log(f"📥 Downloading: {filename}")
+            self.writing(local_path)
+            copied = await rclone('copy', f"{gdrive_sync.GDRIVE_REMOTE}{folder}/{filename}", local_dir, '-v',
+                                  timeout=120)
+            self.wrote(local_path)
+            if copied is None:
+                log(f"✗ Timeout downloading: {filename}")
+                return
+            if copied[0] != 0 or not os.path.exists(local_path):
+                log(f"✗ Download failed: {copied[2]}")
+                return
+            log(f"✓ Downloaded successfully: {filename}")
+
+            # Only a finished download is remembered, so a failed one is retried on the next poll
+            state_file = gdrive_sync.state_file_for(location)
+            state = gdrive_sync.load_state(state_file)
+            state[filename] = mod_time
+            gdrive_sync.save_state(state, state_file)
+        finally:
+            self.pending_downloads.discard((location, filename, mod_time))
+        await self.arrivals.put(Arrival(location, local_path, 'drive'))
+
+    def dropped(self, location, path):
+        """A file appeared in a datasheets folder (called on the loop by DropHandler)"""
+        name = os.path.basename(path)
+        if name.startswith('.') or name.endswith(('.partial', '.tmp')) or not name.endswith(REPORT_EXTENSIONS):
+            return
+        if self.wrote_it(path) or path in self.pending_drops:
+            return
+        self.pending_drops.add(path)
+        self.start(self.arrivals.put(Arrival(location, path, 'local')))
+
+    async def settle(self, path):
+        """Wait until a file dropped in by hand has stopped changing"""
+        previous = None
+        while True:
+            stat = os.stat(path)
+            current = (stat.st_mtime_ns, stat.st_size)
+            if current == previous:
+                return
+            previous = current
+            await asyncio.sleep(SETTLE_SECONDS)
+
+    async def classify(self, arrival):
+        try:
+            if arrival.source == 'local':
+                await self.settle(arrival.path)
+            # By content too, in case the export was misnamed
+            arrival.report = await asyncio.to_thread(report_registry.classify, arrival.path, aliases=True,
+                                                       record=True)
+        finally:
+            self.pending_drops.discard(arrival.path)
+        filename = os.path.basename(arrival.path)
+        if arrival.source == 'drive':
+            pipeline_ledger.record(filename, 'sync_downloaded', location=arrival.location,
+                                   report_type=arrival.report.name if arrival.report else None)
+        if arrival.report is None:
+            if arrival.source == 'drive':
+                log(f"⚠️  Not a known report: {filename}")
+            return
+        if arrival.source == 'local':
+            log(f"🔔 New file detected ({arrival.location}): {filename}")
+        await self.conversions.put(arrival)
+
+    async def convert(self, arrival):
+        filename = os.path.basename(arrival.path)
+        if filename.endswith(('.xlsx', '.xls')) and arrival.report.convert_excel:
+            archive_dir = file_watcher.location_dirs()[arrival.location][1]
+            os.makedirs(archive_dir, exist_ok=True)
+            handler = file_watcher.DataFileHandler(arrival.location, os.path.dirname(arrival.path), archive_dir)
+            csv_path = handler.csv_path_for(arrival.report)
+            self.writing(csv_path)
+            await asyncio.to_thread(handler.convert_file, arrival.path, filename, arrival.report)
+            self.wrote(csv_path)
+        await self.queue_parse(arrival.location, arrival.report.name)
+
+    async def queue_parse(self, location, report_name):
+        if not parse_store.ENABLED or (location, report_name) in self.pending_parses:
+            return
+        self.pending_parses.add((location, report_name))
+        await self.parses.put((location, report_name))
+
+    def get_parse_pool(self):
+        if self.parse_pool is None:
+            # spawn, not fork: this process has the watchdog and to_thread threads running
+            self.parse_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        return self.parse_pool
+
+    def close_parse_pool(self):
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown(wait=False, cancel_futures=True)
+            self.parse_pool = None
+
+    async def parse(self, item):
+        location, report_name = item
+        # Taken off first, so an upload that lands during this parse queues another one
+        self.pending_parses.discard(item)
+        started = time.perf_counter()
+        try:
+            filepath = await self.loop.run_in_executor(self.get_parse_pool(), parse_latest, location, report_name)
+        except BrokenProcessPool as e:
+            self.close_parse_pool()
+            raise RuntimeError(f"parse process died: {e}") from None
+        if filepath:
+            pipeline_ledger.record(os.path.basename(filepath), 'parsed', location=location, report_type=report_name)
+            log(f"✓ Parsed {os.path.basename(filepath)} ({location}) in {time.perf_counter() - started:.1f}s")
+
+    async def watch_locations(self, observer):
+        """Watch every store's datasheets folder, picking up stores added while running"""
+        watched = set()
+        while True:
+            for location, (watch_dir, archive_dir) in file_watcher.location_dirs().items():
+                if location in watched:
+                    continue
+                os.makedirs(watch_dir, exist_ok=True)
+                observer.schedule(DropHandler(self, location), watch_dir, recursive=False)
+                watched.add(location)
+                print(f"  👀 {locations.display_name(location)}: {watch_dir}")
+            await asyncio.sleep(file_watcher.LOCATION_SCAN_INTERVAL)
+
+    async def run(self, drive=True):
+        observer = Observer()
+        observer.start()
+        self.start(self.watch_locations(observer))
+        if drive:
+            self.start(self.poll_drive())
+        for _ in range(STAGE_TASKS['download']):
+            self.start(self.run_stage('download', self.downloads, self.download))
+        for _ in range(STAGE_TASKS['classify']):
+            self.start(self.run_stage('classify', self.arrivals, self.classify))
+        for _ in range(STAGE_TASKS['convert']):
+            self.start(self.run_stage('convert', self.conversions, self.convert))
+        for _ in range(STAGE_TASKS['parse']):
+            self.start(self.run_stage('parse', self.parses, self.parse,
+                                      idle=PARSE_IDLE_SECONDS, on_idle=self.close_parse_pool))
+
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.loop.add_signal_handler(signum, stop.set)
+        try:
+            await stop.wait()
+        finally:
+            for task in list(self.tasks):
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            observer.stop()
+            observer.join()
+            self.close_parse_pool()
+
+
+async def run():
+    drive = await asyncio.to_thread(gdrive_sync.verify_setup)
+    if not drive:
+        log("⚠️  Google Drive sync unavailable - only watching the datasheets folders")
+    await IngestService(asyncio.get_running_loop()).run(drive)
+
+
+def main():
+    print("=" * 70)
+    print("Steensma Shop Manager - Ingest Service")
+    print("=" * 70)
+    for location, folder, local_dir in gdrive_sync.sync_targets():
+        print(f"  {locations.display_name(location)}: {gdrive_sync.GDRIVE_REMOTE}{folder} → {local_dir}")
+    print(f"Check Interval: {POLL_SECONDS} seconds")
+    print(f"Stage tasks: {', '.join(f'{stage} {count}' for stage, count in STAGE_TASKS.items())}"
+          f" (queues hold {QUEUE_SIZE})")
+    print("Press Ctrl+C to stop")
+    print("=" * 70)
+    print()
+
+    log("🚀 Ingest service started")
+    asyncio.run(run())
+    log("🛑 Ingest service stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,48 @@
+"""
+Store Locations for Steensma Shop Manager
+Shared by app.py, file_watcher.py and gdrive_sync.py so every stage of the
+pipeline agrees on where each store's reports live.
+
+The default store (Plainwell) keeps the original layout:
+    datasheets/   archive/   Google Drive folder "shopmgr"
+
+Every other store gets its own data root, created by adding a folder:
+    locations/<store>/datasheets/   locations/<store>/archive/   Google Drive folder "shopmgr/<store>"
+"""
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_LOCATION = os.environ.get('SHOPMGR_DEFAULT_LOCATION', 'plainwell')
+DEFAULT_DATASHEETS_DIR = os.environ.get('SHOPMGR_DATASHEETS_DIR', os.path.join(BASE_DIR, 'datasheets'))
+DEFAULT_ARCHIVE_DIR = os.path.join(BASE_DIR, 'archive')
+LOCATIONS_DIR = os.environ.get('SHOPMGR_LOCATIONS_DIR', os.path.join(BASE_DIR, 'locations'))
+
+
+def get_locations():
+    """Location name -> datasheets directory, default store first"""
+    found = {DEFAULT_LOCATION: DEFAULT_DATASHEETS_DIR}
+    if os.path.isdir(LOCATIONS_DIR):
+        for name in sorted(os.listdir(LOCATIONS_DIR)):
+            datasheets = os.path.join(LOCATIONS_DIR, name, 'datasheets')
+            if os.path.isdir(datasheets) and name.lower() not in found:
+                found[name.lower()] = datasheets
+    return found
+
+
+def archive_dir(location):
+    """Where file_watcher keeps the original uploads for a location"""
+    if location == DEFAULT_LOCATION:
+        return DEFAULT_ARCHIVE_DIR
+    return os.path.join(LOCATIONS_DIR, location, 'archive')
+
+
+def gdrive_folder(location, root):
+    """Google Drive folder (under root) that feeds a location"""
+    if location == DEFAULT_LOCATION:
+        return root
+    return f"{root}/{location}"
+
+
+def display_name(location):
+    return location.replace('_', ' ').replace('-', ' ').title()
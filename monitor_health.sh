@@ -1,48 +1,114 @@
 #!/bin/bash
 # Health check monitor for Steensma Shop Manager
 # Checks if app is responding and restarts via systemd if not
+#
+# /health/live says whether a worker answers at all; /health/ready says what it
+# is doing (see README "Health Checks"). A worker that stops answering while it
+# was last seen busy ingesting a report gets BUSY_GRACE seconds before that
+# counts as a failure, and stale reports are logged but never cause a restart.
 
-HEALTH_URL="http://localhost:5001/health"
+LIVE_URL="http://localhost:5001/health/live"
+READY_URL="http://localhost:5001/health/ready"
 LOG_FILE="/tmp/shopmgr_monitor.log"
+# Failure count and last busy time, kept between runs (the script runs once per check).
+# Kept in the app dir, not /tmp, where another user could plant the file
+STATE_FILE="$(cd "$(dirname "$0")" && pwd)/.monitor_state"
 MAX_FAILURES=3
-FAILURE_COUNT=0
+BUSY_GRACE=600
+
+# Read as data, never sourced: only two non-negative integers are taken from it
+read_state() {
+    local value
+    value=$(grep -m 1 "^$1=" "$STATE_FILE" 2>/dev/null | cut -d= -f2)
+    case "$value" in
+        ''|*[!0-9]*) echo 0 ;;
+        *) echo "$value" ;;
+    esac
+}
+FAILURE_COUNT=$(read_state FAILURE_COUNT)
+LAST_BUSY=$(read_state LAST_BUSY)
+NOW=$(date +%s)
 
 log_message() {
     echo "[$(date '+%Y-%m-%d %H:%M:%S')] $1" >> "$LOG_FILE"
 }
 
-# Check if service is running
-if ! systemctl is-active --quiet shopmgr; then
-    log_message "WARNING: shopmgr service not running, starting..."
-    sudo systemctl start shopmgr
-    sleep 3
-fi
-
-# Health check with timeout
-response=$(curl -s -o /dev/null -w "%{http_code}" --max-time 5 "$HEALTH_URL" 2>/dev/null)
+save_state() {
+    printf 'FAILURE_COUNT=%d\nLAST_BUSY=%d\n' "$FAILURE_COUNT" "$LAST_BUSY" > "$STATE_FILE"
+}
 
-if [ "$response" != "200" ]; then
+record_failure() {
     FAILURE_COUNT=$((FAILURE_COUNT + 1))
-    log_message "FAILED: Health check returned $response (attempt $FAILURE_COUNT/$MAX_FAILURES)"
-    
+    log_message "FAILED: $1 (attempt $FAILURE_COUNT/$MAX_FAILURES)"
+
     if [ $FAILURE_COUNT -ge $MAX_FAILURES ]; then
         log_message "CRITICAL: Max failures reached, restarting service..."
         sudo systemctl restart shopmgr
         FAILURE_COUNT=0
+        LAST_BUSY=0
         sleep 5
-        
+
         # Verify restart worked
-        new_response=$(curl -s -o /dev/null -w "%{http_code}" --max-time 5 "$HEALTH_URL" 2>/dev/null)
+        new_response=$(curl -s -o /dev/null -w "%{http_code}" --max-time 5 "$LIVE_URL" 2>/dev/null)
         if [ "$new_response" = "200" ]; then
             log_message "SUCCESS: Service restarted and responding"
         else
             log_message "ERROR: Service restart failed, manual intervention needed"
         fi
     fi
-else
+}
+
+record_success() {
     # Reset failure count on success
     if [ $FAILURE_COUNT -gt 0 ]; then
         log_message "RECOVERED: Health check passed after $FAILURE_COUNT failures"
         FAILURE_COUNT=0
     fi
+}
+
+# Check if service is running
+if ! systemctl is-active --quiet shopmgr; then
+    log_message "WARNING: shopmgr service not running, starting..."
+    sudo systemctl start shopmgr
+    sleep 3
 fi
+
+# Liveness with timeout
+response=$(curl -s -o /dev/null -w "%{http_code}" --max-time 5 "$LIVE_URL" 2>/dev/null)
+
+if [ "$response" != "200" ]; then
+    if [ $((NOW - LAST_BUSY)) -lt $BUSY_GRACE ]; then
+        log_message "WAITING: Liveness returned $response, but the app was busy parsing $((NOW - LAST_BUSY))s ago - not counted"
+    else
+        record_failure "Liveness returned $response"
+    fi
+    save_state
+    exit 0
+fi
+
+# Readiness: what the app is doing
+ready=$(curl -s -w "\n%{http_code}" --max-time 5 "$READY_URL" 2>/dev/null)
+ready_code=$(echo "$ready" | tail -n 1)
+status=$(echo "$ready" | grep -o '"status": *"[a-z]*"' | head -n 1 | grep -o '[a-z]*"$' | tr -d '"')
+
+case "$status" in
+    stuck)
+        record_failure "Readiness reports a stuck parse ($ready_code)"
+        ;;
+    busy)
+        LAST_BUSY=$NOW
+        log_message "BUSY: Parsing in progress - $(echo "$ready" | grep -o '"parsing": *\[[^]]*\]')"
+        record_success
+        ;;
+    stale)
+        log_message "STALE: A synced report is older than SHOPMGR_STALE_HOURS - check gdrive_sync (restart won't help)"
+        record_success
+        ;;
+    ready)
+        record_success
+        ;;
+    *)
+        record_failure "Readiness returned $ready_code"
+        ;;
+esac
+save_state
@@ -0,0 +1,83 @@
+"""
+Parser Sandbox for Steensma Shop Manager
+Runs one parse in a forked child process with limits, so a malformed or huge
+export (e.g. a corrupt .xlsx that costs two full decodes) can't hold a
+gunicorn worker or a parse pool process for long:
+    - memory: the child may map MEMORY_MB more than the process it forked from
+      (RLIMIT_AS); past that, allocations fail with MemoryError
+    - CPU: CPU_SECONDS of CPU time (RLIMIT_CPU; the kernel stops the child)
+    - wall time: the child is killed after KILL_SECONDS whatever it is doing
+The result comes back pickled over a pipe. Any failure raises ParseFailed, and
+app.py then serves the last good result for that report (see parse_report).
+"""
+import os
+import signal
+import resource
+import multiprocessing
+
+ENABLED = os.environ.get('SHOPMGR_PARSE_SANDBOX', '1') == '1'
+MEMORY_MB = int(os.environ.get('SHOPMGR_PARSE_MEMORY_MB', '1024'))
+CPU_SECONDS = int(os.environ.get('SHOPMGR_PARSE_CPU_SECONDS', '60'))
+KILL_SECONDS = float(os.environ.get('SHOPMGR_PARSE_KILL_SECONDS', '90'))
+
+
+class ParseFailed(Exception):
+    """A sandboxed parse raised, hit a limit or was killed"""
+
+
+def _mapped_bytes():
+    """Virtual memory size of this process (what RLIMIT_AS counts)"""
+    with open('/proc/self/statm', 'r') as f:
+        return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _run_child(sender, func, args, memory_mb, cpu_seconds):
+    try:
+        try:
+            memory = _mapped_bytes() + memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+        except (OSError, ValueError) as e:
+            print(f"Parse sandbox: running without limits ({e})")
+        sender.send(('ok', func(*args)))
+    except MemoryError:
+        sender.send(('error', f"memory limit reached ({memory_mb}MB)"))
+    except Exception as e:
+        sender.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        sender.close()
+
+
+def _describe_exit(exitcode):
+    if exitcode == -signal.SIGXCPU or exitcode == -signal.SIGKILL:
+        return f"stopped by the CPU limit or the kernel (signal {-exitcode})"
+    if exitcode is not None and exitcode < 0:
+        return f"died from signal {-exitcode}"
+    return f"exited with code {exitcode} without a result"
+
+
+def run(func, *args, memory_mb=MEMORY_MB, cpu_seconds=CPU_SECONDS, kill_seconds=KILL_SECONDS):
+    """func(*args) in a limited child process; its result, or ParseFailed"""
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=_run_child, args=(sender, func, args, memory_mb, cpu_seconds))
+    child.start()
+    sender.close()
+    try:
+        if not receiver.poll(kill_seconds):
+            child.kill()
+            raise ParseFailed(f"killed after {kill_seconds:g}s")
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            child.join(1)
+            raise ParseFailed(_describe_exit(child.exitcode)) from None
+        if status != 'ok':
+            raise ParseFailed(value)
+        return value
+    finally:
+        receiver.close()
+        child.join(1)
+        if child.is_alive():
+            child.kill()
+            child.join()
@@ -0,0 +1,169 @@
+"""
+On-disk Parse Store for Steensma Shop Manager
+Each parsed report is saved next to its source, in <datasheets>/.parsecache/,
+so a restarted app (or a new worker) loads it in milliseconds instead of
+re-running the parser.
+
+An entry is a pickle header followed by the pickled result. The header holds
+the source file key (path, mtime, size, plus the date for daily reports) and
+the parser's code version, and is checked before the result is unpickled, so
+entries for an older file or older parser code are skipped and overwritten.
+
+The code version is a hash of the parser's bytecode, of every function and
+class from this app that it uses (helpers, record types) and of its report's
+declaration in report_registry.py, so editing any of them invalidates that
+parser's entries; moving code around doesn't.
+"""
+import os
+import sys
+import types
+import pickle
+import hashlib
+
+import report_registry
+
+STORE_DIR = '.parsecache'
+# Set SHOPMGR_PARSE_STORE=0 to parse from scratch on every start
+ENABLED = os.environ.get('SHOPMGR_PARSE_STORE', '1') != '0'
+# Bump to invalidate every entry (e.g. if the entry layout changes)
+FORMAT = 1
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MISSING = object()
+
+# Parser name -> code version
+_versions = {}
+
+
+def _app_objects(code, namespace):
+    """Functions/classes from this app's own modules referenced by a code object (and its nested code)"""
+    found = []
+    for name in code.co_names:
+        obj = namespace.get(name)
+        if isinstance(obj, (types.FunctionType, type)):
+            module = sys.modules.get(obj.__module__)
+            path = getattr(module, '__file__', None) or ''
+            if os.path.abspath(path).startswith(BASE_DIR + os.sep):
+                found.append(obj)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            found.extend(_app_objects(const, namespace))
+    return found
+
+
+def _const_repr(const):
+    if isinstance(const, frozenset):
+        # Set order changes with string hash randomization
+        return repr(sorted(repr(item) for item in const))
+    return repr(const)
+
+
+def _code_fingerprint(code):
+    """Bytecode, names and constants of a code object and its nested functions (not line numbers)"""
+    parts = [code.co_code, repr(code.co_names).encode('utf-8'), repr(code.co_varnames).encode('utf-8')]
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            parts.append(_code_fingerprint(const))
+        else:
+            parts.append(_const_repr(const).encode('utf-8'))
+    return b'\0'.join(parts)
+
+
+def _class_fingerprint(cls):
+    """Fields, class attributes and method code of a class (e.g. a record type)"""
+    parts = [cls.__qualname__.encode('utf-8'), repr(getattr(cls, '__annotations__', {})).encode('utf-8')]
+    for name, value in sorted(vars(cls).items()):
+        if isinstance(value, types.FunctionType):
+            parts.append(_code_fingerprint(value.__code__))
+        elif not name.startswith('__'):
+            parts.append(f"{name}={_const_repr(value)}".encode('utf-8'))
+    return b'\0'.join(parts)
+
+
+def code_version(parser):
+    """Hash of a parser's code and of the app functions/classes it uses"""
+    name = parser.__name__
+    if name in _versions:
+        return _versions[name]
+    digest = hashlib.sha1(f"{FORMAT} {sys.version_info[:2]}".encode('ascii'))
+    seen = set()
+    pending = [parser]
+    while pending:
+        obj = pending.pop()
+        if obj in seen:
+            continue
+        seen.add(obj)
+        if isinstance(obj, types.FunctionType):
+            digest.update(_code_fingerprint(obj.__code__))
+            pending.extend(_app_objects(obj.__code__, obj.__globals__))
+        else:
+            digest.update(_class_fingerprint(obj))
+    # The report's declaration too (e.g. the CSV/Excel columns it is read with)
+    digest.update(repr(report_registry.PARSER_REPORTS.get(name)).encode('utf-8'))
+    _versions[name] = digest.hexdigest()[:16]
+    return _versions[name]
+
+
+def store_path(filepath, parser_name):
+    directory, filename = os.path.split(filepath)
+    return os.path.join(directory, STORE_DIR, f"{filename}.{parser_name}.pickle")
+
+
+def load(parser, filepath, key):
+    """The stored result of parser on this version of filepath, or MISSING"""
+    if not ENABLED:
+        return MISSING
+    path = store_path(filepath, parser.__name__)
+    try:
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            if header.get('key') != key or header.get('version') != code_version(parser):
+                return MISSING
+            return pickle.load(f)
+    except FileNotFoundError:
+        return MISSING
+    except Exception as e:
+        print(f"Ignoring unreadable parse store entry {path}: {e}")
+        return MISSING
+
+
+def save(parser, filepath, key, result):
+    """Store a parse result; written to a temp file and renamed so readers never see half an entry"""
+    if not ENABLED:
+        return
+    path = store_path(filepath, parser.__name__)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'key': key, 'version': code_version(parser)}, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"Could not save parse store entry {path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return
+    prune(os.path.dirname(filepath))
+
+
+def prune(directory):
+    """Delete entries whose source report is no longer in the directory"""
+    store_dir = os.path.join(directory, STORE_DIR)
+    try:
+        sources = set(os.listdir(directory))
+        entries = os.listdir(store_dir)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.endswith('.tmp'):
+            continue
+        source = entry.rsplit('.', 2)[0]
+        if source not in sources:
+            try:
+                os.remove(os.path.join(store_dir, entry))
+            except OSError:
+                pass
@@ -0,0 +1,116 @@
+"""
+Part Number Search for Steensma Shop Manager
+Prefix lookup of a part number across Open Back Orders, No Bins and PO Over 30.
+
+app.py builds a PrefixIndex for each of those reports when it is parsed, so a
+new export only re-indexes its own report. A search is a binary search into
+each index's sorted keys - no report file is read at query time.
+
+Part numbers are matched ignoring case, spaces and punctuation ("94-8812",
+"948812" and "94 8812" are the same), with or without the line code prefix
+("JOHP RE545572" and "RE545572" both find JOHP - RE545572).
+
+The PO Over 30 export lists PO numbers, not part numbers, so a part's POs are
+the ones its matching back orders are on (their PO column), the same link
+part_status.py joins on.
+"""
+import re
+from array import array
+from bisect import bisect_left
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 25
+
+_NOT_ALNUM = re.compile(r'[^0-9A-Z]')
+
+
+def normalize(value):
+    """Search key for a part or PO number: uppercase letters and digits only"""
+    return _NOT_ALNUM.sub('', str(value or '').upper())
+
+
+def split_line_code(part_number):
+    """'JOHP - RE545572' -> ('JOHP', 'RE545572'); plain part numbers have no line code"""
+    part_number = (part_number or '').strip()
+    if ' - ' in part_number:
+        line_code, bare = part_number.split(' - ', 1)
+        return line_code.strip(), bare.strip()
+    return '', part_number
+
+
+def open_back_order_entry(row):
+    line_code, part_number = split_line_code(row.part_number)
+    return {'part_number': part_number, 'line_code': line_code, 'customer': row.customer, 'status': row.status}
+
+
+def no_bin_entry(row):
+    return {'part_number': row.part_number, 'line_code': row.line_code,
+            'description': row.description, 'available': row.available}
+
+
+def po_entry(row):
+    return {'po_number': row.po_number, 'vendor': row.vendor, 'age': row.age, 'status': row.status}
+
+
+# Parser -> (result section name, (line code, number) of a row, row -> JSON entry)
+SOURCES = {
+    'parse_open_back_orders': ('open_back_orders', lambda row: split_line_code(row.part_number), open_back_order_entry),
+    'parse_no_bins': ('no_bins', lambda row: (row.line_code, row.part_number), no_bin_entry),
+}
+
+# Result section for the POs linked through the matching back orders
+PO_SECTION = 'po_over_30'
+
+
+class PrefixIndex:
+    """Sorted search keys for one parsed report; each row is indexed with and without its line code"""
+
+    def __init__(self, parser_name, rows):
+        self.section, numbers, self.entry = SOURCES[parser_name]
+        self.rows = rows
+        pairs = []
+        for row_id, row in enumerate(rows):
+            line_code, number = numbers(row)
+            key = normalize(number)
+            if not key:
+                continue
+            pairs.append((key, row_id))
+            if line_code:
+                pairs.append((normalize(line_code) + key, row_id))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.row_ids = array('I', (row_id for _, row_id in pairs))
+
+    def matches(self, prefix):
+        """Ids of the rows matching a normalized prefix, in report order"""
+        seen = set()
+        matches = []
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix):
+            row_id = self.row_ids[position]
+            if row_id not in seen:
+                seen.add(row_id)
+                matches.append(row_id)
+            position += 1
+        # Report order, not key order, so results read like the report
+        matches.sort()
+        return matches
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        """(total matching rows, JSON entries for up to limit of them) for a normalized prefix"""
+        matches = self.matches(prefix)
+        return len(matches), [self.entry(self.rows[row_id]) for row_id in matches[:limit]]
+
+
+def linked_pos(back_orders, pos, limit=DEFAULT_LIMIT):
+    """
+    (total PO lines, JSON entries for up to limit of them) for the POs on some back order rows.
+    pos is the PO number -> PO lines table built by part_status.po_table().
+    """
+    lines = []
+    seen = set()
+    for row in back_orders:
+        if row.po_number and row.po_number not in seen:
+            seen.add(row.po_number)
+            lines.extend(pos.get(row.po_number, ()))
+    return len(lines), [po_entry(row) for row in lines[:limit]]
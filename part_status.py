@@ -0,0 +1,83 @@
+"""
+Part Status View for Steensma Shop Manager
+Joins every back-ordered part (Open Back Orders) with its purchase order
+(PO Over 30) and with No Bins, and flags the ones that need someone to act.
+
+Each input gets a hash table when it is parsed (PO number -> PO lines,
+part number -> no-bin row). app.py re-runs the join only when one of the
+three inputs has changed, reusing the tables of the other two.
+"""
+from part_search import normalize, split_line_code
+
+# Flag -> what it means, worst first
+FLAGS = {
+    'po_over_60': 'Customer waiting, PO 60+ days old',
+    'received_not_binned': 'Customer waiting, part received but not binned',
+    'po_over_30': 'Customer waiting, PO 30-59 days old',
+    'no_po': 'Customer waiting, no PO on the back order',
+}
+
+
+def po_table(po_rows):
+    """PO number -> PO Over 30 lines for that PO"""
+    table = {}
+    for row in po_rows:
+        table.setdefault(row.po_number, []).append(row)
+    return table
+
+
+def no_bin_table(no_bin_rows):
+    """Normalized line code + part number -> No Bins row"""
+    return {normalize(row.line_code) + normalize(row.part_number): row for row in no_bin_rows}
+
+
+def build_view(back_orders, pos, no_bins):
+    """
+    One entry per back-ordered part line, with its PO and No Bins matches and flags.
+    pos and no_bins are the tables built by po_table() and no_bin_table().
+    """
+    parts = []
+    for row in back_orders:
+        line_code, part_number = split_line_code(row.part_number)
+        entry = {
+            'part_number': part_number,
+            'line_code': line_code,
+            'customer': row.customer,
+            'po_number': row.po_number or '',
+            'po_age': None,
+            'vendor': None,
+            'po_status': None,
+            'no_bin_available': None,
+            'flags': [],
+        }
+
+        po_lines = pos.get(row.po_number) if row.po_number else None
+        if po_lines:
+            oldest = max(po_lines, key=lambda po: po.age)
+            entry['po_age'] = oldest.age
+            entry['vendor'] = oldest.vendor
+            entry['po_status'] = oldest.status
+            entry['flags'].append('po_over_60' if oldest.age >= 60 else 'po_over_30')
+        elif not row.po_number:
+            entry['flags'].append('no_po')
+
+        no_bin = no_bins.get(normalize(line_code) + normalize(part_number))
+        if no_bin is not None:
+            entry['no_bin_available'] = no_bin.available
+            entry['flags'].append('received_not_binned')
+
+        parts.append(entry)
+
+    # Flagged parts first, worst flag first, then oldest PO
+    rank = {flag: i for i, flag in enumerate(FLAGS)}
+    parts.sort(key=lambda p: (min((rank[f] for f in p['flags']), default=len(rank)), -(p['po_age'] or 0)))
+    return parts
+
+
+def summarize(parts):
+    """Number of parts carrying each flag"""
+    counts = {flag: 0 for flag in FLAGS}
+    for part in parts:
+        for flag in part['flags']:
+            counts[flag] += 1
+    return counts
@@ -0,0 +1,160 @@
+"""
+Parts List Queries for Steensma Shop Manager
+Filter, sort and page through the PO Over 30, Backorders Over 5 and No Bins
+lists without sending the whole list to the browser.
+
+app.py builds a ListIndex whenever one of those reports is parsed:
+    - postings: field -> value -> row ids, for exact-match filters
+    - orders:   every sortable field pre-sorted both ways, so a page is a slice
+Queries only intersect id sets and slice a pre-sorted order.
+"""
+import json
+import base64
+import hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Parser -> what can be filtered and sorted in its list
+LIST_FIELDS = {
+    'parse_po_over_30': {
+        'filters': ('vendor', 'priority', 'status'),
+        'range': 'age',
+        'sorts': ('age', 'vendor', 'po_number'),
+        'default_sort': '-age',
+    },
+    'parse_backorders_over_5': {
+        'filters': ('customer', 'priority', 'status', 'line_code'),
+        'range': 'age',
+        'sorts': ('age', 'customer', 'part_number'),
+        'default_sort': '-age',
+    },
+    'parse_no_bins': {
+        'filters': ('line_code',),
+        'range': None,
+        'sorts': ('line_code', 'part_number', 'available'),
+        'default_sort': 'line_code',
+    },
+}
+
+
+def field_value(row, field):
+    """A row's value for a filter/sort field"""
+    if field == 'line_code' and not hasattr(row, 'line_code'):
+        # Backorder part numbers carry the line code as a prefix: "JOHP - RE545572"
+        part_number = row.part_number or ''
+        return part_number.split(' - ', 1)[0] if ' - ' in part_number else ''
+    return getattr(row, field)
+
+
+def sort_key(value):
+    """Numbers sort numerically (including numeric strings like No Bins 'available'), text case-insensitively"""
+    if isinstance(value, (int, float)):
+        return (0, value, '')
+    text = str(value or '').strip()
+    try:
+        return (0, float(text), '')
+    except ValueError:
+        return (1, 0, text.lower())
+
+
+class ListIndex:
+    """Filter postings and pre-sorted orders for one parsed parts list"""
+
+    def __init__(self, parser_name, rows, snapshot):
+        spec = LIST_FIELDS[parser_name]
+        self.spec = spec
+        self.rows = rows
+        self.snapshot = snapshot
+
+        self.postings = {}
+        self.labels = {}  # field -> lowercased value -> value as first seen in the report
+        for field in spec['filters']:
+            postings = {}
+            labels = {}
+            for row_id, row in enumerate(rows):
+                label = str(field_value(row, field) or '').strip()
+                value = label.lower()
+                postings.setdefault(value, array('I')).append(row_id)
+                labels.setdefault(value, label)
+            self.postings[field] = postings
+            self.labels[field] = labels
+
+        # Stable sorts, so ties keep report order in both directions
+        self.orders = {}
+        for field in spec['sorts']:
+            keys = [sort_key(field_value(row, field)) for row in rows]
+            ascending = sorted(range(len(rows)), key=keys.__getitem__)
+            descending = sorted(range(len(rows)), key=keys.__getitem__, reverse=True)
+            self.orders[(field, False)] = array('I', ascending)
+            self.orders[(field, True)] = array('I', descending)
+
+        range_field = spec['range']
+        if range_field:
+            order = self.orders[(range_field, False)]
+            self.range_values = [field_value(rows[i], range_field) for i in order]
+
+    def facets(self):
+        """Distinct values of each filter field (for filter dropdowns)"""
+        return {field: sorted(label for label in labels.values() if label) for field, labels in self.labels.items()}
+
+    def query(self, filters, range_min=None, range_max=None, sort=None, limit=DEFAULT_LIMIT, position=0):
+        """
+        Rows matching every filter (case-insensitive exact match) and the range,
+        in sort order ('field' or '-field' for descending).
+        Returns (total matches, rows on this page, position of the next page or None).
+        """
+        sort = sort or self.spec['default_sort']
+        descending = sort.startswith('-')
+        sort_field = sort.lstrip('-')
+        if sort_field not in self.spec['sorts']:
+            raise ValueError(f"Cannot sort by '{sort_field}' (choose from {', '.join(self.spec['sorts'])})")
+
+        candidates = None
+        for field, value in filters.items():
+            if field not in self.postings:
+                raise ValueError(f"Cannot filter by '{field}' (choose from {', '.join(self.spec['filters'])})")
+            ids = set(self.postings[field].get(value.strip().lower(), ()))
+            candidates = ids if candidates is None else candidates & ids
+
+        if range_min is not None or range_max is not None:
+            if not self.spec['range']:
+                raise ValueError("This list has no age range")
+            order = self.orders[(self.spec['range'], False)]
+            lo = 0 if range_min is None else bisect_left(self.range_values, range_min)
+            hi = len(order) if range_max is None else bisect_right(self.range_values, range_max)
+            ids = set(order[lo:hi])
+            candidates = ids if candidates is None else candidates & ids
+
+        order = self.orders[(sort_field, descending)]
+        matched = order if candidates is None else [i for i in order if i in candidates]
+        page = matched[position:position + limit]
+        next_position = position + limit if position + limit < len(matched) else None
+        return len(matched), [self.rows[i] for i in page], next_position
+
+
+def snapshot_id(cache_key):
+    """Short id of the parsed file a cursor belongs to"""
+    return hashlib.sha1(repr(cache_key).encode('utf-8')).hexdigest()[:12]
+
+
+def query_id(params):
+    """Short id of a query's filters and sort, so a cursor is only reused with the same query"""
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+
+
+def encode_cursor(snapshot, query, position):
+    raw = json.dumps({'s': snapshot, 'q': query, 'p': position}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Returns (snapshot, query id, position); raises ValueError for a malformed cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return data['s'], data['q'], int(data['p'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
@@ -0,0 +1,195 @@
+"""
+Pipeline Ledger for Steensma Shop Manager
+Shared append-only record of when each report moves through the pipeline:
+Google Drive -> gdrive_sync.py -> file_watcher.py -> app.py
+(or Google Drive -> ingest_service.py -> app.py)
+
+Every process appends one JSON line per event, so no locking is needed. Once
+the ledger passes MAX_BYTES it is rotated to pipeline_ledger.jsonl.1, so it
+never holds more than the two latest files' worth of events.
+app.py folds the lines back into per-report generations and latency histograms,
+re-reading them only when a ledger file has changed.
+"""
+import os
+import re
+import json
+import time
+from datetime import datetime
+
+LEDGER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pipeline_ledger.jsonl')
+# Size at which the ledger is rotated to LEDGER_FILE + '.1' (replacing the previous one)
+MAX_BYTES = int(os.environ.get('SHOPMGR_LEDGER_MAX_BYTES', 4 * 1024 * 1024))
+
+# Pipeline stages in the order a report passes through them
+STAGES = [
+    'drive_modtime',    # ModTime reported by Google Drive (rclone lsjson)
+    'sync_detected',    # gdrive_sync noticed the new/modified file
+    'sync_downloaded',  # gdrive_sync finished copying it into datasheets/
+    'converted',        # file_watcher converted an Excel upload to CSV
+    'parsed',           # ingest_service parsed it into the parse store
+    'first_served',     # app.py served the first request built from it
+]
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = [1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 4 * 3600, 24 * 3600]
+
+
+def record(report, stage, ts=None, **extra):
+    """Append a stage timestamp for a report file to the ledger"""
+    entry = {'report': report, 'stage': stage, 'ts': ts if ts is not None else time.time()}
+    entry.update(extra)
+    line = (json.dumps(entry) + '\n').encode('utf-8')
+    try:
+        # A single O_APPEND write keeps lines from concurrent writers intact
+        fd = os.open(LEDGER_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            written = os.fstat(fd)
+        finally:
+            os.close(fd)
+        if written.st_size > MAX_BYTES:
+            rotate(written)
+    except OSError as e:
+        print(f"Could not write pipeline ledger: {e}")
+
+
+def rotate(written):
+    """Move a full ledger aside, unless another writer already has (written is its fstat)"""
+    try:
+        current = os.stat(LEDGER_FILE)
+    except FileNotFoundError:
+        return
+    if (current.st_dev, current.st_ino) == (written.st_dev, written.st_ino):
+        os.replace(LEDGER_FILE, LEDGER_FILE + '.1')
+
+
+def parse_drive_time(value):
+    """Convert an rclone ModTime (RFC 3339, up to nanoseconds) to epoch seconds"""
+    if not value:
+        return None
+    # Python only accepts microseconds, so trim any extra fractional digits
+    value = re.sub(r'(\.\d{6})\d+', r'\1', value.replace('Z', '+00:00'))
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+# Ledger path -> ((mtime_ns, size) of it and its rotated file, folded generations)
+_folded = {}
+
+
+def file_version(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_generations(path=None):
+    """
+    Report generations from the ledger (rotated file first), folded again only
+    when either file has changed. The list is shared between callers, so
+    don't modify it.
+    """
+    path = path or LEDGER_FILE
+    paths = [path + '.1', path]
+    version = tuple(file_version(p) for p in paths)
+    cached = _folded.get(path)
+    if cached and cached[0] == version:
+        return cached[1]
+    generations = fold_generations(paths)
+    _folded[path] = (version, generations)
+    return generations
+
+
+def read_lines(paths):
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                yield from f
+        except OSError:
+            continue
+
+
+def fold_generations(paths):
+    """
+    Fold ledger lines into report generations.
+    A generation starts when gdrive_sync detects a file (or, for files dropped
+    in by hand, at the first event seen). Converted CSVs are folded into the
+    generation of the Excel file they came from. Reports are tracked per
+    location, so two stores uploading the same filename stay separate.
+    """
+    generations = []
+    latest = {}   # (location, report filename) -> its most recent generation
+    aliases = {}  # (location, converted output filename) -> source filename
+
+    for raw in read_lines(paths):
+        try:
+            entry = json.loads(raw)
+            report = entry['report']
+            stage = entry['stage']
+            ts = float(entry['ts'])
+        except (ValueError, KeyError, TypeError):
+            continue
+        location = entry.get('location')
+
+        if stage == 'converted' and entry.get('source'):
+            aliases[(location, report)] = entry['source']
+        report = aliases.get((location, report), report)
+
+        gen = latest.get((location, report))
+        if gen is None or stage == 'sync_detected':
+            gen = {'report': report, 'location': location, 'stages': {}}
+            generations.append(gen)
+            latest[(location, report)] = gen
+
+        if stage == 'sync_detected' and entry.get('drive_modtime') is not None:
+            gen['stages']['drive_modtime'] = entry['drive_modtime']
+
+        # Several workers may each record first_served; the earliest wins
+        previous = gen['stages'].get(stage)
+        if previous is None or ts < previous:
+            gen['stages'][stage] = ts
+
+    return generations
+
+
+def stage_latencies(generation):
+    """Seconds spent getting into each stage from the previous recorded stage"""
+    latencies = {}
+    previous_ts = None
+    for stage in STAGES:
+        ts = generation['stages'].get(stage)
+        if ts is None:
+            continue
+        if previous_ts is not None:
+            latencies[stage] = max(0.0, ts - previous_ts)
+        previous_ts = ts
+
+    recorded = [generation['stages'][s] for s in STAGES if s in generation['stages']]
+    if 'first_served' in generation['stages'] and len(recorded) > 1:
+        latencies['end_to_end'] = max(0.0, generation['stages']['first_served'] - recorded[0])
+    return latencies
+
+
+def latency_histograms(generations):
+    """Build cumulative per-stage latency histograms (Prometheus-style buckets)"""
+    histograms = {}
+    for gen in generations:
+        for stage, seconds in stage_latencies(gen).items():
+            hist = histograms.setdefault(stage, {
+                'buckets': {str(b): 0 for b in LATENCY_BUCKETS + ['+Inf']},
+                'count': 0,
+                'sum': 0.0,
+            })
+            for bound in LATENCY_BUCKETS:
+                if seconds <= bound:
+                    hist['buckets'][str(bound)] += 1
+            hist['buckets']['+Inf'] += 1
+            hist['count'] += 1
+            hist['sum'] += seconds
+    for hist in histograms.values():
+        hist['sum'] = round(hist['sum'], 3)
+    return histograms
@@ -0,0 +1,149 @@
+"""
+Record types for parsed report rows
+Parsers build one of these per row instead of a dict. With __slots__ a row has
+no per-instance __dict__, and repeated values (status, priority, vendor, line
+code, mechanic, customer) are interned so every row shares one copy.
+
+to_json() turns parser results back into the plain dicts/lists the API has
+always returned; call it once, right before jsonify.
+"""
+import sys
+from dataclasses import dataclass, fields
+
+
+class Record:
+    """Base class: interning, dict-style get(), JSON conversion"""
+    __slots__ = ()
+    _optional = ()   # fields left out of the JSON when None
+    _internal = ()   # fields kept for joins but never in the JSON
+    _interned = ()   # low-cardinality string fields shared between rows
+
+    def __post_init__(self):
+        for name in self._interned:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+
+    def get(self, name, default=None):
+        """Same as dict.get, for callers that read fields by name"""
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def to_dict(self):
+        result = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if field.name in self._internal or (value is None and field.name in self._optional):
+                continue
+            result[field.name] = value
+        return result
+
+
+# Scheduled Shop Jobs
+@dataclass(slots=True)
+class ScheduledJob(Record):
+    customer: str
+    job: str
+    mechanic: str
+    time: str
+    status: str = None
+    _optional = ('status',)  # only the text export has a status column
+    _interned = ('mechanic', 'status')
+
+
+@dataclass(slots=True)
+class FitIn(Record):
+    customer: str
+    job: str
+    notes: str
+    _interned = ('notes',)
+
+
+# Open Back Orders
+@dataclass(slots=True)
+class PartReceived(Record):
+    part_number: str
+    customer: str
+    status: str
+    po_number: str = None
+    _internal = ('po_number',)  # for the part status join; /api/data's parts_received is unchanged
+    _interned = ('customer', 'status', 'po_number')
+
+
+@dataclass(slots=True)
+class Backorder(Record):
+    customer: str
+    phone: str
+    part_number: str
+    age: int
+    status: str
+    priority: str
+    _interned = ('customer', 'phone', 'status', 'priority')
+
+
+# PO Over 30
+@dataclass(slots=True)
+class PurchaseOrder(Record):
+    vendor: str
+    po_number: str
+    age: int
+    status: str
+    since: str
+    items: str
+    total: str
+    priority: str
+    _interned = ('vendor', 'status', 'since', 'priority')
+
+
+# No Bins
+@dataclass(slots=True)
+class NoBinPart(Record):
+    line_code: str
+    part_number: str
+    description: str
+    available: str
+    _interned = ('line_code',)
+
+
+# Sales and Gross
+@dataclass(slots=True)
+class MechanicMetric(Record):
+    name: str
+    efficiency: float
+    labor_sales: float
+    _interned = ('name',)
+
+
+# Strategic Plan
+@dataclass(slots=True)
+class Rock(Record):
+    description: str
+    owner: str
+    status: str
+    _interned = ('owner', 'status')
+
+
+@dataclass(slots=True)
+class Goal(Record):
+    name: str
+    target: float
+    current: float
+    percent: float
+
+
+@dataclass(slots=True)
+class Issue(Record):
+    description: str
+    priority: str
+    _interned = ('priority',)
+
+
+def to_json(value):
+    """Convert parser results (records, possibly nested in dicts/lists) to JSON-ready data"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    return value
@@ -0,0 +1,211 @@
+"""
+Report Type Registry for Steensma Shop Manager
+Every report the dashboard reads is declared once here: the filenames it is
+exported under, a header fingerprint that identifies its text export, the
+parsers that read it, the columns they need from its CSV/Excel exports and
+how long a parse of it stays valid.
+
+file_watcher.py, gdrive_sync.py and ingest_service.py classify a file when it
+arrives and record the result in its folder's manifest (see MANIFEST); app.py
+builds a location's catalog from the manifest, classifying only files it doesn't
+list, so request code only ever looks reports up by type.
+"""
+import fcntl
+import json
+import os
+from dataclasses import dataclass
+
+# Lines read from the top of a text export when looking for its fingerprint
+HEADER_LINES = 3
+
+TEXT_EXTENSIONS = ('.txt', '.csv')
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+# Per-folder manifest of classified files: filename -> {report, mtime_ns, size}.
+# A dotfile, so the catalog and the watchers skip it
+MANIFEST = '.report_types.json'
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str             # name the parser reads the column by
+    header: str = None    # header label in the export
+    position: int = None  # 0-based column, used when the header label isn't there
+    dtype: object = None  # None: let pandas infer (e.g. dates); object: keep cells as read, no inference
+
+
+@dataclass(frozen=True)
+class Table:
+    """The columns a parser uses from a CSV or Excel export (read with usecols/dtype, see app.read_report_table)"""
+    columns: tuple
+    header: int = 0       # row holding the column headers
+    nrows: int = None     # rows needed below the header (None: all)
+
+
+@dataclass(frozen=True)
+class ReportType:
+    name: str                 # key used by app.py and the API ('schedule', 'backorders', ...)
+    label: str                # filename the dashboard reads, and the name converted exports get
+    patterns: tuple           # filename substrings the dashboard reads (case-insensitive)
+    fingerprints: tuple       # text found in the first HEADER_LINES lines of the text export
+    parsers: tuple            # names of the app.py parsers that read this report
+    aliases: tuple = ()       # other export names accepted at ingest and renamed to label
+    cache_policy: str = 'file'  # 'file': parse is valid until the file changes; 'daily': also until midnight
+    synced: bool = True       # downloaded from Google Drive by gdrive_sync.py
+    convert_excel: bool = False  # file_watcher.py converts .xlsx drops of this report to CSV
+    csv_table: Table = None   # columns read from a .csv export
+    excel_table: Table = None  # columns read from an .xlsx/.xls export
+
+    def matches_name(self, filename, aliases=False):
+        lowered = filename.lower()
+        names = self.patterns + self.aliases if aliases else self.patterns
+        return any(name.lower() in lowered for name in names)
+
+    def matches_header(self, head):
+        return any(fingerprint in head for fingerprint in self.fingerprints)
+
+    def table_for(self, filepath):
+        return self.csv_table if filepath.lower().endswith('.csv') else self.excel_table
+
+
+# Shop schedule export (CSV and Excel share the column names)
+SCHEDULE_TABLE = Table((
+    Column('ScheduledStartTime', 'ScheduledStartTime'),
+    Column('Customer', 'Customer', dtype=object),
+    Column('Model', 'Model', dtype=object),
+    Column('description', 'description', dtype=object),
+    Column('Mechanic', 'Mechanic', dtype=object),
+    Column('Status', 'Status', dtype=object),
+))
+
+# Open Back Orders: customer in column 1, part number in 9, status in 17
+BACKORDER_COLUMNS = (
+    Column('Customer', 'Customer', 1, object),
+    Column('Part Number', None, 9, object),
+    Column('Status', 'Status', 17, object),
+    Column('PO', 'PO', dtype=object),
+)
+
+# Sales and Gross: per-line CSV, or the fixed-cell "Graphic" workbook (columns G and O, down to row 233)
+GROSS_PROFIT_CSV_TABLE = Table((
+    Column('Mechanic', 'Mechanic', dtype=object),
+    Column('Labor Sales', 'Labor Sales', dtype=object),
+    Column('Time Billed', 'Time Billed', dtype=object),
+    Column('Time Actual', 'Time Actual', dtype=object),
+))
+GROSS_PROFIT_EXCEL_TABLE = Table((Column('G', position=6), Column('O', position=14)), nrows=233)
+
+
+REPORT_TYPES = (
+    ReportType('schedule', 'Scheduled Shop Jobs', ('Scheduled Shop Jobs',), ('Scheduled Shop Jobs',),
+               ('parse_shop_schedule',), aliases=('Shop Schedule', 'Feb Shop Report'),
+               cache_policy='daily', convert_excel=True,  # today/tomorrow buckets depend on the date
+               csv_table=SCHEDULE_TABLE, excel_table=SCHEDULE_TABLE),
+    ReportType('backorders', 'Open Back Orders', ('Open Back Orders',), (',Open Back Orders',),
+               ('parse_open_back_orders', 'parse_backorders_over_5'), aliases=('Open ROs',),
+               convert_excel=True, csv_table=Table(BACKORDER_COLUMNS), excel_table=Table(BACKORDER_COLUMNS, header=4)),
+    ReportType('grossprofit', 'Sales and Gross', ('Sales and Gross',), ('Sales and Gross Profit By Mechanic',),
+               ('parse_gross_profit_mechanic',), aliases=('Gross Profit', 'Feb Gross Profit'),
+               convert_excel=True, csv_table=GROSS_PROFIT_CSV_TABLE, excel_table=GROSS_PROFIT_EXCEL_TABLE),
+    ReportType('quarterly_sales', 'Site Lead', ('Site Lead',), ('Site lead Statement',),
+               ('parse_quarterly_sales',)),
+    ReportType('no_bins', 'No Bins', ('No Bins', 'No Bin'), ('Bin Census Detailed',),
+               ('parse_no_bins',)),
+    ReportType('po_over_30', 'PO Over 30', ('PO Over 30',), ('Purchase Order Aging Analysis',),
+               ('parse_po_over_30',)),
+    ReportType('strategic_plan', 'Strategic Plan', ('Strategic Plan',), ('=== QUARTERLY ROCKS',),
+               ('parse_strategic_plan',), synced=False),
+)
+
+REPORTS = {report.name: report for report in REPORT_TYPES}
+# Parser name -> report type it reads
+PARSER_REPORTS = {parser: report for report in REPORT_TYPES for parser in report.parsers}
+
+
+def match_filename(filename, aliases=False):
+    """Report type a filename belongs to, or None"""
+    for report in REPORT_TYPES:
+        if report.matches_name(filename, aliases):
+            return report
+    return None
+
+
+def read_header(path):
+    """First HEADER_LINES lines of a text export ('' if it can't be read)"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return ''.join(line for _, line in zip(range(HEADER_LINES), f))
+    except OSError:
+        return ''
+
+
+def match_header(head):
+    """Report type whose fingerprint is in a file's header, or None"""
+    for report in REPORT_TYPES:
+        if report.matches_header(head):
+            return report
+    return None
+
+
+def classify(path, aliases=False, record=False):
+    """
+    Report type of a file, or None.
+    Text exports are identified by their header, so a misnamed or generically
+    named export ("report (3).txt") still lands in the right place; other files
+    are identified by name. With record, the type the dashboard's catalog gives
+    the file (no aliases) is recorded in its folder's manifest.
+    """
+    filename = os.path.basename(path)
+    by_name = match_filename(filename, aliases)
+    by_header = None
+    if filename.lower().endswith(TEXT_EXTENSIONS):
+        by_header = match_header(read_header(path))
+        if by_header is not None and by_name is not None and by_header is not by_name:
+            print(f"{filename} is named like {by_name.label} but contains {by_header.label}")
+    if record:
+        remember(path, by_header or match_filename(filename))
+    return by_header or by_name
+
+
+def load_manifest(directory):
+    """A folder's manifest (see MANIFEST), or {} if it has none"""
+    try:
+        with open(os.path.join(directory, MANIFEST), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def recorded_type(manifest, filename, stat):
+    """(True, report type name or None) if the manifest lists this version of a file, else (False, None)"""
+    entry = manifest.get(filename)
+    if not isinstance(entry, dict) or (entry.get('mtime_ns'), entry.get('size')) != (stat.st_mtime_ns, stat.st_size):
+        return False, None
+    return True, entry.get('report')
+
+
+def remember(path, report):
+    """Record a file's report type (a ReportType or None) in its folder's manifest"""
+    directory, filename = os.path.split(path)
+    try:
+        stat = os.stat(path)
+        # The watchers, the sync and the ingest service can all record into one folder
+        with open(os.path.join(directory, MANIFEST + '.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            manifest = {name: entry for name, entry in load_manifest(directory).items()
+                        if os.path.exists(os.path.join(directory, name))}
+            manifest[filename] = {'report': report.name if report else None,
+                                  'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+            tmp_path = os.path.join(directory, f'.{MANIFEST}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, os.path.join(directory, MANIFEST))
+    except OSError as e:
+        print(f"Couldn't record {filename} in {MANIFEST}: {e}")
+
+
+def cache_policy(parser_name):
+    """Cache policy of the report a parser reads"""
+    report = PARSER_REPORTS.get(parser_name)
+    return report.cache_policy if report else 'file'
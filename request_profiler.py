@@ -0,0 +1,104 @@
+"""
+On-demand request profiling for Steensma Shop Manager
+Wraps a request in a stack-sampling (default) or cProfile profiler and saves
+one output file per request under profiles/.
+
+Enable with either:
+    SHOPMGR_PROFILE=1                  - profile every wrapped request
+    SHOPMGR_PROFILE_TOKEN=<secret>     - profile requests sent with ?profile=<secret>
+
+Sampling output is in folded-stack format ("frame;frame;frame count"), ready for
+flamegraph.pl or https://speedscope.app. SHOPMGR_PROFILE_MODE=cprofile writes
+a .prof file instead (open with snakeviz or `python -m pstats`).
+"""
+import os
+import sys
+import hmac
+import time
+import threading
+import cProfile
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILES_DIR = os.environ.get(
+    'SHOPMGR_PROFILES_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+)
+PROFILE_ALL = os.environ.get('SHOPMGR_PROFILE') == '1'
+PROFILE_TOKEN = os.environ.get('SHOPMGR_PROFILE_TOKEN', '')
+PROFILE_MODE = os.environ.get('SHOPMGR_PROFILE_MODE', 'sample')
+SAMPLE_INTERVAL = float(os.environ.get('SHOPMGR_PROFILE_INTERVAL', '0.002'))
+
+
+def profiling_requested(args):
+    """Check the environment switch or the admin ?profile=<token> query parameter"""
+    if PROFILE_ALL:
+        return True
+    supplied = args.get('profile', '')
+    return bool(PROFILE_TOKEN and supplied) and hmac.compare_digest(supplied, PROFILE_TOKEN)
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval and counts folded stacks"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile(label):
+    """
+    Profile the enclosed block and save the result under PROFILES_DIR.
+    Yields a dict whose 'path' is filled in with the output file once the block exits.
+    """
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    base = os.path.join(PROFILES_DIR, f"{stamp}_{label}_{os.getpid()}_{time.monotonic_ns() % 10**6:06d}")
+    result = {'path': None, 'seconds': None}
+    started = time.perf_counter()
+
+    if PROFILE_MODE == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            result['path'] = base + '.prof'
+            profiler.dump_stats(result['path'])
+            result['seconds'] = time.perf_counter() - started
+    else:
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            yield result
+        finally:
+            sampler.stop()
+            result['path'] = base + '.folded'
+            sampler.write_folded(result['path'])
+            result['seconds'] = time.perf_counter() - started
@@ -16,11 +16,14 @@ fi
 echo "📋 Installing systemd services..."
 echo ""
 
-# Copy service files
+# ingest_service.py does the work of gdrive_sync.py and file_watcher.py in one process;
+# their units are still installed (disabled) so either setup can be switched back to
+cp /home/ubuntu/shopmgr/shopmgr-ingest.service /etc/systemd/system/
 cp /home/ubuntu/shopmgr/shopmgr-gdrive-sync.service /etc/systemd/system/
 cp /home/ubuntu/shopmgr/shopmgr-file-watcher.service /etc/systemd/system/
 
 # Set proper permissions
+chmod 644 /etc/systemd/system/shopmgr-ingest.service
 chmod 644 /etc/systemd/system/shopmgr-gdrive-sync.service
 chmod 644 /etc/systemd/system/shopmgr-file-watcher.service
 
@@ -29,26 +32,28 @@ echo "🔄 Reloading systemd daemon..."
 systemctl daemon-reload
 
 # Enable services
-echo "✓ Enabling shopmgr-gdrive-sync service..."
-systemctl enable shopmgr-gdrive-sync
+echo "✓ Disabling the separate shopmgr-gdrive-sync and shopmgr-file-watcher services..."
+systemctl disable --now shopmgr-gdrive-sync shopmgr-file-watcher 2>/dev/null
 
-echo "✓ Enabling shopmgr-file-watcher service..."
-systemctl enable shopmgr-file-watcher
+echo "✓ Enabling shopmgr-ingest service..."
+systemctl enable shopmgr-ingest
 
 echo ""
 echo "=========================================="
 echo "✅ Services installed and enabled!"
 echo "=========================================="
 echo ""
-echo "To start the services now:"
-echo "  sudo systemctl start shopmgr-gdrive-sync"
-echo "  sudo systemctl start shopmgr-file-watcher"
+echo "To start the service now:"
+echo "  sudo systemctl start shopmgr-ingest"
 echo ""
 echo "To check status:"
-echo "  sudo systemctl status shopmgr-gdrive-sync"
-echo "  sudo systemctl status shopmgr-file-watcher"
+echo "  sudo systemctl status shopmgr-ingest"
 echo ""
 echo "To view logs:"
-echo "  sudo journalctl -u shopmgr-gdrive-sync -f"
+echo "  sudo journalctl -u shopmgr-ingest -f"
 echo "  tail -f /home/ubuntu/shopmgr/gdrive_sync.log"
 echo ""
+echo "To go back to the separate services:"
+echo "  sudo systemctl disable --now shopmgr-ingest"
+echo "  sudo systemctl enable --now shopmgr-gdrive-sync shopmgr-file-watcher"
+echo ""
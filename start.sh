@@ -17,7 +17,10 @@ if [ "$1" == "prod" ]; then
         pip install gunicorn
     fi
     
-    gunicorn -w 4 -b 0.0.0.0:5001 app:app
+    # Content-hashed CSS/JS bundles (see static_assets.py)
+    python static_assets.py
+
+    gunicorn -c gunicorn.conf.py app:app
 else
     echo "Starting Steensma Shop Manager in DEVELOPMENT mode..."
     echo "Dashboard will be available at: http://localhost:5001"
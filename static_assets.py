@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Static Asset Bundles for Steensma Shop Manager
+The dashboard pages share one stylesheet and one script, kept in assets/.
+build() writes each bundle to assets/dist/ under a name with a hash of its
+content (dashboard.3f2a9c1b7d04.js) plus a gzipped copy, and records the
+names in assets/dist/manifest.json. app.py serves assets/dist/ at /assets/
+with immutable cache headers and links bundles through asset_url(), so a
+kiosk downloads a bundle once and only again when its content changes.
+
+app.py rebuilds at startup when a source is newer than the manifest; run
+`python static_assets.py` to build by hand (e.g. before a deploy).
+"""
+import os
+import sys
+import gzip
+import json
+import hashlib
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+DIST_DIR = os.path.join(ASSETS_DIR, 'dist')
+MANIFEST = 'manifest.json'
+
+# Bundle name -> source files in assets/, concatenated in this order
+BUNDLES = {
+    'dashboard.css': ('dashboard.css',),
+    'dashboard.js': ('dashboard.js',),
+}
+
+# Hashed bundles never change, so browsers may keep them for a year
+CACHE_SECONDS = 365 * 24 * 3600
+
+
+def _write(path, content):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _read_manifest():
+    try:
+        with open(os.path.join(DIST_DIR, MANIFEST), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build():
+    """Write every bundle and its .gz, then the manifest; returns the manifest"""
+    os.makedirs(DIST_DIR, exist_ok=True)
+    previous = _read_manifest()
+    manifest = {}
+    for bundle, sources in BUNDLES.items():
+        content = b'\n'.join(_read(os.path.join(ASSETS_DIR, source)) for source in sources)
+        stem, ext = os.path.splitext(bundle)
+        name = f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+        path = os.path.join(DIST_DIR, name)
+        if not (os.path.exists(path) and os.path.exists(f"{path}.gz")):
+            _write(path, content)
+            # mtime=0 so the same content always gzips to the same bytes
+            _write(f"{path}.gz", gzip.compress(content, compresslevel=9, mtime=0))
+            print(f"Built {name} ({len(content) / 1024:.0f}KB, "
+                  f"{os.path.getsize(path + '.gz') / 1024:.0f}KB gzipped)")
+        manifest[bundle] = name
+    _write(os.path.join(DIST_DIR, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+    # Keep the previous build too: pages loaded just before a deploy still link it
+    keep = {MANIFEST} | set(manifest.values()) | set(previous.values())
+    for filename in os.listdir(DIST_DIR):
+        if filename.removesuffix('.gz') not in keep and not filename.endswith('.tmp'):
+            os.remove(os.path.join(DIST_DIR, filename))
+    return manifest
+
+
+def load_manifest():
+    """Bundle name -> hashed file name, rebuilding first if a source changed since the last build"""
+    try:
+        built = os.path.getmtime(os.path.join(DIST_DIR, MANIFEST))
+        sources = [os.path.join(ASSETS_DIR, source) for sources in BUNDLES.values() for source in sources]
+        if all(os.path.getmtime(source) <= built for source in sources):
+            manifest = _read_manifest()
+            if set(manifest) == set(BUNDLES):
+                return manifest
+    except OSError:
+        pass
+    return build()
+
+
+if __name__ == '__main__':
+    for bundle, name in build().items():
+        print(f"{bundle} -> assets/dist/{name}")
+    sys.exit(0)